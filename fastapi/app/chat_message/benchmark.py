@@ -0,0 +1,373 @@
+"""
+Latency of the chat routes on SQLite (aiosqlite): ownership check as a separate
+query versus joined into the fetch, the async routes end to end, scrolling
+back through a long session with OFFSET versus keyset pagination, and
+concurrent message writes committed one by one versus batched.
+
+    python -m app.chat_message.benchmark --requests 2000 --rtt-ms 1
+
+`--rtt-ms` sleeps before every statement to stand in for the network round trip
+to a remote database, which SQLite does not have.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List
+import httpx
+from fastapi import FastAPI
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.chat_message import chat_message_router
+from app.chat_message.chat_message_crud import (
+    create_chat_message,
+    get_chat_message,
+    get_chat_message_with_owner,
+    get_chat_messages_by_session,
+    get_user_chat_messages_by_session,
+)
+from app.chat_message.chat_message_model import ChatMessage
+from app.chat_message.chat_message_schema import ChatMessageCreate, MessageSender
+from app.chat_message.write_behind import ChatMessageWriter
+from app.chat_session import chat_session_router
+from app.chat_session.chat_session_crud import get_chat_session
+from app.chat_session.chat_session_model import ChatSession
+from app.db.model_base import Base
+from app.db.session import get_db
+from app.user.auth import get_current_user
+from app.user.user_model import SocialProvider, User
+
+
+class StatementCounter:
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+
+async def seed(Session, users: int, sessions: int, messages: int) -> Dict[str, List]:
+    user_ids = [f"user-{u}" for u in range(users)]
+    session_owner = {}
+    message_ids = []
+    async with Session() as db:
+        await db.execute(
+            insert(User),
+            [
+                {"id": u, "social_id": u, "social_provider": SocialProvider.GOOGLE}
+                for u in user_ids
+            ],
+        )
+        rows = []
+        for u in user_ids:
+            for s in range(sessions):
+                session_owner[f"{u}-s{s}"] = u
+                rows.append({"id": f"{u}-s{s}", "user_id": u})
+        await db.execute(insert(ChatSession), rows)
+        rows = []
+        for session_id in session_owner:
+            for m in range(messages):
+                message_ids.append(f"{session_id}-m{m}")
+                rows.append(
+                    {
+                        "id": message_ids[-1],
+                        "session_id": session_id,
+                        "sender_type": "user",
+                        "sender": "user",
+                        "content": f"message {m} " * 20,
+                    }
+                )
+        await db.execute(insert(ChatMessage), rows)
+        await db.commit()
+    return {"sessions": list(session_owner.items()), "messages": message_ids}
+
+
+def report(name: str, latencies: List[float], statements: int):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"  {name:<32} p50 {statistics.median(latencies) * 1e3:6.2f} ms  "
+        f"p95 {p95 * 1e3:6.2f} ms  {statements / len(latencies):.1f} queries/req"
+    )
+
+
+async def measure(
+    name: str,
+    requests: int,
+    counter: StatementCounter,
+    call: Callable[[int], Awaitable[None]],
+):
+    for i in range(min(50, requests)):
+        await call(i)
+    latencies = []
+    counter.count = 0
+    for i in range(requests):
+        start = time.perf_counter()
+        await call(i)
+        latencies.append(time.perf_counter() - start)
+    report(name, latencies, counter.count)
+
+
+async def run(args, path: str):
+    # 동시 쓰기 측정에서 잠금 대기가 기본 5초를 넘지 않도록
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", connect_args={"timeout": 60}
+    )
+    Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    data = await seed(Session, args.users, args.sessions, args.messages)
+    counter = StatementCounter(args.rtt_ms / 1000)
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+
+    rng = random.Random(0)
+    message_ids = [rng.choice(data["messages"]) for _ in range(args.requests)]
+    sessions = [rng.choice(data["sessions"]) for _ in range(args.requests)]
+    owner = {session_id: user_id for session_id, user_id in data["sessions"]}
+
+    print("CRUD, one message with its ownership check:")
+
+    async def two_queries(i: int):
+        async with Session() as db:
+            message = await get_chat_message(db, message_ids[i])
+            session = await get_chat_session(db, message.session_id)
+            assert session.user_id == owner[message.session_id]
+
+    async def joined(i: int):
+        async with Session() as db:
+            message, owner_id = await get_chat_message_with_owner(db, message_ids[i])
+            assert owner_id == owner[message.session_id]
+
+    await measure("message + session (2 queries)", args.requests, counter, two_queries)
+    await measure("message JOIN session", args.requests, counter, joined)
+
+    print("CRUD, messages of a session with its ownership check:")
+
+    async def session_two_queries(i: int):
+        session_id, user_id = sessions[i]
+        async with Session() as db:
+            session = await get_chat_session(db, session_id)
+            assert session.user_id == user_id
+            result = await db.execute(
+                ChatMessage.__table__.select()
+                .where(ChatMessage.session_id == session_id)
+                .limit(50)
+            )
+            result.all()
+
+    async def session_joined(i: int):
+        session_id, user_id = sessions[i]
+        async with Session() as db:
+            await get_user_chat_messages_by_session(db, session_id, user_id, limit=50)
+
+    await measure("session, then messages", args.requests, counter, session_two_queries)
+    await measure("messages JOIN session", args.requests, counter, session_joined)
+
+    print("Routes over ASGI:")
+    app = FastAPI()
+    app.include_router(chat_session_router.router, prefix="/api/chat_sessions")
+    app.include_router(chat_message_router.router, prefix="/api/chat_messages")
+    current = {"user": None}
+
+    async def override_db():
+        async with Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_current_user] = lambda: current["user"]
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def get_message(i: int):
+            message_id = message_ids[i]
+            current["user"] = User(id=owner[message_id.rsplit("-m", 1)[0]])
+            response = await client.get(f"/api/chat_messages/{message_id}")
+            assert response.status_code == 200, response.text
+
+        async def get_session_messages(i: int):
+            session_id, user_id = sessions[i]
+            current["user"] = User(id=user_id)
+            response = await client.get(
+                f"/api/chat_messages/session/{session_id}", params={"limit": 50}
+            )
+            assert response.status_code == 200, response.text
+
+        async def get_session(i: int):
+            session_id, user_id = sessions[i]
+            current["user"] = User(id=user_id)
+            response = await client.get(f"/api/chat_sessions/{session_id}")
+            assert response.status_code == 200, response.text
+
+        await measure("GET /chat_messages/{id}", args.requests, counter, get_message)
+        await measure(
+            "GET /chat_messages/session/{id}",
+            args.requests,
+            counter,
+            get_session_messages,
+        )
+        await measure("GET /chat_sessions/{id}", args.requests, counter, get_session)
+    await history(Session, args)
+    await writes(Session, args, counter, data["sessions"])
+    await engine.dispose()
+
+
+async def history(Session, args):
+    """
+    Page depth against latency in one session of `--history` messages.
+    """
+    session_id = "long-session"
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    async with Session() as db:
+        await db.execute(insert(ChatSession), [{"id": session_id, "user_id": None}])
+        for offset in range(0, args.history, 5000):
+            await db.execute(
+                insert(ChatMessage),
+                [
+                    {
+                        "id": f"long-m{m:06d}",
+                        "session_id": session_id,
+                        "sender_type": "user",
+                        "sender": "user",
+                        "content": f"message {m} " * 20,
+                        # 초당 여러 메시지: 정렬에 id가 필요한 동률을 만든다
+                        "timestamp": start + timedelta(seconds=m // 4),
+                    }
+                    for m in range(offset, min(offset + 5000, args.history))
+                ],
+            )
+        await db.commit()
+
+        plan = await db.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM chat_messages WHERE session_id = :s "
+                "AND timestamp < :t ORDER BY timestamp DESC, id DESC LIMIT 50"
+            ),
+            {"s": session_id, "t": start.isoformat()},
+        )
+        print(f"History of {args.history} messages, 50 per page:")
+        print(f"  plan: {' | '.join(row[-1] for row in plan)}")
+
+        page = 50
+        depths = [0, args.history // 4, args.history // 2, args.history - page]
+        for depth in depths:
+            offset_seconds = []
+            for _ in range(20):
+                t = time.perf_counter()
+                result = await db.execute(
+                    select(ChatMessage)
+                    .filter(ChatMessage.session_id == session_id)
+                    .order_by(ChatMessage.timestamp.desc(), ChatMessage.id.desc())
+                    .offset(depth)
+                    .limit(page)
+                )
+                rows = result.scalars().all()
+                offset_seconds.append(time.perf_counter() - t)
+            db.expunge_all()
+
+            # 같은 페이지를 커서로 조회: 직전 페이지의 마지막 행을 키로 사용
+            if depth:
+                result = await db.execute(
+                    select(ChatMessage)
+                    .filter(ChatMessage.session_id == session_id)
+                    .order_by(ChatMessage.timestamp.desc(), ChatMessage.id.desc())
+                    .offset(depth - 1)
+                    .limit(1)
+                )
+                previous = result.scalar_one()
+                before = (previous.timestamp, previous.id)
+            else:
+                before = None
+            keyset_seconds = []
+            for _ in range(20):
+                t = time.perf_counter()
+                keyset_rows = await get_chat_messages_by_session(
+                    db, session_id, limit=page, before=before
+                )
+                keyset_seconds.append(time.perf_counter() - t)
+            db.expunge_all()
+            assert [r.id for r in keyset_rows] == [r.id for r in rows]
+            print(
+                f"  depth {depth:>6}: OFFSET {statistics.median(offset_seconds) * 1e3:7.2f} ms"
+                f"  keyset {statistics.median(keyset_seconds) * 1e3:6.2f} ms"
+            )
+
+
+async def writes(Session, args, counter: StatementCounter, sessions: List):
+    """
+    `--writes` messages from `--concurrency` concurrent writers.
+    """
+    print(f"{args.writes} message writes, {args.concurrency} concurrent:")
+    messages = [
+        ChatMessageCreate(
+            session_id=sessions[i % len(sessions)][0],
+            sender=MessageSender.USER,
+            content=f"write {i} " * 20,
+        )
+        for i in range(args.writes)
+    ]
+
+    async def run_writers(write: Callable[[ChatMessageCreate], Awaitable[None]]):
+        queue = list(messages)
+
+        async def writer():
+            while queue:
+                await write(queue.pop())
+
+        counter.count = 0
+        start = time.perf_counter()
+        await asyncio.gather(*(writer() for _ in range(args.concurrency)))
+        return time.perf_counter() - start
+
+    def line(name: str, seconds: float):
+        print(
+            f"  {name:<32} {args.writes / seconds:8.0f} msg/s  "
+            f"{counter.count / args.writes:.2f} queries/msg"
+        )
+
+    async def commit_each(message: ChatMessageCreate):
+        async with Session() as db:
+            await create_chat_message(db, message)
+
+    line("commit per message", await run_writers(commit_each))
+
+    writer = ChatMessageWriter(Session)
+    seconds = await run_writers(writer.write)
+    line("write-behind, wait for commit", seconds)
+
+    async def no_wait(message: ChatMessageCreate):
+        await writer.write(message, wait=False)
+
+    start = time.perf_counter()
+    await run_writers(no_wait)
+    await writer.aclose()
+    line("write-behind, no wait (+flush)", time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--rtt-ms", type=float, default=0.0)
+    parser.add_argument("--history", type=int, default=50000)
+    parser.add_argument("--writes", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(args, os.path.join(directory, "bench.sqlite")))
+
+
+if __name__ == "__main__":
+    main()
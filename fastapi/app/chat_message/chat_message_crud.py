@@ -1,17 +1,38 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from datetime import datetime, timezone
+from uuid import uuid4
+from typing import Any, List, Optional, Sequence, Tuple
 from app.chat_message.chat_message_model import ChatMessage
 from app.chat_message.chat_message_schema import ChatMessageCreate, ChatMessageUpdate
+from app.chat_message.history_cache import ChatHistoryCache
+from app.chat_session.chat_session_model import ChatSession
+from app.db.pagination import keyset_condition
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 메시지 정렬 키: (timestamp, id)
+MessageKey = Tuple[datetime, str]
 
-async def create_chat_message(db: AsyncSession, chat_message: ChatMessageCreate):
-    db_chat_message = ChatMessage(**chat_message.dict())
+
+async def create_chat_message(
+    db: AsyncSession,
+    chat_message: ChatMessageCreate,
+    cache: Optional[ChatHistoryCache] = None,
+):
+    data = chat_message.dict()
+    # id와 timestamp를 미리 정해 커밋 후 다시 조회하지 않음
+    db_chat_message = ChatMessage(
+        id=str(uuid4()),
+        timestamp=datetime.now(timezone.utc),
+        sender_type=data["sender"],
+        **data,
+    )
     db.add(db_chat_message)
     await db.commit()
-    await db.refresh(db_chat_message)
+    if cache is not None:
+        await cache.append(db_chat_message)
     return db_chat_message
 
 
@@ -22,20 +43,118 @@ async def get_chat_message(db: AsyncSession, chat_message_id: str):
     return result.scalar_one_or_none()
 
 
-async def get_chat_messages(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(ChatMessage).offset(skip).limit(limit))
+async def get_chat_message_with_owner(
+    db: AsyncSession, chat_message_id: str
+) -> Optional[Tuple[ChatMessage, Optional[str]]]:
+    """
+    Fetch a message together with the user owning its session, in one query.
+    """
+    result = await db.execute(
+        select(ChatMessage, ChatSession.user_id)
+        .join(ChatSession, ChatMessage.session_id == ChatSession.id)
+        .filter(ChatMessage.id == chat_message_id)
+    )
+    row = result.one_or_none()
+    return (row[0], row[1]) if row else None
+
+
+async def get_chat_messages(
+    db: AsyncSession, limit: int = 100, after_id: Optional[str] = None
+):
+    query = select(ChatMessage).order_by(ChatMessage.id).limit(limit)
+    if after_id is not None:
+        query = query.filter(ChatMessage.id > after_id)
+    result = await db.execute(query)
     return result.scalars().all()
 
 
-async def get_chat_messages_by_session(
-    db: AsyncSession, session_id: str, skip: int = 0, limit: int = 100
+def _session_messages_query(
+    session_id: str,
+    limit: int,
+    before: Optional[MessageKey],
+    after: Optional[MessageKey],
 ):
-    result = await db.execute(
-        select(ChatMessage)
-        .filter(ChatMessage.session_id == session_id)
-        .offset(skip)
-        .limit(limit)
+    """
+    Keyset query over one session's messages on (timestamp, id), served by the
+    (session_id, timestamp) index. Newest first, older than `before` if given;
+    oldest first after `after` if given instead.
+    """
+    key = (ChatMessage.timestamp, ChatMessage.id)
+    query = select(ChatMessage).filter(ChatMessage.session_id == session_id)
+    if after is not None:
+        query = query.filter(keyset_condition(key, after, descending=False))
+        return query.order_by(*key).limit(limit)
+    if before is not None:
+        query = query.filter(keyset_condition(key, before, descending=True))
+    return query.order_by(*(column.desc() for column in key)).limit(limit)
+
+
+async def get_chat_messages_by_session(
+    db: AsyncSession,
+    session_id: str,
+    limit: int = 100,
+    before: Optional[MessageKey] = None,
+    after: Optional[MessageKey] = None,
+) -> List[ChatMessage]:
+    """
+    A page of a session's messages, newest first; oldest first with `after`.
+
+    Args:
+        db (AsyncSession): Database session.
+        session_id (str): The chat session.
+        limit (int): Messages at most.
+        before (Optional[MessageKey]): Only messages older than this
+            (timestamp, id), to scroll back.
+        after (Optional[MessageKey]): Only messages newer than this
+            (timestamp, id), to catch up.
+    """
+    result = await db.execute(_session_messages_query(session_id, limit, before, after))
+    return result.scalars().all()
+
+
+async def get_recent_chat_messages(
+    db: AsyncSession,
+    session_id: str,
+    limit: int = 20,
+    cache: Optional[ChatHistoryCache] = None,
+) -> Sequence[Any]:
+    """
+    The latest `limit` messages of a session, oldest first, for building a
+    prompt. Served from `cache` when it can answer; otherwise loaded from the
+    database, and the cache is refilled with the session's newest messages.
+
+    A message appended between the database read and the refill can be missing
+    from the buffer until it is next invalidated or expires.
+    """
+    if cache is not None:
+        messages = await cache.get(session_id, limit)
+        if messages is not None:
+            return messages
+    fetch = max(limit, cache.max_messages) if cache is not None else limit
+    rows = await get_chat_messages_by_session(db, session_id, limit=fetch)
+    rows = list(reversed(rows))
+    if cache is not None:
+        await cache.fill(session_id, rows, complete=len(rows) < fetch)
+    return rows[-limit:]
+
+
+async def get_user_chat_messages_by_session(
+    db: AsyncSession,
+    session_id: str,
+    user_id: str,
+    limit: int = 100,
+    before: Optional[MessageKey] = None,
+    after: Optional[MessageKey] = None,
+) -> List[ChatMessage]:
+    """
+    Like `get_chat_messages_by_session`, only if `user_id` owns the session.
+    An empty result does not tell a foreign or missing session from one
+    without messages.
+    """
+    query = _session_messages_query(session_id, limit, before, after).join(
+        ChatSession, ChatMessage.session_id == ChatSession.id
     )
+    result = await db.execute(query.filter(ChatSession.user_id == user_id))
     return result.scalars().all()
 
 
@@ -64,3 +183,33 @@ async def delete_chat_message(db: AsyncSession, chat_message_id: str):
         await db.delete(db_chat_message)
         await db.commit()
     return db_chat_message
+
+
+async def update_chat_message_instance(
+    db: AsyncSession,
+    db_chat_message: ChatMessage,
+    chat_message: ChatMessageUpdate,
+    cache: Optional[ChatHistoryCache] = None,
+):
+    """
+    Update an already loaded message without selecting it again.
+    """
+    update_data = chat_message.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_chat_message, key, value)
+    await db.commit()
+    if cache is not None:
+        await cache.invalidate(db_chat_message.session_id)
+    return db_chat_message
+
+
+async def delete_chat_message_instance(
+    db: AsyncSession,
+    db_chat_message: ChatMessage,
+    cache: Optional[ChatHistoryCache] = None,
+):
+    await db.delete(db_chat_message)
+    await db.commit()
+    if cache is not None:
+        await cache.invalidate(db_chat_message.session_id)
+    return db_chat_message
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, ForeignKey, String, Text, DateTime, Enum
-from sqlalchemy.sql import func
+from sqlalchemy import Column, ForeignKey, String, Text, DateTime, Enum, Index
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import Relationship
 from app.db.model_base import Base
 import enum
+from datetime import datetime, timezone
 from uuid import uuid4
 
 
@@ -21,4 +22,15 @@ class ChatMessage(Base):
     sender_type = Column(Enum(MessageSenderType), nullable=False)
     sender = Column(Text, nullable=False)
     content = Column(Text, nullable=False)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    # 같은 초에 저장된 메시지도 순서가 유지되도록 마이크로초 단위로 저장
+    timestamp = Column(
+        DateTime(timezone=True).with_variant(mysql.DATETIME(fsp=6), "mysql"),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    # 세션별 시간순 페이지네이션. InnoDB 보조 인덱스에는 PK(id)가 포함되므로
+    # (session_id, timestamp, id) 순서의 키셋 조회가 인덱스만으로 처리됨
+    __table_args__ = (
+        Index("ix_chat_messages_session_time", "session_id", "timestamp"),
+    )
@@ -1,36 +1,78 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import uuid4
 
 from app.chat_message.chat_message_crud import (
-    create_chat_message,
-    get_chat_message,
-    get_chat_messages_by_session,
-    update_chat_message,
-    delete_chat_message,
+    get_chat_message_with_owner,
+    get_recent_chat_messages,
+    get_user_chat_messages_by_session,
+    update_chat_message_instance,
+    delete_chat_message_instance,
 )
+from app.chat_message.chat_message_model import ChatMessage
 from app.chat_session.chat_session_crud import get_chat_session
 from app.chat_message.chat_message_schema import (
     ChatMessageCreate,
     ChatMessageUpdate,
     ChatMessageInDB,
+    ChatMessagePage,
+    MessageSender,
 )
+from app.chat_message.history_cache import ChatHistoryCache
+from app.chat_message.write_behind import ChatMessageWriter
+from app.configs.chat_history import get_history_cache
+from app.configs.chat_message import get_message_writer
+from app.configs.llm import get_context_builder, get_llm
+from app.configs.settings import settings
+from app.db.pagination import InvalidCursor, decode_cursor, encode_cursor, paginate
 from app.db.session import get_db
+from app.modules.llm_models.base import BaseLLMModel
+from app.modules.llm_models.cache import CachedLLM
+from app.modules.prompts.context import ContextBuilder
 from app.user.auth import get_current_user
+import json
+import time
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+async def get_owned_chat_message(
+    db: AsyncSession, chat_message_id: str, user_id: str, action: str
+) -> ChatMessage:
+    """
+    Load a message and check that `user_id` owns its session, in one query.
+    """
+    row = await get_chat_message_with_owner(db, chat_message_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Chat message not found")
+    db_chat_message, owner_id = row
+    if owner_id != user_id:
+        logger.warning(
+            f"Unauthorized {action} attempt to message {chat_message_id} by user {user_id}"
+        )
+        raise HTTPException(
+            status_code=403, detail=f"Not authorized to {action} this message"
+        )
+    return db_chat_message
+
+
 @router.post("/", response_model=ChatMessageInDB)
-def create_chat_message_route(
+async def create_chat_message_route(
     chat_message: ChatMessageCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
+    cache: ChatHistoryCache = Depends(get_history_cache),
+    writer: ChatMessageWriter = Depends(get_message_writer),
 ):
     logger.info(f"User {current_user.id} creating a new chat message")
-    chat_session = get_chat_session(db, chat_message.session_id)
+    chat_session = await get_chat_session(db, chat_message.session_id)
+    if chat_session is None:
+        raise HTTPException(status_code=404, detail="Chat session not found")
     if chat_session.user_id != current_user.id:
         logger.warning(
             f"Unauthorized message creation attempt in session {chat_message.session_id} by user {current_user.id}"
@@ -39,96 +81,197 @@ def create_chat_message_route(
             status_code=403,
             detail="Not authorized to create message in this chat session",
         )
-    return create_chat_message(db, chat_message)
+    # 동시에 들어온 메시지와 한 트랜잭션으로 커밋된 뒤 응답
+    message = await writer.write(chat_message)
+    await cache.append(message)
+    return message
 
 
-@router.get("/{chat_message_id}", response_model=ChatMessageInDB)
-def read_chat_message(
-    chat_message_id: str,
-    db: Session = Depends(get_db),
+def format_sse(data: dict, event: Optional[str] = None) -> str:
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/stream")
+async def stream_chat_message_route(
+    chat_message: ChatMessageCreate,
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
+    llm: BaseLLMModel = Depends(get_llm),
+    builder: ContextBuilder = Depends(get_context_builder),
+    cache: ChatHistoryCache = Depends(get_history_cache),
+    writer: ChatMessageWriter = Depends(get_message_writer),
 ):
-    logger.info(f"User {current_user.id} requesting chat message {chat_message_id}")
-    db_chat_message = get_chat_message(db, chat_message_id)
-    if db_chat_message is None:
-        raise HTTPException(status_code=404, detail="Chat message not found")
-    chat_session = get_chat_session(db, db_chat_message.session_id)
+    logger.info(
+        f"User {current_user.id} streaming a reply in {chat_message.session_id}"
+    )
+    chat_session = await get_chat_session(db, chat_message.session_id)
+    if chat_session is None:
+        raise HTTPException(status_code=404, detail="Chat session not found")
     if chat_session.user_id != current_user.id:
         logger.warning(
-            f"Unauthorized access attempt to message {chat_message_id} by user {current_user.id}"
+            f"Unauthorized message creation attempt in session {chat_message.session_id} by user {current_user.id}"
         )
         raise HTTPException(
-            status_code=403, detail="Not authorized to access this message"
+            status_code=403,
+            detail="Not authorized to create message in this chat session",
         )
-    return db_chat_message
+    # 새 질문을 저장하기 전에 이전 대화를 읽는다
+    history = await get_recent_chat_messages(
+        db, chat_message.session_id, settings.CHAT_HISTORY_PROMPT_MESSAGES, cache
+    )
+    # 질문은 기다리지 않고 저장 대기열에 넣는다. 답변보다 먼저 커밋된다
+    await cache.append(await writer.write(chat_message, wait=False))
+    prompt = builder.build(question=chat_message.content, history=history).prompt
+    if isinstance(llm, CachedLLM):
+        # 프롬프트에 대화 이력이 들어가므로 비슷한 질문은 같은 사용자끼리만 공유
+        llm = llm.scoped(f"user:{current_user.id}")
+    bot_message_id = str(uuid4())
+
+    def bot_reply(tokens: List[str]) -> ChatMessageCreate:
+        return ChatMessageCreate(
+            session_id=chat_message.session_id,
+            sender=MessageSender.BOT,
+            content="".join(tokens),
+        )
+
+    async def event_stream():
+        tokens = []
+        saved_at = time.monotonic()
+        try:
+            async for token in llm.astream(prompt):
+                tokens.append(token)
+                yield format_sse({"token": token})
+                # 연결이 끊겨도 생성된 부분까지는 남도록 같은 id로 주기적으로 저장
+                if (
+                    time.monotonic() - saved_at
+                    >= settings.CHAT_MESSAGE_PARTIAL_INTERVAL
+                ):
+                    await writer.write(bot_reply(tokens), bot_message_id, wait=False)
+                    saved_at = time.monotonic()
+        except RuntimeError as e:
+            logger.error(f"Streaming failed in session {chat_message.session_id}: {e}")
+            yield format_sse({"detail": "Failed to generate a reply"}, event="error")
+            return
+
+        bot_message = await writer.write(bot_reply(tokens), bot_message_id)
+        await cache.append(bot_message)
+        yield format_sse({"id": bot_message.id}, event="done")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-@router.get("/session/{chat_session_id}", response_model=List[ChatMessageInDB])
-def read_chat_session_messages(
+@router.get("/{chat_message_id}", response_model=ChatMessageInDB)
+async def read_chat_message(
+    chat_message_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    logger.info(f"User {current_user.id} requesting chat message {chat_message_id}")
+    return await get_owned_chat_message(db, chat_message_id, current_user.id, "access")
+
+
+def message_cursor(chat_message: ChatMessage) -> str:
+    return encode_cursor(chat_message.timestamp, chat_message.id)
+
+
+@router.get("/session/{chat_session_id}", response_model=ChatMessagePage)
+async def read_chat_session_messages(
     chat_session_id: str,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
+    """
+    Chat history in chronological order.
+
+    - Without a cursor: the latest `limit` messages.
+    - `before`: the `limit` messages before it. Pass each page's `next_cursor`
+      as `before` to scroll back until `has_more` is false.
+    - `after`: the messages after it, e.g. `newest_cursor`, to catch up.
+    """
     logger.info(
         f"User {current_user.id} requesting messages for chat session {chat_session_id}"
     )
-    chat_session = get_chat_session(db, chat_session_id)
-    if chat_session is None:
-        raise HTTPException(status_code=404, detail="Chat session not found")
-    if chat_session.user_id != current_user.id:
-        logger.warning(
-            f"Unauthorized access attempt to messages in session {chat_session_id} by user {current_user.id}"
-        )
-        raise HTTPException(
-            status_code=403,
-            detail="Not authorized to access messages from this session",
-        )
-    chat_messages = get_chat_messages_by_session(
-        db, chat_session_id, skip=skip, limit=limit
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either before or after")
+    try:
+        before_key = decode_cursor(before, datetime, str) if before else None
+        after_key = decode_cursor(after, datetime, str) if after else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows = await get_user_chat_messages_by_session(
+        db,
+        chat_session_id,
+        current_user.id,
+        limit=limit + 1,
+        before=before_key,
+        after=after_key,
+    )
+    if not rows:
+        # 결과가 없을 때만 세션 존재 여부와 소유자를 따로 확인
+        chat_session = await get_chat_session(db, chat_session_id)
+        if chat_session is None:
+            raise HTTPException(status_code=404, detail="Chat session not found")
+        if chat_session.user_id != current_user.id:
+            logger.warning(
+                f"Unauthorized access attempt to messages in session {chat_session_id} by user {current_user.id}"
+            )
+            raise HTTPException(
+                status_code=403,
+                detail="Not authorized to access messages from this session",
+            )
+        return ChatMessagePage(items=[], newest_cursor=after)
+
+    items, has_more = paginate(rows, limit)
+    if after_key is None:
+        items.reverse()
+    edge = items[-1] if after_key is not None else items[0]
+    return ChatMessagePage(
+        items=items,
+        next_cursor=message_cursor(edge) if has_more else None,
+        has_more=has_more,
+        newest_cursor=(
+            message_cursor(items[-1])
+            if after_key is not None or before_key is None
+            else None
+        ),
     )
-    return chat_messages
 
 
 @router.put("/{chat_message_id}", response_model=ChatMessageInDB)
-def update_chat_message_route(
+async def update_chat_message_route(
     chat_message_id: str,
     chat_message: ChatMessageUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
+    cache: ChatHistoryCache = Depends(get_history_cache),
 ):
     logger.info(f"User {current_user.id} updating chat message {chat_message_id}")
-    db_chat_message = get_chat_message(db, chat_message_id)
-    if db_chat_message is None:
-        raise HTTPException(status_code=404, detail="Chat message not found")
-    chat_session = get_chat_session(db, db_chat_message.session_id)
-    if chat_session.user_id != current_user.id:
-        logger.warning(
-            f"Unauthorized update attempt to message {chat_message_id} by user {current_user.id}"
-        )
-        raise HTTPException(
-            status_code=403, detail="Not authorized to update this message"
-        )
-    return update_chat_message(db, chat_message_id, chat_message)
+    db_chat_message = await get_owned_chat_message(
+        db, chat_message_id, current_user.id, "update"
+    )
+    # 다른 세션으로 메시지를 옮길 수 없음
+    chat_message.session_id = db_chat_message.session_id
+    return await update_chat_message_instance(db, db_chat_message, chat_message, cache)
 
 
 @router.delete("/{chat_message_id}", response_model=ChatMessageInDB)
-def delete_chat_message_route(
+async def delete_chat_message_route(
     chat_message_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
+    cache: ChatHistoryCache = Depends(get_history_cache),
 ):
     logger.info(f"User {current_user.id} deleting chat message {chat_message_id}")
-    db_chat_message = get_chat_message(db, chat_message_id)
-    if db_chat_message is None:
-        raise HTTPException(status_code=404, detail="Chat message not found")
-    chat_session = get_chat_session(db, db_chat_message.session_id)
-    if chat_session.user_id != current_user.id:
-        logger.warning(
-            f"Unauthorized delete attempt to message {chat_message_id} by user {current_user.id}"
-        )
-        raise HTTPException(
-            status_code=403, detail="Not authorized to delete this message"
-        )
-    return delete_chat_message(db, chat_message_id)
+    db_chat_message = await get_owned_chat_message(
+        db, chat_message_id, current_user.id, "delete"
+    )
+    return await delete_chat_message_instance(db, db_chat_message, cache)
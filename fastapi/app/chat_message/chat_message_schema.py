@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from datetime import datetime
 from enum import Enum
+from typing import Optional
+from app.db.pagination import Page
 
 
 class MessageSender(str, Enum):
@@ -27,4 +29,9 @@ class ChatMessageInDB(ChatMessageBase):
     timestamp: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+
+class ChatMessagePage(Page[ChatMessageInDB]):
+    # 가장 최근 메시지의 커서. `after`로 넘기면 이후에 도착한 메시지를 조회
+    newest_cursor: Optional[str] = None
@@ -0,0 +1,218 @@
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+from app.chat_message.chat_message_schema import ChatMessageInDB
+from app.configs.redis import RedisClient
+from app.db.serialization import pack, unpack
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Appends to a warm buffer only (the list, or the "full" marker of a session
+# without messages yet), then trims it to ARGV[2] entries and ARGV[3]
+# bytes from the oldest end. Trimming clears the "full" marker, since the
+# buffer no longer holds the whole session.
+APPEND_SCRIPT = """
+if redis.call('EXISTS', KEYS[1], KEYS[2]) == 0 then
+    return -1
+end
+redis.call('RPUSH', KEYS[1], ARGV[1])
+local count = redis.call('LLEN', KEYS[1])
+local drop = math.max(count - tonumber(ARGV[2]), 0)
+local items = redis.call('LRANGE', KEYS[1], drop, -1)
+local total = 0
+for i = 1, #items do
+    total = total + string.len(items[i])
+end
+local i = 1
+while total > tonumber(ARGV[3]) and i < #items do
+    total = total - string.len(items[i])
+    drop = drop + 1
+    i = i + 1
+end
+if drop > 0 then
+    redis.call('LTRIM', KEYS[1], drop, -1)
+    redis.call('DEL', KEYS[2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return drop
+"""
+
+
+@dataclass
+class HistoryCacheStats:
+    hits: int = 0
+    misses: int = 0
+    appends: int = 0
+    fills: int = 0
+    invalidations: int = 0
+    errors: int = 0
+
+
+class ChatHistoryCache:
+    """
+    Per-session ring buffer of the latest messages in Redis, so building a
+    prompt does not query MySQL on every turn.
+
+    - A buffer holds the session's newest messages, oldest first, capped at
+      `max_messages` entries and `max_bytes` serialized bytes.
+    - New messages are appended to warm buffers only (write-through); a cold
+      session is filled from the database on its first read.
+    - Updating or deleting a message drops the session's buffer.
+    - Reads are one pipelined round trip. A read is served from the buffer if
+      it holds enough messages, or the whole session; otherwise the caller
+      falls back to the database.
+
+    Entries are `[id, sender, content, timestamp in µs]`, packed with msgpack
+    (JSON if unavailable). Redis errors are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        max_messages: int = 50,
+        max_bytes: int = 64 * 1024,
+        ttl: int = 86400,
+        namespace: str = "chat_history",
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_client (RedisClient): Redis connection.
+            max_messages (int): Messages kept per session.
+            max_bytes (int): Serialized bytes kept per session; the newest
+                message is always kept.
+            ttl (int): Seconds a buffer lives after its last write.
+            namespace (str): Key prefix.
+        """
+        self.redis_client = redis_client
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.namespace = namespace
+        self.stats = HistoryCacheStats()
+        self._append = None
+
+    def _keys(self, session_id: str) -> List[str]:
+        key = f"{self.namespace}:{session_id}"
+        return [key, f"{key}:full"]
+
+    @staticmethod
+    def encode(message: Any) -> bytes:
+        sender = getattr(message.sender, "value", message.sender)
+        timestamp = message.timestamp
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return pack(
+            [message.id, sender, message.content, int(timestamp.timestamp() * 1e6)]
+        )
+
+    @staticmethod
+    def decode(session_id: str, raw: bytes) -> ChatMessageInDB:
+        message_id, sender, content, micros = unpack(raw)
+        return ChatMessageInDB.model_construct(
+            id=message_id,
+            session_id=session_id,
+            sender=sender,
+            content=content,
+            timestamp=datetime.fromtimestamp(micros / 1e6, tz=timezone.utc),
+        )
+
+    async def get(self, session_id: str, limit: int) -> Optional[List[ChatMessageInDB]]:
+        """
+        The latest `limit` messages, oldest first, or None if the buffer cannot
+        answer.
+        """
+        if limit > self.max_messages:
+            return None
+        key, full_key = self._keys(session_id)
+        try:
+            redis = await self.redis_client.connect_binary()
+            pipe = redis.pipeline(transaction=False)
+            pipe.lrange(key, -limit, -1)
+            pipe.exists(full_key)
+            items, full = await pipe.execute()
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Chat history cache read failed: {e!r}")
+            return None
+        if len(items) < limit and not full:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return [self.decode(session_id, raw) for raw in items]
+
+    async def fill(
+        self, session_id: str, messages: Sequence[Any], complete: bool
+    ) -> None:
+        """
+        Replace a session's buffer with messages loaded from the database.
+
+        Args:
+            session_id (str): The chat session.
+            messages (Sequence[Any]): Its newest messages, oldest first.
+            complete (bool): Whether `messages` is the whole session.
+        """
+        key, full_key = self._keys(session_id)
+        entries = [self.encode(message) for message in messages][-self.max_messages :]
+        kept, total = 0, 0
+        for raw in reversed(entries):
+            if kept and total + len(raw) > self.max_bytes:
+                complete = False
+                break
+            kept += 1
+            total += len(raw)
+        entries = entries[len(entries) - kept :]
+        try:
+            redis = await self.redis_client.connect_binary()
+            pipe = redis.pipeline(transaction=True)
+            pipe.delete(key, full_key)
+            if entries:
+                pipe.rpush(key, *entries)
+                pipe.expire(key, self.ttl)
+            if complete:
+                pipe.set(full_key, b"1", ex=self.ttl)
+            await pipe.execute()
+            self.stats.fills += 1
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Chat history cache fill failed: {e!r}")
+
+    async def append(self, message: Any) -> None:
+        """
+        Write a new message through to its session's buffer, if it is cached.
+        """
+        try:
+            redis = await self.redis_client.connect_binary()
+            if self._append is None:
+                self._append = redis.register_script(APPEND_SCRIPT)
+            dropped = await self._append(
+                keys=self._keys(message.session_id),
+                args=[
+                    self.encode(message),
+                    self.max_messages,
+                    self.max_bytes,
+                    self.ttl,
+                ],
+            )
+            if dropped >= 0:
+                self.stats.appends += 1
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Chat history cache append failed: {e!r}")
+            # 버퍼가 DB와 어긋나지 않도록 세션 캐시를 비운다
+            await self.invalidate(message.session_id)
+
+    async def invalidate(self, session_id: str) -> None:
+        try:
+            redis = await self.redis_client.connect_binary()
+            await redis.delete(*self._keys(session_id))
+            self.stats.invalidations += 1
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Chat history cache invalidation failed: {e!r}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return asdict(self.stats)
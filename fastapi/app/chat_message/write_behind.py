@@ -0,0 +1,228 @@
+import asyncio
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+from sqlalchemy import insert
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.chat_message.chat_message_model import ChatMessage, MessageSenderType
+from app.chat_message.chat_message_schema import ChatMessageCreate, ChatMessageInDB
+import logging
+
+logger = logging.getLogger(__name__)
+
+Pending = Tuple[Dict[str, Any], Optional[asyncio.Future]]
+
+
+@dataclass
+class WriterStats:
+    messages: int = 0
+    rows: int = 0
+    batches: int = 0
+    # 같은 배치 안에서 덮어쓴 부분 응답
+    coalesced: int = 0
+    errors: int = 0
+    flush_seconds: float = 0.0
+
+
+class ChatMessageWriter:
+    """
+    Write-behind buffer for chat messages: rows are queued and inserted in bulk,
+    one transaction per batch, instead of a commit and a refresh per message.
+
+    - IDs and timestamps are assigned on submission, so the caller gets the
+      stored message back without reading it again.
+    - `write(..., wait=False)` returns at once. Its row is flushed once
+      `max_batch` rows are queued or `max_delay` seconds after it, whichever
+      comes first; a crash can lose what is still queued. `aclose` flushes
+      everything on shutdown.
+    - `write(..., wait=True)` returns once its row has committed. It is flushed
+      without delay, together with every row queued while the previous batch
+      was being written (group commit).
+    - Rows are upserted by id: writing the same id again replaces its content
+      and timestamp, which is how a streamed reply is saved as it grows. The
+      stored row always matches the message returned by the latest `write`.
+    - If a batch fails, its rows are retried one by one so a single bad row
+      (e.g. its session was deleted) does not drop the others.
+
+    Messages are committed in submission order, so a message written with
+    `wait=True` is durable together with everything submitted before it.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        max_batch: int = 256,
+        max_delay: float = 0.05,
+        max_pending: int = 10000,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            session_factory (Callable[[], AsyncSession]): Opens database sessions.
+            max_batch (int): Rows per INSERT at most.
+            max_delay (float): Seconds a row waits for others to join its batch.
+            max_pending (int): Rows queued at most; writers wait beyond that.
+        """
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.stats = WriterStats()
+        self._queue: "asyncio.Queue[Pending]" = asyncio.Queue(maxsize=max_pending)
+        self._wake = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def write(
+        self,
+        chat_message: ChatMessageCreate,
+        message_id: Optional[str] = None,
+        wait: bool = True,
+    ) -> ChatMessageInDB:
+        """
+        Queue a message for insertion.
+
+        Args:
+            chat_message (ChatMessageCreate): The message.
+            message_id (Optional[str]): Id of a message to replace, e.g. a
+                partial reply written earlier. A new id if omitted.
+            wait (bool): Return only once the message is committed.
+
+        Returns:
+            ChatMessageInDB: The message as it will be stored.
+
+        Raises:
+            Exception: With `wait`, the error that kept the row from being
+                stored.
+        """
+        message = ChatMessageInDB(
+            id=message_id or str(uuid4()),
+            timestamp=datetime.now(timezone.utc),
+            **chat_message.model_dump(),
+        )
+        row = {
+            "id": message.id,
+            "session_id": message.session_id,
+            "sender_type": MessageSenderType(message.sender.value),
+            "sender": message.sender.value,
+            "content": message.content,
+            "timestamp": message.timestamp,
+        }
+        done = asyncio.get_running_loop().create_future() if wait else None
+        await self._queue.put((row, done))
+        self.stats.messages += 1
+        if done is not None or self._queue.qsize() >= self.max_batch:
+            self._wake.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        if done is not None:
+            await done
+        return message
+
+    async def aflush(self) -> None:
+        """
+        Wait until everything queued so far is committed, without waiting out
+        `max_delay`.
+        """
+        self._wake.set()
+        await self._queue.join()
+
+    async def aclose(self) -> None:
+        await self.aflush()
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+
+    async def _flush_loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() + 1 < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            self._wake.clear()
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[Pending]):
+        # 같은 id는 마지막 내용과 시각만 남기고, 처음 들어온 위치를 유지
+        rows: Dict[str, Dict[str, Any]] = {}
+        for row, _ in batch:
+            if row["id"] in rows:
+                rows[row["id"]]["content"] = row["content"]
+                rows[row["id"]]["timestamp"] = row["timestamp"]
+                self.stats.coalesced += 1
+            else:
+                rows[row["id"]] = dict(row)
+        start = time.perf_counter()
+        failed: Dict[str, Exception] = {}
+        try:
+            await self._insert(list(rows.values()))
+            self.stats.batches += 1
+            self.stats.rows += len(rows)
+        except Exception as e:
+            logger.warning(
+                f"Batch insert of {len(rows)} chat messages failed, retrying one by one: {e}"
+            )
+            for row in rows.values():
+                try:
+                    await self._insert([row])
+                    self.stats.rows += 1
+                except Exception as row_error:
+                    self.stats.errors += 1
+                    logger.error(
+                        f"Failed to store chat message {row['id']}: {row_error}"
+                    )
+                    failed[row["id"]] = row_error
+        finally:
+            self.stats.flush_seconds += time.perf_counter() - start
+        for row, done in batch:
+            if done is None or done.done():
+                continue
+            if row["id"] in failed:
+                done.set_exception(failed[row["id"]])
+            else:
+                done.set_result(None)
+
+    async def _insert(self, rows: List[Dict[str, Any]]):
+        async with self.session_factory() as db:
+            dialect = db.get_bind().dialect.name
+            await db.execute(upsert_statement(dialect), rows)
+            await db.commit()
+
+    def get_stats(self) -> Dict[str, float]:
+        stats = asdict(self.stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+
+def upsert_statement(dialect: str):
+    """
+    INSERT of chat messages that replaces the content and timestamp of an
+    existing id, on the dialects that support it; a plain INSERT elsewhere.
+    """
+    table = ChatMessage.__table__
+    if dialect == "mysql":
+        statement = mysql.insert(table)
+        return statement.on_duplicate_key_update(
+            content=statement.inserted.content,
+            timestamp=statement.inserted.timestamp,
+        )
+    if dialect == "sqlite":
+        statement = sqlite.insert(table)
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={
+                "content": statement.excluded.content,
+                "timestamp": statement.excluded.timestamp,
+            },
+        )
+    return insert(table)
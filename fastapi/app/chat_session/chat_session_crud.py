@@ -3,6 +3,8 @@ from sqlalchemy.future import select
 from app.chat_session.chat_session_model import ChatSession
 from app.chat_session.chat_session_schema import ChatSessionCreate, ChatSessionUpdate
 from datetime import datetime
+from typing import Optional, Tuple
+from app.db.pagination import keyset_condition
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,19 +25,39 @@ async def get_chat_session(db: AsyncSession, chat_session_id: str):
     return result.scalar_one_or_none()
 
 
-async def get_chat_sessions(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(ChatSession).offset(skip).limit(limit))
+async def get_chat_sessions(
+    db: AsyncSession, limit: int = 100, after_id: Optional[str] = None
+):
+    query = select(ChatSession).order_by(ChatSession.id).limit(limit)
+    if after_id is not None:
+        query = query.filter(ChatSession.id > after_id)
+    result = await db.execute(query)
     return result.scalars().all()
 
 
 async def get_user_chat_sessions(
-    db: AsyncSession, user_id: str, skip: int = 0, limit: int = 100
+    db: AsyncSession,
+    user_id: str,
+    limit: int = 100,
+    before: Optional[Tuple[datetime, str]] = None,
 ):
+    """
+    A user's sessions, most recent first, served by the (user_id, start_time)
+    index.
+
+    Args:
+        db (AsyncSession): Database session.
+        user_id (str): The owner.
+        limit (int): Sessions at most.
+        before (Optional[Tuple[datetime, str]]): Only sessions before this
+            (start_time, id), for the next page.
+    """
+    key = (ChatSession.start_time, ChatSession.id)
+    query = select(ChatSession).filter(ChatSession.user_id == user_id)
+    if before is not None:
+        query = query.filter(keyset_condition(key, before, descending=True))
     result = await db.execute(
-        select(ChatSession)
-        .filter(ChatSession.user_id == user_id)
-        .offset(skip)
-        .limit(limit)
+        query.order_by(*(column.desc() for column in key)).limit(limit)
     )
     return result.scalars().all()
 
@@ -65,3 +87,22 @@ async def delete_chat_session(db: AsyncSession, chat_session_id: str):
         await db.delete(db_chat_session)
         await db.commit()
     return db_chat_session
+
+
+async def update_chat_session_instance(
+    db: AsyncSession, db_chat_session: ChatSession, chat_session: ChatSessionUpdate
+):
+    """
+    Update an already loaded session without selecting it again.
+    """
+    update_data = chat_session.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_chat_session, key, value)
+    await db.commit()
+    return db_chat_session
+
+
+async def delete_chat_session_instance(db: AsyncSession, db_chat_session: ChatSession):
+    await db.delete(db_chat_session)
+    await db.commit()
+    return db_chat_session
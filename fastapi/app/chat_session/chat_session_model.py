@@ -1,7 +1,8 @@
-from sqlalchemy import Column, ForeignKey, DateTime, JSON, String, Boolean
+from sqlalchemy import Column, ForeignKey, DateTime, JSON, String, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.model_base import Base
+from datetime import datetime, timezone
 from uuid import uuid4
 
 
@@ -14,4 +15,11 @@ class ChatSession(Base):
     )
     is_kakao = Column(Boolean, nullable=False, default=False)  # 카카오톡 여부
     context = Column(JSON, nullable=True)  # 세션에 대한 요약/기억 정보
-    start_time = Column(DateTime(timezone=True), server_default=func.now())
+    start_time = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )
+
+    # 사용자별 최근 세션 목록
+    __table_args__ = (Index("ix_chat_sessions_user_start", "user_id", "start_time"),)
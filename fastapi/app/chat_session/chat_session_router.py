@@ -1,19 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
+from app.chat_message.history_cache import ChatHistoryCache
 from app.chat_session.chat_session_crud import (
     create_chat_session,
     get_chat_session,
-    update_chat_session,
-    delete_chat_session,
-    get_chat_sessions,
+    update_chat_session_instance,
+    delete_chat_session_instance,
+    get_user_chat_sessions,
 )
+from app.chat_session.chat_session_model import ChatSession
 from app.chat_session.chat_session_schema import (
     ChatSessionCreate,
     ChatSessionUpdate,
     ChatSessionInDB,
 )
+from app.configs.chat_history import get_history_cache
+from app.db.pagination import (
+    InvalidCursor,
+    Page,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
 from app.db.session import get_db
 from app.user.auth import get_current_user
 import logging
@@ -22,87 +33,102 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+async def get_owned_chat_session(
+    db: AsyncSession, chat_session_id: str, user_id: str, action: str
+) -> ChatSession:
+    """
+    Load a chat session and check that `user_id` owns it, in one query.
+    """
+    db_chat_session = await get_chat_session(db, chat_session_id)
+    if db_chat_session is None:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    if db_chat_session.user_id != user_id:
+        logger.warning(
+            f"Unauthorized {action} attempt to chat session {chat_session_id} by user {user_id}"
+        )
+        raise HTTPException(
+            status_code=403, detail=f"Not authorized to {action} this chat session"
+        )
+    return db_chat_session
+
+
 @router.post("/", response_model=ChatSessionInDB)
-def create_chat_session_route(
+async def create_chat_session_route(
     chat_session: ChatSessionCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
     logger.info(f"User {current_user.id} creating a new chat session")
     chat_session.user_id = current_user.id
-    return create_chat_session(db, chat_session)
+    return await create_chat_session(db, chat_session)
 
 
 @router.get("/{chat_session_id}", response_model=ChatSessionInDB)
-def read_chat_session(
+async def read_chat_session(
     chat_session_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
     logger.info(f"User {current_user.id} requesting chat session {chat_session_id}")
-    db_chat_session = get_chat_session(db, chat_session_id)
-    if db_chat_session is None:
-        raise HTTPException(status_code=404, detail="Chat session not found")
-    if db_chat_session.user_id != current_user.id:
-        logger.warning(
-            f"Unauthorized access attempt to chat session {chat_session_id} by user {current_user.id}"
-        )
-        raise HTTPException(
-            status_code=403, detail="Not authorized to access this chat session"
-        )
-    return db_chat_session
+    return await get_owned_chat_session(db, chat_session_id, current_user.id, "access")
 
 
-@router.get("/", response_model=List[ChatSessionInDB])
-def read_chat_sessions(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+@router.get("/", response_model=Page[ChatSessionInDB])
+async def read_chat_sessions(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
+    """
+    The user's chat sessions, most recent first. Pass `next_cursor` as
+    `cursor` for the next page.
+    """
     logger.info(f"User {current_user.id} requesting their chat sessions")
-    chat_sessions = get_chat_sessions(
-        db, user_id=current_user.id, skip=skip, limit=limit
+    try:
+        before = decode_cursor(cursor, datetime, str) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows = await get_user_chat_sessions(
+        db, user_id=current_user.id, limit=limit + 1, before=before
+    )
+    items, has_more = paginate(rows, limit)
+    return Page[ChatSessionInDB](
+        items=items,
+        next_cursor=(
+            encode_cursor(items[-1].start_time, items[-1].id) if has_more else None
+        ),
+        has_more=has_more,
     )
-    return chat_sessions
 
 
 @router.put("/{chat_session_id}", response_model=ChatSessionInDB)
-def update_chat_session_route(
+async def update_chat_session_route(
     chat_session_id: str,
     chat_session: ChatSessionUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
     logger.info(f"User {current_user.id} updating chat session {chat_session_id}")
-    db_chat_session = get_chat_session(db, chat_session_id)
-    if db_chat_session is None:
-        raise HTTPException(status_code=404, detail="Chat session not found")
-    if db_chat_session.user_id != current_user.id:
-        logger.warning(
-            f"Unauthorized update attempt to chat session {chat_session_id} by user {current_user.id}"
-        )
-        raise HTTPException(
-            status_code=403, detail="Not authorized to update this chat session"
-        )
-    return update_chat_session(db, chat_session_id, chat_session)
+    db_chat_session = await get_owned_chat_session(
+        db, chat_session_id, current_user.id, "update"
+    )
+    # 세션 소유자는 변경할 수 없음
+    chat_session.user_id = current_user.id
+    return await update_chat_session_instance(db, db_chat_session, chat_session)
 
 
 @router.delete("/{chat_session_id}", response_model=ChatSessionInDB)
-def delete_chat_session_route(
+async def delete_chat_session_route(
     chat_session_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
+    cache: ChatHistoryCache = Depends(get_history_cache),
 ):
     logger.info(f"User {current_user.id} deleting chat session {chat_session_id}")
-    db_chat_session = get_chat_session(db, chat_session_id)
-    if db_chat_session is None:
-        raise HTTPException(status_code=404, detail="Chat session not found")
-    if db_chat_session.user_id != current_user.id:
-        logger.warning(
-            f"Unauthorized delete attempt to chat session {chat_session_id} by user {current_user.id}"
-        )
-        raise HTTPException(
-            status_code=403, detail="Not authorized to delete this chat session"
-        )
-    return delete_chat_session(db, chat_session_id)
+    db_chat_session = await get_owned_chat_session(
+        db, chat_session_id, current_user.id, "delete"
+    )
+    db_chat_session = await delete_chat_session_instance(db, db_chat_session)
+    await cache.invalidate(chat_session_id)
+    return db_chat_session
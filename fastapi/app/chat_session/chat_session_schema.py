@@ -22,4 +22,4 @@ class ChatSessionInDB(ChatSessionBase):
     end_time: Optional[datetime] = None
 
     class Config:
-        orm_mode = True
+        from_attributes = True
@@ -0,0 +1,14 @@
+from app.chat_message.history_cache import ChatHistoryCache
+from app.configs.redis import redis_client
+from app.configs.settings import settings
+
+history_cache = ChatHistoryCache(
+    redis_client,
+    max_messages=settings.CHAT_HISTORY_CACHE_MESSAGES,
+    max_bytes=settings.CHAT_HISTORY_CACHE_BYTES,
+    ttl=settings.CHAT_HISTORY_CACHE_TTL,
+)
+
+
+def get_history_cache() -> ChatHistoryCache:
+    return history_cache
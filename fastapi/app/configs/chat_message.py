@@ -0,0 +1,14 @@
+from functools import lru_cache
+from app.chat_message.write_behind import ChatMessageWriter
+from app.configs.mysql import AsyncSessionLocal
+from app.configs.settings import settings
+
+
+@lru_cache(maxsize=None)
+def get_message_writer() -> ChatMessageWriter:
+    return ChatMessageWriter(
+        AsyncSessionLocal,
+        max_batch=settings.CHAT_MESSAGE_WRITE_BATCH,
+        max_delay=settings.CHAT_MESSAGE_WRITE_DELAY,
+        max_pending=settings.CHAT_MESSAGE_WRITE_QUEUE_SIZE,
+    )
@@ -0,0 +1,40 @@
+import importlib
+from functools import lru_cache
+from app.configs.settings import settings
+from app.modules.embeddings.base import BaseEmbeddingModel
+from app.modules.embeddings.cache import EmbeddingCache
+from app.modules.embeddings.service import EmbeddingService
+
+_providers = {
+    "openai": "app.modules.embeddings.openai.OpenAIEmbedding",
+    "fake": "app.modules.embeddings.fake.FakeEmbedding",
+}
+
+
+def create_embedding_model(
+    provider: str, model_name: str, **kwargs
+) -> BaseEmbeddingModel:
+    if provider.lower() not in _providers:
+        raise ValueError(f"Unknown embedding provider '{provider}'.")
+    module_name, class_name = _providers[provider.lower()].rsplit(".", 1)
+    model_cls = getattr(importlib.import_module(module_name), class_name)
+    return model_cls(model_name=model_name, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_embedding_service() -> EmbeddingService:
+    model = create_embedding_model(
+        settings.EMBEDDING_PROVIDER, settings.EMBEDDING_MODEL_NAME
+    )
+    cache = None
+    if settings.EMBEDDING_CACHE_PATH:
+        cache = EmbeddingCache(
+            settings.EMBEDDING_CACHE_PATH,
+            memory_size=settings.EMBEDDING_CACHE_MEMORY_SIZE,
+        )
+    return EmbeddingService(
+        model,
+        cache=cache,
+        max_batch_size=settings.EMBEDDING_MAX_BATCH_SIZE,
+        max_wait=settings.EMBEDDING_MAX_WAIT,
+    )
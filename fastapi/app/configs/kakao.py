@@ -0,0 +1,38 @@
+from functools import lru_cache
+from typing import FrozenSet
+from app.configs.llm import get_llm
+from app.modules.llm_models.cache import CachedLLM
+from app.configs.settings import settings
+from app.configs.web_search import get_web_search_service
+from app.services.kakao.answer import KakaoAnswerer
+from app.services.kakao.callback import CallbackWorker
+
+
+@lru_cache(maxsize=None)
+def get_kakao_answerer() -> KakaoAnswerer:
+    llm = get_llm()
+    if isinstance(llm, CachedLLM):
+        # 카카오 질문에는 대화 이력이 없어 모든 사용자가 캐시를 공유해도 됨
+        llm = llm.scoped("kakao")
+    return KakaoAnswerer(llm, web_search=get_web_search_service())
+
+
+@lru_cache(maxsize=None)
+def get_callback_hosts() -> FrozenSet[str]:
+    return frozenset(
+        host.strip().lower()
+        for host in settings.KAKAO_CALLBACK_HOSTS.split(",")
+        if host.strip()
+    )
+
+
+@lru_cache(maxsize=None)
+def get_callback_worker() -> CallbackWorker:
+    return CallbackWorker(
+        get_kakao_answerer(),
+        workers=settings.KAKAO_CALLBACK_WORKERS,
+        queue_size=settings.KAKAO_CALLBACK_QUEUE_SIZE,
+        answer_timeout=settings.KAKAO_ANSWER_TIMEOUT,
+        max_attempts=settings.KAKAO_CALLBACK_MAX_ATTEMPTS,
+        callback_hosts=get_callback_hosts(),
+    )
@@ -0,0 +1,34 @@
+from functools import lru_cache
+from typing import Sequence
+from app.configs.embeddings import get_embedding_service
+from app.configs.redis import redis_client
+from app.configs.settings import settings
+from app.modules.llm_models.base import BaseLLMModel
+from app.modules.llm_models.cache import CachedLLM, ResponseCache
+from app.modules.llm_models.llm_model_registry import LLMModelRegistry
+from app.modules.prompts.context import ContextBuilder
+
+
+async def embed_prompt(text: str) -> Sequence[float]:
+    return await get_embedding_service().aembed(text)
+
+
+response_cache = ResponseCache(
+    redis_client,
+    ttl=settings.LLM_CACHE_TTL,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    embed=embed_prompt if settings.LLM_CACHE_SEMANTIC else None,
+    similarity_threshold=settings.LLM_CACHE_SIMILARITY_THRESHOLD,
+)
+
+
+def get_llm() -> BaseLLMModel:
+    llm = LLMModelRegistry.get_model(settings.LLM_PROVIDER, settings.LLM_MODEL_NAME)
+    if settings.LLM_CACHE_ENABLED:
+        return CachedLLM(llm, response_cache)
+    return llm
+
+
+@lru_cache(maxsize=None)
+def get_context_builder() -> ContextBuilder:
+    return ContextBuilder()
@@ -0,0 +1,9 @@
+from functools import lru_cache
+from app.configs.redis import redis_client
+from app.configs.settings import settings
+from app.services.multiagent.checkpoint import RedisCheckpointer
+
+
+@lru_cache(maxsize=None)
+def get_checkpointer() -> RedisCheckpointer:
+    return RedisCheckpointer(redis_client, ttl=settings.AGENT_CHECKPOINT_TTL)
@@ -6,6 +6,7 @@ class RedisClient:
     def __init__(self, url: str):
         self.url = url
         self.client = None
+        self.binary_client = None
 
     async def connect(self):
         if self.client is None:
@@ -14,10 +15,21 @@ class RedisClient:
             )
         return self.client
 
+    async def connect_binary(self):
+        """
+        Connection returning raw bytes, for binary values such as msgpack.
+        """
+        if self.binary_client is None:
+            self.binary_client = redis.from_url(self.url, decode_responses=False)
+        return self.binary_client
+
     async def disconnect(self):
         if self.client:
             await self.client.close()
             self.client = None
+        if self.binary_client:
+            await self.binary_client.close()
+            self.binary_client = None
 
 
 redis_client = RedisClient(url=f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}")
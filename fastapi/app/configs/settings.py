@@ -29,6 +29,52 @@ class Settings(BaseSettings):
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
 
+    LLM_PROVIDER: str = "openai"
+    LLM_MODEL_NAME: str = "gpt-4o-mini"
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_TTL: int = 3600
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+    LLM_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    LLM_CACHE_SEMANTIC: bool = False
+
+    EMBEDDING_PROVIDER: str = "openai"
+    EMBEDDING_MODEL_NAME: str = "text-embedding-3-small"
+    EMBEDDING_CACHE_PATH: str = "data/embedding_cache.sqlite"
+    EMBEDDING_CACHE_MEMORY_SIZE: int = 10000
+    EMBEDDING_MAX_BATCH_SIZE: int = 256
+    EMBEDDING_MAX_WAIT: float = 0.01
+
+    TAVILY_API_KEY: str = ""
+    WEB_SEARCH_PROVIDERS: str = "duckduckgo"
+    WEB_SEARCH_TIMEOUT: float = 3.0
+    WEB_SEARCH_DEADLINE: float = 5.0
+    WEB_SEARCH_CACHE_TTL: int = 600
+
+    AGENT_CHECKPOINT_TTL: int = 86400
+
+    KAKAO_CALLBACK_WORKERS: int = 8
+    KAKAO_CALLBACK_QUEUE_SIZE: int = 256
+    KAKAO_CALLBACK_MAX_ATTEMPTS: int = 3
+    KAKAO_ANSWER_TIMEOUT: float = 45.0
+    KAKAO_INLINE_TIMEOUT: float = 4.5
+    KAKAO_CALLBACK_HOSTS: str = "bot-api.kakao.com"
+    KAKAO_BOT_ID: str = ""
+    KAKAO_SKILL_SECRET: str = ""
+
+    CHAT_HISTORY_CACHE_MESSAGES: int = 50
+    CHAT_HISTORY_CACHE_BYTES: int = 65536
+    CHAT_HISTORY_CACHE_TTL: int = 86400
+    CHAT_HISTORY_PROMPT_MESSAGES: int = 20
+
+    CHAT_MESSAGE_WRITE_BATCH: int = 256
+    CHAT_MESSAGE_WRITE_DELAY: float = 0.05
+    CHAT_MESSAGE_WRITE_QUEUE_SIZE: int = 10000
+    CHAT_MESSAGE_PARTIAL_INTERVAL: float = 2.0
+
+    USER_CACHE_TTL: int = 60
+    USER_CACHE_LOCAL_TTL: float = 10.0
+    USER_CACHE_MAX_ENTRIES: int = 10000
+
     @property
     def LOGGING(self):
         log_dir = "/code/logs" if os.getenv("ENVIRONMENT") == "production" else "logs"
@@ -0,0 +1,14 @@
+from app.configs.redis import redis_client
+from app.configs.settings import settings
+from app.user.user_cache import UserCache
+
+user_cache = UserCache(
+    redis_client,
+    ttl=settings.USER_CACHE_TTL,
+    local_ttl=settings.USER_CACHE_LOCAL_TTL,
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+)
+
+
+def get_user_cache() -> UserCache:
+    return user_cache
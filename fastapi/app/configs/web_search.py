@@ -0,0 +1,41 @@
+from functools import lru_cache
+from typing import List
+from app.configs.redis import redis_client
+from app.configs.settings import settings
+from app.modules.web_search.base import WebSearchBase
+from app.modules.web_search.duckduckgo_search import DuckduckgoSearch
+from app.modules.web_search.tavily_search import TavilySearch
+from app.modules.web_search.service import WebSearchService
+
+
+def create_providers(names: List[str]) -> List[WebSearchBase]:
+    providers = []
+    for name in names:
+        if name == "duckduckgo":
+            providers.append(DuckduckgoSearch(timeout=settings.WEB_SEARCH_TIMEOUT))
+        elif name == "tavily":
+            if not settings.TAVILY_API_KEY:
+                raise ValueError("TAVILY_API_KEY is required for the tavily provider.")
+            providers.append(
+                TavilySearch(
+                    settings.TAVILY_API_KEY, timeout=settings.WEB_SEARCH_TIMEOUT
+                )
+            )
+        else:
+            raise ValueError(f"Unknown web search provider '{name}'.")
+    return providers
+
+
+@lru_cache(maxsize=None)
+def get_web_search_service() -> WebSearchService:
+    names = [
+        name.strip().lower()
+        for name in settings.WEB_SEARCH_PROVIDERS.split(",")
+        if name.strip()
+    ]
+    return WebSearchService(
+        create_providers(names),
+        redis_client=redis_client,
+        deadline=settings.WEB_SEARCH_DEADLINE,
+        cache_ttl=settings.WEB_SEARCH_CACHE_TTL,
+    )
@@ -0,0 +1,83 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
+from pydantic import BaseModel
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    # Pass back as `cursor`/`before` to get the next page; None on the last one.
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Opaque cursor for the sort key of the last row of a page.
+    """
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: Type) -> Tuple:
+    """
+    Sort key of a cursor made by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor.
+        types (Type): Type of each key column, `datetime` or `str`.
+
+    Raises:
+        InvalidCursor: The cursor is malformed or has the wrong shape.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise InvalidCursor("Cursor does not match this listing.")
+        return tuple(
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, values)
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        if isinstance(e, InvalidCursor):
+            raise
+        raise InvalidCursor("Malformed cursor.") from e
+
+
+def keyset_condition(
+    columns: Sequence[ColumnElement], values: Sequence[Any], descending: bool
+) -> ColumnElement:
+    """
+    Rows strictly after `values` in the order of `columns`, i.e.
+    `(a, b) > (x, y)`, written as `a >= x AND (a > x OR (a = x AND b > y))`.
+    Row value comparisons are not supported everywhere, and planners cannot
+    range-scan an index on the bare OR; the redundant `a >= x` lets them.
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        after = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, after))
+    bound = columns[0] <= values[0] if descending else columns[0] >= values[0]
+    return and_(bound, or_(*clauses))
+
+
+def paginate(rows: Sequence[T], limit: int) -> Tuple[List[T], bool]:
+    """
+    Split rows fetched with `limit + 1` into the page and whether more follow.
+    """
+    return list(rows[:limit]), len(rows) > limit
@@ -0,0 +1,57 @@
+import dataclasses
+import enum
+import json
+from dataclasses import asdict
+from typing import Any, Mapping
+from pydantic import BaseModel
+
+try:
+    import msgpack
+except ImportError:  # JSON fallback
+    msgpack = None
+
+_MSGPACK = b"m"
+_JSON = b"j"
+
+
+def _plain(value: Any) -> Any:
+    """
+    Plain data for values msgpack and JSON cannot encode. Types are not
+    restored on load: a pydantic model comes back as a dict.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}.")
+
+
+def pack(value: Any) -> bytes:
+    """
+    Serialize with msgpack, or JSON when it is not installed. A one byte prefix
+    records the format, so either can read what the other wrote.
+    """
+    if msgpack is not None:
+        return _MSGPACK + msgpack.packb(value, default=_plain, use_bin_type=True)
+    return _JSON + json.dumps(
+        value, default=_plain, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def unpack(raw: bytes) -> Any:
+    prefix, body = raw[:1], raw[1:]
+    if prefix == _JSON:
+        return json.loads(body)
+    if prefix == _MSGPACK:
+        if msgpack is None:
+            raise RuntimeError(
+                "Value was written with msgpack, which is not installed."
+            )
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    raise ValueError(f"Unknown serialization format {prefix!r}.")
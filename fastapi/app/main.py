@@ -7,13 +7,18 @@ from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.user import user_router
-from app.kakao import chat_router
+from app.services.kakao import chat_router
 from app.chat_session import chat_session_router
 from app.chat_message import chat_message_router
 from app.configs.settings import settings
 from app.configs.mysql import init_db
 from starlette.middleware.sessions import SessionMiddleware
 from app.configs.redis import redis_client
+from app.configs.llm import get_context_builder, response_cache
+from app.configs.kakao import get_callback_worker
+from app.configs.chat_message import get_message_writer
+from app.configs.user_cache import user_cache
+from app.modules.llm_models.llm_model_registry import LLMModelRegistry
 import os
 
 # Logging Settings
@@ -33,8 +38,39 @@ async def lifespan(app: FastAPI):
         logger.error(f"데이터베이스 초기화 중 오류 발생: {str(e)}", exc_info=True)
         raise
 
+    # 첫 요청이 LLM 클라이언트 생성 비용을 치르지 않도록 미리 생성
+    try:
+        LLMModelRegistry.warm_up([(settings.LLM_PROVIDER, settings.LLM_MODEL_NAME)])
+        logger.info("LLM 모델 사전 로딩 완료")
+    except Exception as e:
+        logger.warning(f"LLM 모델 사전 로딩 실패: {str(e)}")
+
+    # 첫 스트리밍 요청이 토크나이저 로딩 비용을 치르지 않도록 미리 로딩
+    try:
+        get_context_builder().counter.encoding
+        logger.info("토크나이저 사전 로딩 완료")
+    except Exception as e:
+        logger.warning(f"토크나이저 사전 로딩 실패: {str(e)}")
+
+    # 다른 워커의 사용자 정보 변경을 구독
+    await user_cache.start()
+
+    app.state.kakao_worker = None
+    try:
+        app.state.kakao_worker = get_callback_worker()
+        await app.state.kakao_worker.start()
+    except Exception as e:
+        logger.warning(f"카카오 콜백 워커 시작 실패: {str(e)}")
+
     yield
     # Shutdown event
+    # 대기 중인 콜백 답변을 보낸 뒤 종료
+    if app.state.kakao_worker is not None:
+        await app.state.kakao_worker.stop()
+    # 대기 중인 채팅 메시지를 DB에 기록
+    await get_message_writer().aclose()
+    await user_cache.stop()
+    await response_cache.flush()
     await redis_client.disconnect()
     logger.info("Application 종료")
 
@@ -72,6 +108,7 @@ def create_app() -> FastAPI:
         chat_message_router.router, prefix="/chat_messages", tags=["chat messages"]
     )
     api_router.include_router(chat_router.router, prefix="/chat", tags=["chat"])
+    app.include_router(api_router)
 
     # Health Check Endpoint
     @app.get("/health", tags=["Health Check"])
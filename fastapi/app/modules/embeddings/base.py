@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional
+import numpy as np
+
+
+class BaseEmbeddingModel(ABC):
+    """
+    Abstract base class for all embedding models.
+    Defines a unified interface for all embedding implementations.
+    """
+
+    # Dimension of the produced vectors, if known before the first call.
+    dim: Optional[int] = None
+    # Largest number of texts sent in one request.
+    max_batch_size: int = 256
+
+    @abstractmethod
+    def embed_documents(self, texts: List[str], **kwargs: Any) -> np.ndarray:
+        """
+        Embed a batch of texts.
+
+        Args:
+            texts (List[str]): The texts to embed.
+            kwargs (Any): Additional parameters for the embedding call.
+
+        Returns:
+            np.ndarray: float32 matrix of shape (len(texts), dim).
+        """
+        pass
+
+    @abstractmethod
+    async def aembed_documents(self, texts: List[str], **kwargs: Any) -> np.ndarray:
+        """
+        Asynchronously embed a batch of texts.
+        Implementations must not block the event loop.
+
+        Args:
+            texts (List[str]): The texts to embed.
+            kwargs (Any): Additional parameters for the embedding call.
+
+        Returns:
+            np.ndarray: float32 matrix of shape (len(texts), dim).
+        """
+        pass
+
+    def embed_query(self, text: str, **kwargs: Any) -> np.ndarray:
+        """
+        Embed a single text.
+
+        Returns:
+            np.ndarray: float32 vector of shape (dim,).
+        """
+        return self.embed_documents([text], **kwargs)[0]
+
+    async def aembed_query(self, text: str, **kwargs: Any) -> np.ndarray:
+        """
+        Asynchronously embed a single text.
+
+        Returns:
+            np.ndarray: float32 vector of shape (dim,).
+        """
+        return (await self.aembed_documents([text], **kwargs))[0]
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping
+import numpy as np
+
+
+@dataclass
+class EmbeddingCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache of embedding vectors keyed by content hash.
+
+    - Memory tier: an LRU of the most recently used vectors.
+    - Disk tier: a local SQLite file (WAL mode) of float32 blobs, so vectors
+      survive restarts and are shared by processes on the same host.
+
+    Keys hash the model name and output dimension together with the text, so
+    switching models or dimensions never returns stale vectors.
+    """
+
+    # SQLite limits the number of bound parameters per statement.
+    _SELECT_CHUNK = 500
+
+    def __init__(self, path: str, memory_size: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): SQLite file path. Parent directories are created.
+            memory_size (int): Maximum number of vectors kept in memory.
+        """
+        self.path = path
+        self.memory_size = memory_size
+        self.stats = EmbeddingCacheStats()
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        # Separate locks so memory lookups on the event loop never wait on disk I/O.
+        self._memory_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key BLOB PRIMARY KEY, vector BLOB NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        """
+        Cache key of a text. `model` identifies the model and its output
+        dimension, e.g. "text-embedding-3-small:256".
+        """
+        return hashlib.sha256(f"{model}\x00{text}".encode()).digest()
+
+    def __len__(self) -> int:
+        with self._db_lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_memory(self, keys: Iterable[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look keys up in the memory tier only. Never touches the disk.
+        """
+        found = {}
+        with self._memory_lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            self.stats.memory_hits += len(found)
+        return found
+
+    def get_disk(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look keys up in the disk tier and promote hits to memory.
+        Blocking; call it from a worker thread in async code.
+        """
+        found = {}
+        with self._db_lock:
+            for start in range(0, len(keys), self._SELECT_CHUNK):
+                chunk = keys[start : start + self._SELECT_CHUNK]
+                rows = self._conn.execute(
+                    "SELECT key, vector FROM embeddings WHERE key IN "
+                    f"({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[bytes(key)] = np.frombuffer(blob, dtype=np.float32)
+            self.stats.disk_hits += len(found)
+            self.stats.misses += len(keys) - len(found)
+        self.remember(found)
+        return found
+
+    def put(self, vectors: Mapping[bytes, np.ndarray]) -> None:
+        """
+        Store vectors in both tiers.
+        Blocking; call it from a worker thread in async code.
+        """
+        rows = [
+            (key, np.ascontiguousarray(vector, dtype=np.float32).tobytes())
+            for key, vector in vectors.items()
+        ]
+        with self._db_lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+            self.stats.writes += len(rows)
+        self.remember(vectors)
+
+    def remember(self, vectors: Mapping[bytes, np.ndarray]) -> None:
+        """
+        Store vectors in the memory tier only.
+        """
+        with self._memory_lock:
+            for key, vector in vectors.items():
+                self._memory[key] = vector
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._memory_lock:
+            self._memory.clear()
+        with self._db_lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._db_lock:
+            self._conn.close()
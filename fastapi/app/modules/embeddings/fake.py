@@ -0,0 +1,85 @@
+import asyncio
+import hashlib
+import re
+import time
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+import numpy as np
+from app.modules.embeddings.base import BaseEmbeddingModel
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+@lru_cache(maxsize=65536)
+def _feature(token: str, dim: int) -> Tuple[int, float]:
+    digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % dim, 1.0 if value >> 63 else -1.0
+
+
+class FakeEmbedding(BaseEmbeddingModel):
+    """
+    Local embedding model that never touches the network.
+
+    Vectors are L2-normalized hashed bags of words and character trigrams, so
+    they are deterministic across processes and texts sharing words are
+    similar, which keeps retrieval tests meaningful. A fixed simulated latency
+    per call allows batching to be measured offline.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "fake",
+        dim: int = 256,
+        latency: float = 0.0,
+        max_batch_size: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the fake embedding model.
+
+        Args:
+            model_name (str): Name reported by the model.
+            dim (int): Dimension of the vectors.
+            latency (float): Simulated round-trip time per call in seconds.
+            max_batch_size (Optional[int]): Largest number of texts per call.
+            kwargs (Any): Ignored; accepted for interface compatibility.
+        """
+        self.model_name = model_name
+        self.dim = dim
+        self.latency = latency
+        if max_batch_size is not None:
+            self.max_batch_size = max_batch_size
+        self.config = kwargs
+        self.call_count = 0
+        self.text_count = 0
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        if len(texts) > self.max_batch_size:
+            raise ValueError(
+                f"Batch of {len(texts)} texts exceeds max_batch_size={self.max_batch_size}."
+            )
+        self.call_count += 1
+        self.text_count += len(texts)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = _WORD_PATTERN.findall(text.lower())
+            tokens = words + [
+                word[i : i + 3] for word in words for i in range(len(word) - 2)
+            ]
+            for token in tokens:
+                index, sign = _feature(token, self.dim)
+                matrix[row, index] += sign
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def embed_documents(self, texts: List[str], **kwargs: Any) -> np.ndarray:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._embed(texts)
+
+    async def aembed_documents(self, texts: List[str], **kwargs: Any) -> np.ndarray:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._embed(texts)
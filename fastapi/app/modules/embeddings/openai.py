@@ -0,0 +1,78 @@
+from typing import Any, List, Optional
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+from app.modules.embeddings.base import BaseEmbeddingModel
+
+
+class OpenAIEmbedding(BaseEmbeddingModel):
+    """
+    OpenAI embedding model using LangChain's OpenAIEmbeddings wrapper.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "text-embedding-3-small",
+        api_key: Optional[str] = None,
+        dimensions: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the OpenAI embedding model.
+
+        Args:
+            model_name (str): The name of the embedding model.
+            api_key (Optional[str]): The OpenAI API key. Falls back to the
+                provider's environment variable when omitted.
+            dimensions (Optional[int]): Output dimension, for models that support
+                shortening (text-embedding-3-*).
+            max_batch_size (Optional[int]): Largest number of texts per request.
+            kwargs (Any): Additional configuration for the model.
+        """
+        self.model_name = model_name
+        self.api_key = api_key
+        self.dimensions = dimensions
+        self.dim = dimensions
+        if max_batch_size is not None:
+            self.max_batch_size = max_batch_size
+        self.config = kwargs
+        self.embeddings = self._build_embeddings()
+
+    def embed_documents(self, texts: List[str], **kwargs: Any) -> np.ndarray:
+        try:
+            vectors = self.embeddings.embed_documents(texts, **kwargs)
+        except Exception as e:
+            raise RuntimeError(f"Error in LangChain OpenAI embeddings: {str(e)}")
+        return self._to_matrix(vectors)
+
+    async def aembed_documents(self, texts: List[str], **kwargs: Any) -> np.ndarray:
+        try:
+            vectors = await self.embeddings.aembed_documents(texts, **kwargs)
+        except Exception as e:
+            raise RuntimeError(f"Error in LangChain OpenAI embeddings: {str(e)}")
+        return self._to_matrix(vectors)
+
+    def configure(self, **kwargs: Any):
+        """
+        Update the configuration of the model.
+
+        Args:
+            kwargs (Any): Parameters to update the model configuration.
+        """
+        self.config.update(kwargs)
+        self.embeddings = self._build_embeddings()
+
+    def _to_matrix(self, vectors: List[List[float]]) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        self.dim = matrix.shape[1]
+        return matrix
+
+    def _build_embeddings(self) -> OpenAIEmbeddings:
+        options = dict(self.config)
+        if self.api_key:
+            options["openai_api_key"] = self.api_key
+        if self.dimensions:
+            options["dimensions"] = self.dimensions
+        return OpenAIEmbeddings(
+            model=self.model_name, chunk_size=self.max_batch_size, **options
+        )
@@ -0,0 +1,206 @@
+import asyncio
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.modules.embeddings.base import BaseEmbeddingModel
+from app.modules.embeddings.cache import EmbeddingCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EmbeddingStats:
+    requested: int = 0
+    cache_hits: int = 0
+    deduplicated: int = 0
+    embedded: int = 0
+    batches: int = 0
+
+
+class EmbeddingService:
+    """
+    Front end for an embedding model shared by all ingestion and query paths.
+
+    - Micro-batching: texts requested concurrently are queued and sent together
+      once `max_batch_size` texts are waiting or `max_wait` seconds have passed.
+    - Deduplication: a text requested again while it is queued or in flight
+      waits for the same result instead of being embedded twice.
+    - Caching: vectors are looked up by content hash in an optional
+      `EmbeddingCache` (memory LRU in front of a local on-disk store).
+    """
+
+    def __init__(
+        self,
+        model: BaseEmbeddingModel,
+        cache: Optional[EmbeddingCache] = None,
+        max_batch_size: Optional[int] = None,
+        max_wait: float = 0.01,
+        max_concurrency: int = 4,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            model (BaseEmbeddingModel): The embedding model.
+            cache (Optional[EmbeddingCache]): Vector cache; disabled if omitted.
+            max_batch_size (Optional[int]): Texts per model call. Defaults to
+                `model.max_batch_size`.
+            max_wait (float): Seconds the first queued text waits for others.
+            max_concurrency (int): Maximum number of model calls in flight.
+        """
+        self.model = model
+        self.cache = cache
+        # Taken once: a model whose dimension is learned on its first call must
+        # keep the same cache keys afterwards.
+        self.cache_namespace = f"{self.model_name}:{model.dim or ''}"
+        self.max_batch_size = min(
+            max_batch_size or model.max_batch_size, model.max_batch_size
+        )
+        self.max_wait = max_wait
+        self.stats = EmbeddingStats()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queue: List[Tuple[bytes, str]] = []
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.model, "model_name", type(self.model).__name__)
+
+    async def aembed(self, text: str) -> np.ndarray:
+        """
+        Embed a single text. Compatible with `EmbedFunction`.
+
+        Returns:
+            np.ndarray: float32 vector of shape (dim,).
+        """
+        return (await self.aembed_many([text]))[0]
+
+    async def aembed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts, in order.
+
+        Args:
+            texts (Sequence[str]): The texts to embed. Duplicates are embedded once.
+
+        Returns:
+            np.ndarray: float32 matrix of shape (len(texts), dim).
+        """
+        self.stats.requested += len(texts)
+        keys = [EmbeddingCache.key(self.cache_namespace, text) for text in texts]
+        unique: Dict[bytes, str] = dict(zip(keys, texts))
+        self.stats.deduplicated += len(keys) - len(unique)
+
+        vectors: Dict[bytes, np.ndarray] = {}
+        futures: Dict[bytes, asyncio.Future] = {}
+        if self.cache is not None:
+            vectors.update(self.cache.get_memory(unique))
+            self.stats.cache_hits += len(vectors)
+            missing = self._join_inflight(unique, vectors, futures)
+            if missing:
+                found = await asyncio.to_thread(self.cache.get_disk, missing)
+                self.stats.cache_hits += len(found)
+                vectors.update(found)
+        for key in self._join_inflight(unique, vectors, futures):
+            futures[key] = self._enqueue(key, unique[key])
+        if futures:
+            # Shield the shared futures: a cancelled caller must not cancel the
+            # embedding for other callers waiting on the same text.
+            results = await asyncio.gather(
+                *(asyncio.shield(future) for future in futures.values())
+            )
+            vectors.update(zip(futures, results))
+
+        if not keys:
+            return np.empty((0, self.model.dim or 0), dtype=np.float32)
+        return np.stack([vectors[key] for key in keys])
+
+    async def flush(self) -> None:
+        """
+        Send queued texts immediately and wait for all model calls to finish.
+        """
+        self._dispatch()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = asdict(self.stats)
+        if self.cache is not None:
+            stats["cache"] = asdict(self.cache.stats)
+        return stats
+
+    def _join_inflight(
+        self,
+        unique: Dict[bytes, str],
+        vectors: Dict[bytes, np.ndarray],
+        futures: Dict[bytes, asyncio.Future],
+    ) -> List[bytes]:
+        """
+        Wait on queued or in-flight embeddings of `unique` texts and return the
+        keys that are still missing.
+        """
+        missing = []
+        for key in unique:
+            if key in vectors or key in futures:
+                continue
+            future = self._inflight.get(key)
+            if future is None:
+                missing.append(key)
+            else:
+                self.stats.deduplicated += 1
+                futures[key] = future
+        return missing
+
+    def _enqueue(self, key: bytes, text: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self._queue.append((key, text))
+        if len(self._queue) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_wait, self._dispatch
+            )
+        return future
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue:
+            batch = self._queue[: self.max_batch_size]
+            self._queue = self._queue[self.max_batch_size :]
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[bytes, str]]):
+        keys = [key for key, _ in batch]
+        try:
+            async with self._semaphore:
+                matrix = await self.model.aembed_documents([text for _, text in batch])
+        except Exception as e:
+            logger.warning(f"Embedding batch of {len(batch)} texts failed: {e}")
+            for key in keys:
+                future = self._inflight.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats.batches += 1
+        self.stats.embedded += len(batch)
+        vectors = dict(zip(keys, matrix))
+        if self.cache is not None:
+            # Visible in memory before the key leaves `_inflight`.
+            self.cache.remember(vectors)
+        for key in keys:
+            future = self._inflight.pop(key)
+            if not future.done():
+                future.set_result(vectors[key])
+        if self.cache is not None:
+            try:
+                await asyncio.to_thread(self.cache.put, vectors)
+            except Exception as e:
+                logger.warning(f"Failed to cache {len(vectors)} embeddings: {e}")
@@ -0,0 +1,70 @@
+"""
+End-to-end ingestion throughput on a synthetic corpus, followed by a resumed run.
+
+    python -m app.modules.ingestion.benchmark --size-mb 100 --workers 4
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+from app.modules.embeddings.fake import FakeEmbedding
+from app.modules.embeddings.service import EmbeddingService
+from app.modules.ingestion.checkpoint import IngestionCheckpoint
+from app.modules.ingestion.pipeline import IngestionPipeline, vector_store_writer
+from app.modules.parsers.benchmark import WRITERS, peak_rss_mb, write_synthetic
+from app.modules.vectorstores.in_memory import InMemoryVectorStore
+
+
+async def run(directory: str, workers: int, dim: int) -> IngestionPipeline:
+    model = FakeEmbedding(dim=dim)
+    service = EmbeddingService(model)
+    store = InMemoryVectorStore(dim)
+    checkpoint = IngestionCheckpoint(os.path.join(directory, "checkpoint.jsonl"))
+    pipeline = IngestionPipeline(
+        service,
+        vector_store_writer(store),
+        checkpoint=checkpoint,
+        max_workers=workers,
+        shard_bytes=8 << 20,
+    )
+    try:
+        await pipeline.run([os.path.join(directory, "corpus")])
+    finally:
+        checkpoint.close()
+    print(f"  vectors in store: {len(store)}")
+    return pipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--dir", default=None, help="Where to write the corpus.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        corpus = os.path.join(directory, "corpus")
+        os.makedirs(corpus)
+        extensions = list(WRITERS)
+        per_file = (args.size_mb << 20) // args.files
+        for i in range(args.files):
+            extension = extensions[i % len(extensions)]
+            write_synthetic(
+                os.path.join(corpus, f"doc{i}{extension}"), per_file, seed=i
+            )
+
+        for label in ("first run", "resumed run"):
+            print(f"{label}:")
+            pipeline = asyncio.run(run(directory, args.workers, args.dim))
+            for name, value in pipeline.metrics.to_dict().items():
+                print(f"  {name}: {value}")
+        print(f"peak RSS (main process): {peak_rss_mb():.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
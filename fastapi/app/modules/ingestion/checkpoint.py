@@ -0,0 +1,91 @@
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    Unit of ingestion work: a whole file, or a byte range of a large file.
+    """
+
+    path: str
+    start: int = 0
+    end: Optional[int] = None
+    # Changes whenever the file is modified: f"{size}:{mtime_ns}".
+    fingerprint: str = ""
+
+    @property
+    def key(self) -> str:
+        return self.path if self.end is None else f"{self.path}@{self.start}"
+
+
+class IngestionCheckpoint:
+    """
+    Append-only JSON Lines log of completed shards.
+
+    A shard is recorded only after its chunks were written to the index, and each
+    record is fsynced, so after a crash a new run skips exactly the shards that
+    were fully ingested. A shard whose file changed since is ingested again.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open or create the checkpoint log.
+
+        Args:
+            path (str): Log file path. Parent directories are created.
+        """
+        self.path = path
+        self._done: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as log:
+                for line in log:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A record cut short by a crash; its shard is redone.
+                        continue
+                    self._done[record["shard"]] = record["fingerprint"]
+        self._log = open(path, "a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def is_done(self, shard: Shard) -> bool:
+        return self._done.get(shard.key) == shard.fingerprint
+
+    def mark_done(self, shard: Shard, chunks: int) -> None:
+        """
+        Durably record a completed shard.
+        Blocking; call it from a worker thread in async code.
+        """
+        record = {
+            "shard": shard.key,
+            "fingerprint": shard.fingerprint,
+            "chunks": chunks,
+        }
+        with self._lock:
+            self._log.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._done[shard.key] = shard.fingerprint
+
+    def reset(self) -> None:
+        """
+        Forget all completed shards.
+        """
+        with self._lock:
+            self._log.truncate(0)
+            self._done.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._log.close()
@@ -0,0 +1,440 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+import numpy as np
+from app.modules.embeddings.service import EmbeddingService
+from app.modules.ingestion.checkpoint import IngestionCheckpoint, Shard
+from app.modules.parsers.base import Section
+from app.modules.parsers.loader import PARSERS, get_parser
+from app.modules.preprocessing.base import Chunk, ChunkerBase
+from app.modules.preprocessing.dedup import MinHasher, NearDuplicateIndex
+from app.modules.preprocessing.tokens import TokenChunker
+from app.modules.retrievals.hybrid import HybridRetriever
+from app.modules.vectorstores.base import VectorStoreBase
+import logging
+
+logger = logging.getLogger(__name__)
+
+IndexWriter = Callable[[List[Chunk], np.ndarray], Awaitable[None]]
+
+
+@dataclass
+class IngestionMetrics:
+    shards_total: int = 0
+    shards_done: int = 0
+    shards_skipped: int = 0
+    shards_failed: int = 0
+    sections: int = 0
+    chunks: int = 0
+    duplicates: int = 0
+    bytes: int = 0
+    parse_seconds: float = 0.0
+    embed_seconds: float = 0.0
+    write_seconds: float = 0.0
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = max(self.elapsed, 1e-9)
+        return {
+            "shards_total": self.shards_total,
+            "shards_done": self.shards_done,
+            "shards_skipped": self.shards_skipped,
+            "shards_failed": self.shards_failed,
+            "sections": self.sections,
+            "chunks": self.chunks,
+            "duplicates": self.duplicates,
+            "elapsed_s": round(elapsed, 3),
+            "chunks_per_s": round(self.chunks / elapsed, 1),
+            "mb_per_s": round(self.bytes / 2**20 / elapsed, 2),
+            # Busy time summed over workers; compare with elapsed to find the bottleneck.
+            "parse_s": round(self.parse_seconds, 3),
+            "embed_s": round(self.embed_seconds, 3),
+            "write_s": round(self.write_seconds, 3),
+        }
+
+
+def vector_store_writer(store: VectorStoreBase) -> IndexWriter:
+    """
+    Index writer adding chunks to a vector store, with the chunk text stored in
+    the "text" metadata.
+    """
+
+    async def write(chunks: List[Chunk], vectors: np.ndarray):
+        await asyncio.to_thread(
+            store.add,
+            [chunk.id for chunk in chunks],
+            vectors,
+            [dict(chunk.metadata, text=chunk.text) for chunk in chunks],
+        )
+
+    return write
+
+
+def hybrid_writer(retriever: HybridRetriever) -> IndexWriter:
+    """
+    Index writer adding chunks to both legs of a `HybridRetriever`.
+    """
+
+    async def write(chunks: List[Chunk], vectors: np.ndarray):
+        await asyncio.to_thread(
+            retriever.add,
+            [chunk.id for chunk in chunks],
+            [chunk.text for chunk in chunks],
+            vectors,
+            [dict(chunk.metadata, text=chunk.text) for chunk in chunks],
+        )
+
+    return write
+
+
+def iter_files(paths: Iterable[str]) -> Iterator[str]:
+    """
+    Expand directories into the files they contain that have a registered parser.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in PARSERS:
+                    yield os.path.join(root, name)
+
+
+# Per-process state of the pool workers, set once by `_init_worker`.
+_worker_chunker: Optional[ChunkerBase] = None
+_worker_parser_options: Dict[str, Dict[str, Any]] = {}
+_worker_hasher: Optional[MinHasher] = None
+
+
+def _init_worker(
+    chunker: ChunkerBase,
+    parser_options: Dict[str, Dict[str, Any]],
+    hasher: Optional[MinHasher],
+):
+    global _worker_chunker, _worker_parser_options, _worker_hasher
+    _worker_chunker = chunker
+    _worker_parser_options = parser_options
+    _worker_hasher = hasher
+
+
+def _process_shard(
+    shard: Shard,
+) -> Tuple[List[Chunk], Optional[np.ndarray], int, float]:
+    """
+    Parse and chunk one shard inside a worker process, and compute the MinHash
+    signatures of the chunks when deduplicating.
+
+    Returns:
+        Tuple[List[Chunk], Optional[np.ndarray], int, float]: Chunks, their
+            signatures, number of sections, seconds spent.
+    """
+    start = time.perf_counter()
+    extension = os.path.splitext(shard.path)[1].lower()
+    parser = get_parser(shard.path, **_worker_parser_options.get(extension, {}))
+    sections = 0
+
+    def counted(iterator: Iterator[Section]) -> Iterator[Section]:
+        nonlocal sections
+        for section in iterator:
+            sections += 1
+            yield section
+
+    # Sections are chunked as they are parsed; only the chunks are kept.
+    chunks = list(
+        _worker_chunker.chunk_sections(
+            counted(parser.parse(shard.path, shard.start, shard.end)),
+            id_prefix=shard.key,
+        )
+    )
+    signatures = None
+    if _worker_hasher is not None:
+        signatures = _worker_hasher.signatures([chunk.text for chunk in chunks])
+    return chunks, signatures, sections, time.perf_counter() - start
+
+
+class IngestionPipeline:
+    """
+    Parse -> chunk -> embed -> index pipeline for large corpora.
+
+    - Parsing and chunking are CPU-bound and run in a `ProcessPoolExecutor`.
+    - Embedding and index writes are I/O-bound and run as async stages; several
+      embed workers share one `EmbeddingService`, which batches their requests.
+    - With a `NearDuplicateIndex`, near-duplicate chunks are filtered before
+      embedding; their signatures are computed in the worker processes.
+    - Stages are connected by bounded queues. When embedding falls behind, the
+      parse stage stops submitting shards, so memory stays bounded.
+    - With a checkpoint, every shard written to the index is recorded; a crashed
+      run is resumed by running the pipeline again on the same paths. Chunk ids
+      are deterministic, so a shard redone after a crash replaces its chunks.
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        writer: IndexWriter,
+        chunker: Optional[ChunkerBase] = None,
+        checkpoint: Optional[IngestionCheckpoint] = None,
+        deduplicator: Optional[NearDuplicateIndex] = None,
+        parser_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_workers: Optional[int] = None,
+        queue_size: int = 16,
+        embed_workers: int = 4,
+        embed_batch_size: int = 256,
+        shard_bytes: int = 32 << 20,
+        mp_start_method: str = "spawn",
+        progress_interval: float = 10.0,
+        on_progress: Optional[Callable[[IngestionMetrics], None]] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            embedding_service (EmbeddingService): Embeds chunk texts.
+            writer (IndexWriter): Async function writing chunks and their vectors,
+                e.g. `vector_store_writer(store)` or `hybrid_writer(retriever)`.
+            chunker (Optional[ChunkerBase]): Defaults to `TokenChunker()`.
+            checkpoint (Optional[IngestionCheckpoint]): Enables resuming.
+            deduplicator (Optional[NearDuplicateIndex]): Filters near-duplicate
+                chunks. A persistent index is saved after every written shard.
+            parser_options (Optional[Dict[str, Dict[str, Any]]]): Parser arguments
+                per file extension, e.g. {".jsonl": {"text_key": "body"}}.
+            max_workers (Optional[int]): Worker processes. Defaults to the CPU count.
+            queue_size (int): Capacity of each inter-stage queue, in shards.
+            embed_workers (int): Concurrent embed stage tasks.
+            embed_batch_size (int): Texts per `aembed_many` call.
+            shard_bytes (int): Files larger than this are split into byte ranges
+                processed in parallel, if their parser is `splittable` (text,
+                Markdown and JSONL). This also bounds the chunks a worker
+                returns at once.
+            mp_start_method (str): Start method of the worker processes. "spawn"
+                is safe to use from a process with running threads.
+            progress_interval (float): Seconds between progress log lines.
+            on_progress (Optional[Callable[[IngestionMetrics], None]]): Called after
+                every completed shard.
+        """
+        self.embedding_service = embedding_service
+        self.writer = writer
+        self.chunker = chunker or TokenChunker()
+        self.checkpoint = checkpoint
+        self.deduplicator = deduplicator
+        self.parser_options = parser_options or {}
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.embed_workers = embed_workers
+        self.embed_batch_size = embed_batch_size
+        self.shard_bytes = shard_bytes
+        self.mp_start_method = mp_start_method
+        self.progress_interval = progress_interval
+        self.on_progress = on_progress
+        self.metrics = IngestionMetrics()
+        self._last_progress = 0.0
+
+    def plan(self, paths: Iterable[str]) -> List[Shard]:
+        """
+        Split the input files into shards.
+        """
+        shards = []
+        for path in iter_files(paths):
+            stat = os.stat(path)
+            fingerprint = f"{stat.st_size}:{stat.st_mtime_ns}"
+            extension = os.path.splitext(path)[1].lower()
+            parser_cls = PARSERS.get(extension)
+            if (
+                parser_cls is not None
+                and parser_cls.splittable
+                and stat.st_size > self.shard_bytes
+            ):
+                shards.extend(
+                    Shard(path, start, start + self.shard_bytes, fingerprint)
+                    for start in range(0, stat.st_size, self.shard_bytes)
+                )
+            else:
+                shards.append(Shard(path, fingerprint=fingerprint))
+        return shards
+
+    async def run(self, paths: Iterable[str]) -> IngestionMetrics:
+        """
+        Ingest files and directories. Shards already recorded in the checkpoint
+        are skipped.
+
+        Args:
+            paths (Iterable[str]): Files, or directories searched recursively.
+
+        Returns:
+            IngestionMetrics: Counters and timings of this run.
+        """
+        self.metrics = IngestionMetrics()
+        shards = self.plan(paths)
+        self.metrics.shards_total = len(shards)
+        pending = [
+            shard
+            for shard in shards
+            if self.checkpoint is None or not self.checkpoint.is_done(shard)
+        ]
+        self.metrics.shards_skipped = len(shards) - len(pending)
+        if self.metrics.shards_skipped:
+            logger.info(
+                f"Resuming ingestion: {self.metrics.shards_skipped}/{len(shards)} "
+                "shards already done"
+            )
+
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.mp_start_method),
+            initializer=_init_worker,
+            initargs=(
+                self.chunker,
+                self.parser_options,
+                self.deduplicator.hasher if self.deduplicator else None,
+            ),
+        )
+        embedders = [
+            asyncio.create_task(self._embed_stage(chunk_queue, write_queue))
+            for _ in range(self.embed_workers)
+        ]
+        writer = asyncio.create_task(self._write_stage(write_queue))
+        try:
+            await self._parse_stage(executor, pending, chunk_queue)
+            for _ in embedders:
+                await chunk_queue.put(None)
+            await asyncio.gather(*embedders)
+            await write_queue.put(None)
+            await writer
+        except BaseException:
+            for task in (*embedders, writer):
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        self._log_progress(force=True)
+        return self.metrics
+
+    async def _parse_stage(
+        self,
+        executor: ProcessPoolExecutor,
+        shards: List[Shard],
+        chunk_queue: asyncio.Queue,
+    ):
+        loop = asyncio.get_running_loop()
+        # Keep every worker busy with one shard queued behind it, and no more.
+        slots = asyncio.Semaphore(2 * self.max_workers)
+
+        async def parse(shard: Shard):
+            try:
+                try:
+                    chunks, signatures, sections, seconds = await loop.run_in_executor(
+                        executor, _process_shard, shard
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to parse {shard.key}: {e}")
+                    self.metrics.shards_failed += 1
+                    return
+                self.metrics.sections += sections
+                self.metrics.parse_seconds += seconds
+                if self.deduplicator is not None:
+                    kept = await asyncio.to_thread(
+                        self.deduplicator.filter, chunks, signatures
+                    )
+                    self.metrics.duplicates += len(chunks) - len(kept)
+                    chunks = kept
+                # Blocks while the embed stage is behind (backpressure).
+                await chunk_queue.put((shard, chunks))
+            finally:
+                slots.release()
+
+        tasks = []
+        for shard in shards:
+            await slots.acquire()
+            tasks.append(asyncio.create_task(parse(shard)))
+        await asyncio.gather(*tasks)
+
+    async def _embed_stage(
+        self, chunk_queue: asyncio.Queue, write_queue: asyncio.Queue
+    ):
+        while True:
+            item = await chunk_queue.get()
+            if item is None:
+                return
+            shard, chunks = item
+            start = time.perf_counter()
+            try:
+                parts = []
+                for i in range(0, len(chunks), self.embed_batch_size):
+                    batch = chunks[i : i + self.embed_batch_size]
+                    parts.append(
+                        await self.embedding_service.aembed_many(
+                            [chunk.text for chunk in batch]
+                        )
+                    )
+            except Exception as e:
+                logger.error(f"Failed to embed {shard.key}: {e}")
+                self.metrics.shards_failed += 1
+                continue
+            self.metrics.embed_seconds += time.perf_counter() - start
+            vectors = np.concatenate(parts) if parts else None
+            await write_queue.put((shard, chunks, vectors))
+
+    async def _write_stage(self, write_queue: asyncio.Queue):
+        while True:
+            item = await write_queue.get()
+            if item is None:
+                return
+            shard, chunks, vectors = item
+            start = time.perf_counter()
+            try:
+                if chunks:
+                    await self.writer(chunks, vectors)
+                if self.deduplicator is not None:
+                    # Before the checkpoint, so a done shard's chunks are always
+                    # in the saved index.
+                    await asyncio.to_thread(self.deduplicator.save)
+                if self.checkpoint is not None:
+                    await asyncio.to_thread(
+                        self.checkpoint.mark_done, shard, len(chunks)
+                    )
+            except Exception as e:
+                logger.error(f"Failed to write {shard.key}: {e}")
+                self.metrics.shards_failed += 1
+                continue
+            self.metrics.write_seconds += time.perf_counter() - start
+            self.metrics.shards_done += 1
+            self.metrics.chunks += len(chunks)
+            size = os.path.getsize(shard.path)
+            end = size if shard.end is None else min(shard.end, size)
+            self.metrics.bytes += end - shard.start
+            if self.on_progress is not None:
+                self.on_progress(self.metrics)
+            self._log_progress()
+
+    def _log_progress(self, force: bool = False):
+        now = time.perf_counter()
+        if not force and now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+        done = self.metrics.shards_done + self.metrics.shards_skipped
+        logger.info(
+            f"Ingestion {done}/{self.metrics.shards_total} shards: "
+            f"{self.metrics.to_dict()}"
+        )
@@ -0,0 +1,98 @@
+from typing import Any, AsyncIterator, Optional
+from langchain_anthropic import ChatAnthropic
+from app.modules.llm_models.base import BaseLLMModel
+
+
+class AnthropicLLM(BaseLLMModel):
+    """
+    Anthropic LLM implementation using LangChain's ChatAnthropic wrapper.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the Anthropic LLM.
+
+        Args:
+            model_name (str): The name of the Anthropic model.
+            api_key (Optional[str]): The Anthropic API key. Falls back to the
+                provider's environment variable when omitted.
+            max_concurrency (Optional[int]): Maximum in-flight requests for `abatch`.
+            kwargs (Any): Additional configuration for the model.
+        """
+        self.model_name = model_name
+        self.api_key = api_key
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+        self.config = kwargs
+        self.llm = self._build_llm()
+
+    def generate(self, prompt: str, **kwargs: Any) -> str:
+        """
+        Generate text using the Anthropic model.
+
+        Args:
+            prompt (str): The input prompt for the model.
+            kwargs (Any): Additional parameters for the Anthropic API.
+
+        Returns:
+            str: The generated text.
+        """
+        try:
+            return self.llm.invoke(prompt, **kwargs).content
+        except Exception as e:
+            raise RuntimeError(f"Error in LangChain Anthropic LLM: {str(e)}")
+
+    async def agenerate(self, prompt: str, **kwargs: Any) -> str:
+        """
+        Asynchronously generate text using the Anthropic model.
+
+        Args:
+            prompt (str): The input prompt for the model.
+            kwargs (Any): Additional parameters for the Anthropic API.
+
+        Returns:
+            str: The generated text.
+        """
+        try:
+            response = await self.llm.ainvoke(prompt, **kwargs)
+            return response.content
+        except Exception as e:
+            raise RuntimeError(f"Error in LangChain Anthropic LLM: {str(e)}")
+
+    async def astream(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        """
+        Stream generated tokens from the Anthropic model as they arrive.
+
+        Args:
+            prompt (str): The input prompt for the model.
+            kwargs (Any): Additional parameters for the Anthropic API.
+
+        Yields:
+            str: The next chunk of generated text.
+        """
+        try:
+            async for chunk in self.llm.astream(prompt, **kwargs):
+                if chunk.content:
+                    yield chunk.content
+        except Exception as e:
+            raise RuntimeError(f"Error in LangChain Anthropic LLM: {str(e)}")
+
+    def configure(self, **kwargs: Any):
+        """
+        Update the configuration of the model.
+
+        Args:
+            kwargs (Any): Parameters to update the model configuration.
+        """
+        self.config.update(kwargs)
+        self.llm = self._build_llm()
+
+    def _build_llm(self) -> ChatAnthropic:
+        credentials = {"anthropic_api_key": self.api_key} if self.api_key else {}
+        return ChatAnthropic(model=self.model_name, **credentials, **self.config)
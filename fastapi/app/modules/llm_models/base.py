@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, AsyncIterator, List, Optional
 
 
 class BaseLLMModel(ABC):
@@ -8,6 +9,9 @@ class BaseLLMModel(ABC):
     Defines a unified interface for all LLM implementations.
     """
 
+    # Default number of in-flight requests allowed by `abatch`.
+    max_concurrency: int = 8
+
     @abstractmethod
     def generate(self, prompt: str, **kwargs: Any) -> str:
         """
@@ -21,3 +25,62 @@ class BaseLLMModel(ABC):
             str: The generated text.
         """
         pass
+
+    @abstractmethod
+    async def agenerate(self, prompt: str, **kwargs: Any) -> str:
+        """
+        Asynchronously generate text based on the input prompt.
+        Implementations must not block the event loop.
+
+        Args:
+            prompt (str): The input prompt for the LLM.
+            kwargs (Any): Additional parameters for the generation.
+
+        Returns:
+            str: The generated text.
+        """
+        pass
+
+    async def astream(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        """
+        Stream generated text as it is produced.
+        The default implementation yields the full `agenerate` result at once;
+        providers that support token streaming should override it.
+
+        Args:
+            prompt (str): The input prompt for the LLM.
+            kwargs (Any): Additional parameters for the generation.
+
+        Yields:
+            str: The next chunk of generated text.
+        """
+        yield await self.agenerate(prompt, **kwargs)
+
+    async def abatch(
+        self,
+        prompts: List[str],
+        max_concurrency: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """
+        Generate text for many prompts concurrently.
+
+        Args:
+            prompts (List[str]): The input prompts for the LLM.
+            max_concurrency (Optional[int]): Maximum number of in-flight requests.
+                Defaults to `self.max_concurrency`.
+            kwargs (Any): Additional parameters passed to `agenerate`.
+
+        Returns:
+            List[str]: The generated texts, in the same order as `prompts`.
+        """
+        limit = self.max_concurrency if max_concurrency is None else max_concurrency
+        if limit < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        semaphore = asyncio.Semaphore(limit)
+
+        async def _run(prompt: str) -> str:
+            async with semaphore:
+                return await self.agenerate(prompt, **kwargs)
+
+        return list(await asyncio.gather(*(_run(prompt) for prompt in prompts)))
@@ -0,0 +1,440 @@
+import asyncio
+import base64
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from dataclasses import dataclass, asdict
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+)
+import numpy as np
+from app.configs.redis import RedisClient
+from app.modules.llm_models.base import BaseLLMModel
+import logging
+
+logger = logging.getLogger(__name__)
+
+EmbedFunction = Callable[[str], Awaitable[Sequence[float]]]
+
+
+@dataclass
+class CacheStats:
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+
+class _SemanticSnapshot:
+    """
+    Local copy of the semantic entries of one (model, params) scope.
+    Rows of `matrix` are L2-normalized embeddings aligned with `responses`.
+    """
+
+    def __init__(self):
+        self.version: Optional[str] = None
+        self.ids: List[str] = []
+        self.responses: List[str] = []
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+
+    def append(self, entry_id: str, embedding: np.ndarray, response: str):
+        if self.matrix.size == 0:
+            self.matrix = embedding[None, :]
+        else:
+            self.matrix = np.vstack([self.matrix, embedding])
+        self.ids.append(entry_id)
+        self.responses.append(response)
+
+
+class ResponseCache:
+    """
+    Two-tier LLM response cache stored in Redis.
+
+    - Exact tier: keyed by a hash of (model, normalized prompt, generation params).
+    - Semantic tier: returns a stored response when the prompt embedding is within
+      `similarity_threshold` (cosine) of a cached prompt with the same model, params
+      and caller scope. Embeddings are kept in Redis and mirrored in a local NumPy
+      matrix that is reloaded only when another worker changes the scope.
+      Lookups without a scope skip this tier: a similar prompt built from one
+      user's history must not return an answer written for another user.
+
+    Both tiers expire entries after `ttl` seconds and evict the oldest entries once
+    `max_entries` (exact) or `max_semantic_entries` (per scope) is exceeded.
+    Redis and embedding errors are logged and treated as misses, so the cache
+    never fails an LLM call.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        namespace: str = "llm_cache",
+        ttl: int = 3600,
+        max_entries: int = 10000,
+        embed: Optional[EmbedFunction] = None,
+        similarity_threshold: float = 0.95,
+        max_semantic_entries: int = 1000,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_client (RedisClient): The application's Redis client wrapper.
+            namespace (str): Prefix of every Redis key written by the cache.
+            ttl (int): Lifetime of an entry in seconds.
+            max_entries (int): Maximum number of exact-tier entries.
+            embed (Optional[EmbedFunction]): Async embedding function. The semantic
+                tier is disabled when omitted.
+            similarity_threshold (float): Minimum cosine similarity for a semantic hit.
+            max_semantic_entries (int): Maximum number of semantic entries per scope.
+        """
+        self.redis_client = redis_client
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self.max_semantic_entries = max_semantic_entries
+        self.stats = CacheStats()
+        self._snapshots: Dict[str, _SemanticSnapshot] = {}
+        self._pending: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", prompt)).strip()
+
+    def _scope(self, model: str, params: Dict[str, Any], scope: str) -> str:
+        raw = json.dumps([model, params, scope], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+    def _digest(self, model: str, prompt: str, params: Dict[str, Any]) -> str:
+        raw = json.dumps(
+            [model, self.normalize_prompt(prompt), params], sort_keys=True, default=str
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(
+        self,
+        model: str,
+        prompt: str,
+        params: Optional[Dict[str, Any]] = None,
+        scope: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Look up a cached response, trying the exact tier first.
+
+        Args:
+            model (str): The model name.
+            prompt (str): The input prompt.
+            params (Optional[Dict[str, Any]]): Generation parameters.
+            scope (Optional[str]): Whose semantic entries may answer, e.g. a
+                user id. The semantic tier is skipped when omitted.
+
+        Returns:
+            Optional[str]: The cached response, or None on a miss.
+        """
+        params = params or {}
+        try:
+            redis = await self.redis_client.connect()
+            response = await redis.get(
+                f"{self.namespace}:exact:{self._digest(model, prompt, params)}"
+            )
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"LLM cache read failed: {e!r}")
+            return None
+        if response is not None:
+            self.stats.exact_hits += 1
+            return response
+
+        if self.embed is not None and scope is not None:
+            response = await self._semantic_get(redis, model, prompt, params, scope)
+            if response is not None:
+                self.stats.semantic_hits += 1
+                return response
+
+        self.stats.misses += 1
+        return None
+
+    async def set(
+        self,
+        model: str,
+        prompt: str,
+        response: str,
+        params: Optional[Dict[str, Any]] = None,
+        scope: Optional[str] = None,
+    ):
+        """
+        Store a response in the exact tier, and in the semantic tier of `scope`.
+
+        Args:
+            model (str): The model name.
+            prompt (str): The input prompt.
+            response (str): The generated response.
+            params (Optional[Dict[str, Any]]): Generation parameters.
+            scope (Optional[str]): Semantic scope of the entry; see `get`.
+        """
+        params = params or {}
+        redis = await self.redis_client.connect()
+        digest = self._digest(model, prompt, params)
+        index_key = f"{self.namespace}:exact:index"
+        now = time.time()
+
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.setex(f"{self.namespace}:exact:{digest}", self.ttl, response)
+            pipe.zadd(index_key, {digest: now})
+            pipe.zremrangebyscore(index_key, "-inf", now - self.ttl)
+            pipe.zcard(index_key)
+            *_, size = await pipe.execute()
+
+        if size > self.max_entries:
+            evicted = await redis.zpopmin(index_key, size - self.max_entries)
+            if evicted:
+                await redis.delete(
+                    *(f"{self.namespace}:exact:{member}" for member, _ in evicted)
+                )
+                self.stats.evictions += len(evicted)
+
+        if self.embed is not None and scope is not None:
+            await self._semantic_set(
+                redis, model, prompt, response, params, scope, digest
+            )
+        self.stats.writes += 1
+
+    def set_in_background(
+        self,
+        model: str,
+        prompt: str,
+        response: str,
+        params: Optional[Dict[str, Any]] = None,
+        scope: Optional[str] = None,
+    ):
+        """
+        Schedule `set` without waiting for it, so callers can return immediately.
+        """
+        task = asyncio.create_task(self.set(model, prompt, response, params, scope))
+        self._pending.add(task)
+        task.add_done_callback(self._on_write_done)
+
+    def _on_write_done(self, task: asyncio.Task):
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.stats.errors += 1
+            logger.warning(f"LLM cache write failed: {task.exception()}")
+
+    async def flush(self):
+        """
+        Wait for all background writes to complete.
+        """
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def _embed(self, prompt: str) -> np.ndarray:
+        vector = np.asarray(
+            await self.embed(self.normalize_prompt(prompt)), dtype=np.float32
+        )
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def _semantic_get(
+        self, redis, model: str, prompt: str, params: Dict[str, Any], scope: str
+    ) -> Optional[str]:
+        scope = self._scope(model, params, scope)
+        try:
+            snapshot = await self._sync_snapshot(redis, scope)
+            if not snapshot.ids:
+                return None
+            query = await self._embed(prompt)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"LLM semantic cache read failed: {e!r}")
+            return None
+        if query.shape[0] != snapshot.matrix.shape[1]:
+            return None
+        scores = snapshot.matrix @ query
+        best = int(np.argmax(scores))
+        if scores[best] >= self.similarity_threshold:
+            return snapshot.responses[best]
+        return None
+
+    async def _semantic_set(
+        self,
+        redis,
+        model: str,
+        prompt: str,
+        response: str,
+        params: Dict[str, Any],
+        scope: str,
+        entry_id: str,
+    ):
+        scope = self._scope(model, params, scope)
+        key = f"{self.namespace}:semantic:{scope}"
+        embedding = await self._embed(prompt)
+        now = time.time()
+        value = json.dumps(
+            {
+                "embedding": base64.b64encode(embedding.tobytes()).decode(),
+                "response": response,
+            }
+        )
+
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, entry_id, value)
+            pipe.zadd(f"{key}:index", {entry_id: now})
+            # Drop expired entries first, so the size counts live entries only.
+            pipe.zrangebyscore(f"{key}:index", "-inf", now - self.ttl)
+            pipe.zremrangebyscore(f"{key}:index", "-inf", now - self.ttl)
+            pipe.zcard(f"{key}:index")
+            pipe.incr(f"{key}:version")
+            for suffix in ("", ":index", ":version"):
+                pipe.expire(f"{key}{suffix}", self.ttl)
+            _, _, expired, _, size, version, *_ = await pipe.execute()
+
+        stale = list(expired)
+        overflow = size - self.max_semantic_entries
+        if overflow > 0:
+            stale += [
+                member for member, _ in await redis.zpopmin(f"{key}:index", overflow)
+            ]
+        if stale:
+            # Already removed from the index by the calls above.
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hdel(key, *stale)
+                pipe.incr(f"{key}:version")
+                await pipe.execute()
+            self.stats.evictions += len(stale)
+            # Removed rows are dropped on the next reload.
+            self._snapshots.pop(scope, None)
+            return
+
+        snapshot = self._snapshots.get(scope)
+        if snapshot is not None and snapshot.version == str(int(version) - 1):
+            # Nobody else wrote in between: extend the local copy instead of reloading.
+            if entry_id not in snapshot.ids and (
+                snapshot.matrix.size == 0
+                or snapshot.matrix.shape[1] == embedding.shape[0]
+            ):
+                snapshot.append(entry_id, embedding, response)
+            snapshot.version = str(version)
+
+    async def _sync_snapshot(self, redis, scope: str) -> _SemanticSnapshot:
+        key = f"{self.namespace}:semantic:{scope}"
+        version = await redis.get(f"{key}:version")
+        snapshot = self._snapshots.get(scope)
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(key)
+            pipe.zrangebyscore(f"{key}:index", time.time() - self.ttl, "+inf")
+            entries, live_ids = await pipe.execute()
+
+        snapshot = _SemanticSnapshot()
+        snapshot.version = version
+        vectors = []
+        for entry_id in live_ids:
+            raw = entries.get(entry_id)
+            if raw is None:
+                continue
+            entry = json.loads(raw)
+            vectors.append(
+                np.frombuffer(base64.b64decode(entry["embedding"]), dtype=np.float32)
+            )
+            snapshot.ids.append(entry_id)
+            snapshot.responses.append(entry["response"])
+        if vectors and len({v.shape[0] for v in vectors}) == 1:
+            snapshot.matrix = np.vstack(vectors)
+        else:
+            snapshot.ids, snapshot.responses = [], []
+        self._snapshots[scope] = snapshot
+        return snapshot
+
+    def get_stats(self) -> Dict[str, int]:
+        return asdict(self.stats)
+
+
+class CachedLLM(BaseLLMModel):
+    """
+    BaseLLMModel wrapper that serves responses from a ResponseCache.
+    Only the async paths are cached; `generate` calls the wrapped model directly.
+    """
+
+    def __init__(
+        self, llm: BaseLLMModel, cache: ResponseCache, scope: Optional[str] = None
+    ):
+        """
+        Initialize the cached model.
+
+        Args:
+            llm (BaseLLMModel): The model to put the cache in front of.
+            cache (ResponseCache): The response cache.
+            scope (Optional[str]): Semantic cache scope; see `ResponseCache.get`.
+        """
+        self.llm = llm
+        self.cache = cache
+        self.scope = scope
+        self.model_name = getattr(llm, "model_name", type(llm).__name__)
+        self.max_concurrency = llm.max_concurrency
+
+    def scoped(self, scope: str) -> "CachedLLM":
+        """
+        The same model and cache, with semantic hits limited to `scope`.
+        """
+        return CachedLLM(self.llm, self.cache, scope)
+
+    def generate(self, prompt: str, **kwargs: Any) -> str:
+        return self.llm.generate(prompt, **kwargs)
+
+    async def agenerate(self, prompt: str, **kwargs: Any) -> str:
+        """
+        Return a cached response or generate and cache a new one.
+
+        Args:
+            prompt (str): The input prompt for the LLM.
+            kwargs (Any): Additional parameters for the generation.
+
+        Returns:
+            str: The generated text.
+        """
+        cached = await self.cache.get(self.model_name, prompt, kwargs, self.scope)
+        if cached is not None:
+            return cached
+        response = await self.llm.agenerate(prompt, **kwargs)
+        self.cache.set_in_background(
+            self.model_name, prompt, response, kwargs, self.scope
+        )
+        return response
+
+    async def astream(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        """
+        Stream a response, yielding a cached response as a single chunk.
+
+        Args:
+            prompt (str): The input prompt for the LLM.
+            kwargs (Any): Additional parameters for the generation.
+
+        Yields:
+            str: The next chunk of generated text.
+        """
+        cached = await self.cache.get(self.model_name, prompt, kwargs, self.scope)
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
+        async for chunk in self.llm.astream(prompt, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        self.cache.set_in_background(
+            self.model_name, prompt, "".join(chunks), kwargs, self.scope
+        )
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Optional
+from app.modules.llm_models.base import BaseLLMModel
+
+
+class FakeLLM(BaseLLMModel):
+    """
+    Local LLM that never touches the network.
+    Returns a deterministic response after a fixed simulated latency,
+    so concurrency and throughput can be measured offline.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "fake",
+        response: Optional[str] = None,
+        latency: float = 0.0,
+        max_concurrency: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the fake LLM.
+
+        Args:
+            model_name (str): Name reported by the model.
+            response (Optional[str]): Fixed response. If omitted, the prompt is echoed.
+            latency (float): Simulated round-trip time in seconds.
+            max_concurrency (Optional[int]): Maximum in-flight requests for `abatch`.
+            kwargs (Any): Ignored; accepted for interface compatibility.
+        """
+        self.model_name = model_name
+        self.response = response
+        self.latency = latency
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+        self.config = kwargs
+        self.call_count = 0
+
+    def _respond(self, prompt: str) -> str:
+        self.call_count += 1
+        if self.response is not None:
+            return self.response
+        return f"[{self.model_name}] {prompt}"
+
+    def generate(self, prompt: str, **kwargs: Any) -> str:
+        """
+        Generate a deterministic response, blocking for `latency` seconds.
+
+        Args:
+            prompt (str): The input prompt.
+            kwargs (Any): Ignored.
+
+        Returns:
+            str: The generated text.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(prompt)
+
+    async def agenerate(self, prompt: str, **kwargs: Any) -> str:
+        """
+        Generate a deterministic response, yielding to the event loop for
+        `latency` seconds.
+
+        Args:
+            prompt (str): The input prompt.
+            kwargs (Any): Ignored.
+
+        Returns:
+            str: The generated text.
+        """
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(prompt)
+
+    async def astream(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        """
+        Stream the deterministic response word by word, spreading `latency`
+        evenly over the emitted chunks.
+
+        Args:
+            prompt (str): The input prompt.
+            kwargs (Any): Ignored.
+
+        Yields:
+            str: The next chunk of generated text.
+        """
+        chunks = self._respond(prompt).split(" ")
+        delay = self.latency / len(chunks)
+        for i, chunk in enumerate(chunks):
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk if i == 0 else f" {chunk}"
+
+    def configure(self, **kwargs: Any):
+        """
+        Update the configuration of the model.
+
+        Args:
+            kwargs (Any): `response` and `latency` are applied; the rest is stored.
+        """
+        self.response = kwargs.pop("response", self.response)
+        self.latency = kwargs.pop("latency", self.latency)
+        self.config.update(kwargs)
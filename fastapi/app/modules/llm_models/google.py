@@ -0,0 +1,100 @@
+from typing import Any, AsyncIterator, Optional
+from langchain_google_genai import ChatGoogleGenerativeAI
+from app.modules.llm_models.base import BaseLLMModel
+
+
+class GoogleLLM(BaseLLMModel):
+    """
+    Google Gemini LLM implementation using LangChain's ChatGoogleGenerativeAI wrapper.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the Google LLM.
+
+        Args:
+            model_name (str): The name of the Gemini model (e.g., "gemini-1.5-flash").
+            api_key (Optional[str]): The Google API key. Falls back to the
+                provider's environment variable when omitted.
+            max_concurrency (Optional[int]): Maximum in-flight requests for `abatch`.
+            kwargs (Any): Additional configuration for the model.
+        """
+        self.model_name = model_name
+        self.api_key = api_key
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+        self.config = kwargs
+        self.llm = self._build_llm()
+
+    def generate(self, prompt: str, **kwargs: Any) -> str:
+        """
+        Generate text using the Google model.
+
+        Args:
+            prompt (str): The input prompt for the model.
+            kwargs (Any): Additional parameters for the Google API.
+
+        Returns:
+            str: The generated text.
+        """
+        try:
+            return self.llm.invoke(prompt, **kwargs).content
+        except Exception as e:
+            raise RuntimeError(f"Error in LangChain Google LLM: {str(e)}")
+
+    async def agenerate(self, prompt: str, **kwargs: Any) -> str:
+        """
+        Asynchronously generate text using the Google model.
+
+        Args:
+            prompt (str): The input prompt for the model.
+            kwargs (Any): Additional parameters for the Google API.
+
+        Returns:
+            str: The generated text.
+        """
+        try:
+            response = await self.llm.ainvoke(prompt, **kwargs)
+            return response.content
+        except Exception as e:
+            raise RuntimeError(f"Error in LangChain Google LLM: {str(e)}")
+
+    async def astream(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        """
+        Stream generated tokens from the Google model as they arrive.
+
+        Args:
+            prompt (str): The input prompt for the model.
+            kwargs (Any): Additional parameters for the Google API.
+
+        Yields:
+            str: The next chunk of generated text.
+        """
+        try:
+            async for chunk in self.llm.astream(prompt, **kwargs):
+                if chunk.content:
+                    yield chunk.content
+        except Exception as e:
+            raise RuntimeError(f"Error in LangChain Google LLM: {str(e)}")
+
+    def configure(self, **kwargs: Any):
+        """
+        Update the configuration of the model.
+
+        Args:
+            kwargs (Any): Parameters to update the model configuration.
+        """
+        self.config.update(kwargs)
+        self.llm = self._build_llm()
+
+    def _build_llm(self) -> ChatGoogleGenerativeAI:
+        credentials = {"google_api_key": self.api_key} if self.api_key else {}
+        return ChatGoogleGenerativeAI(
+            model=self.model_name, **credentials, **self.config
+        )
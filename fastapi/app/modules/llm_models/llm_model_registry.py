@@ -1,5 +1,8 @@
 import importlib
-from typing import Type, Dict, Any, Tuple
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Type, Dict, Any, Hashable, Iterable, Optional, Tuple
 from app.modules.llm_models.base import BaseLLMModel
 
 
@@ -7,20 +10,32 @@ class LLMModelRegistry:
     """
     Registry for managing LLMs from different providers and models.
     Supports dynamic registration and model creation.
+
+    Created models are cached per (provider, model_name, kwargs) so that the
+    underlying LangChain clients and their HTTP connection pools are reused.
     """
 
     _registry: Dict[Tuple[str, str], Type[BaseLLMModel]] = {}
     _default_providers: Dict[str, str] = {
-        "openai": "langchain.llms.OpenAI",
+        "openai": "app.modules.llm_models.openai.OpenAILLM",
+        "anthropic": "app.modules.llm_models.anthropic.AnthropicLLM",
+        "google": "app.modules.llm_models.google.GoogleLLM",
         "huggingface": "langchain.llms.HuggingFaceHub",
+        "fake": "app.modules.llm_models.fake.FakeLLM",
     }
 
+    # Maximum number of model instances kept alive (least recently used evicted).
+    max_cached_instances: int = 16
+    _instances: "OrderedDict[Tuple[str, str, Hashable], BaseLLMModel]" = OrderedDict()
+    _lock = threading.Lock()
+
     @classmethod
     def register_model(
         cls, provider: str, model_name: str, model_cls: Type[BaseLLMModel]
     ):
         """
         Register a new LLM model in the registry.
+        Cached instances of a previously registered class are dropped.
 
         Args:
             provider (str): The provider of the LLM (e.g., "OpenAI", "HuggingFace").
@@ -29,20 +44,92 @@ class LLMModelRegistry:
         """
         key = (provider.lower(), model_name.lower())
         cls._registry[key] = model_cls
+        cls.invalidate(provider, model_name)
 
     @classmethod
-    def get_model(cls, provider: str, model_name: str, **kwargs) -> BaseLLMModel:
+    def get_model(
+        cls, provider: str, model_name: str, use_cache: bool = True, **kwargs
+    ) -> BaseLLMModel:
         """
         Retrieve a registered LLM model or create one dynamically.
 
         Args:
             provider (str): The provider of the LLM (e.g., "OpenAI").
             model_name (str): The name of the model (e.g., "gpt-4o").
+            use_cache (bool): Reuse a cached instance created with the same arguments.
             kwargs (Any): Additional arguments to initialize the model.
 
         Returns:
             BaseLLMModel: An instance of the requested model.
         """
+        if not use_cache:
+            return cls._create_model(provider, model_name, **kwargs)
+
+        cache_key = (provider.lower(), model_name.lower(), cls._freeze(kwargs))
+        with cls._lock:
+            model = cls._instances.get(cache_key)
+            if model is not None:
+                cls._instances.move_to_end(cache_key)
+                return model
+
+        model = cls._create_model(provider, model_name, **kwargs)
+        with cls._lock:
+            # Another thread may have created the same model in the meantime.
+            model = cls._instances.setdefault(cache_key, model)
+            cls._instances.move_to_end(cache_key)
+            while len(cls._instances) > cls.max_cached_instances:
+                cls._instances.popitem(last=False)
+        return model
+
+    @classmethod
+    def warm_up(cls, models: Iterable[Tuple[str, str]], **kwargs) -> None:
+        """
+        Create and cache models ahead of the first request.
+
+        Args:
+            models (Iterable[tuple[str, str]]): (provider, model_name) pairs to load.
+            kwargs (Any): Additional arguments to initialize the models.
+        """
+        for provider, model_name in models:
+            cls.get_model(provider, model_name, **kwargs)
+
+    @classmethod
+    def invalidate(
+        cls, provider: Optional[str] = None, model_name: Optional[str] = None
+    ) -> int:
+        """
+        Drop cached model instances.
+
+        Args:
+            provider (Optional[str]): Only drop instances of this provider.
+            model_name (Optional[str]): Only drop instances of this model.
+
+        Returns:
+            int: The number of dropped instances.
+        """
+        with cls._lock:
+            stale = [
+                key
+                for key in cls._instances
+                if (provider is None or key[0] == provider.lower())
+                and (model_name is None or key[1] == model_name.lower())
+            ]
+            for key in stale:
+                del cls._instances[key]
+        return len(stale)
+
+    @classmethod
+    def list_models(cls) -> list:
+        """
+        List all registered models.
+
+        Returns:
+            list[tuple[str, str]]: A list of (provider, model_name) pairs.
+        """
+        return [(provider, model) for provider, model in cls._registry.keys()]
+
+    @classmethod
+    def _create_model(cls, provider: str, model_name: str, **kwargs) -> BaseLLMModel:
         key = (provider.lower(), model_name.lower())
         if key in cls._registry:
             return cls._registry[key](**kwargs)
@@ -58,19 +145,27 @@ class LLMModelRegistry:
         )
 
     @classmethod
-    def list_models(cls) -> list:
+    def _freeze(cls, value: Any) -> Hashable:
         """
-        List all registered models.
-
-        Returns:
-            list[tuple[str, str]]: A list of (provider, model_name) pairs.
+        Convert keyword arguments into an order-independent hashable key.
         """
-        return [(provider, model) for provider, model in cls._registry.keys()]
+        if isinstance(value, dict):
+            return tuple(sorted((k, cls._freeze(v)) for k, v in value.items()))
+        if isinstance(value, (list, tuple)):
+            return tuple(cls._freeze(v) for v in value)
+        if isinstance(value, (set, frozenset)):
+            return frozenset(cls._freeze(v) for v in value)
+        try:
+            hash(value)
+        except TypeError:
+            return repr(value)
+        return value
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def _dynamic_import(module_path: str):
         """
-        Dynamically import a module or class.
+        Dynamically import a module or class. Results are memoized.
 
         Args:
             module_path (str): The Python path of the module or class to import.
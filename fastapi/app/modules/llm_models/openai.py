@@ -1,5 +1,5 @@
-from typing import Any, List, Generator
-from langchain_openai.llms.base import OpenAI
+from typing import Any, AsyncIterator, Optional
+from langchain_openai.chat_models.base import ChatOpenAI
 from app.modules.llm_models.base import BaseLLMModel
 
 
@@ -8,50 +8,78 @@ class OpenAILLM(BaseLLMModel):
     OpenAI LLM implementation using LangChain's ChatOpenAI wrapper.
     """
 
-    def __init__(self, model_name: str, api_key: str, **kwargs: Any):
+    def __init__(
+        self,
+        model_name: str,
+        api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        **kwargs: Any,
+    ):
         """
         Initialize the OpenAI LLM.
 
         Args:
             model_name (str): The name of the OpenAI model (e.g., "gpt-4o").
-            api_key (str): The OpenAI API key for authentication.
+            api_key (Optional[str]): The OpenAI API key. Falls back to the
+                provider's environment variable when omitted.
+            max_concurrency (Optional[int]): Maximum in-flight requests for `abatch`.
             kwargs (Any): Additional configuration for the model.
         """
         self.model_name = model_name
         self.api_key = api_key
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
         self.config = kwargs
-        self.llm = OpenAI(
-            model=model_name,
-            openai_api_key=api_key,
-            **kwargs,
-        )
-
-    def generate(
-        self, prompts: List[str], stream: bool = False, **kwargs: Any
-    ) -> Generator[str, None, None] | str:
+        self.llm = self._build_llm()
+
+    def generate(self, prompt: str, **kwargs: Any) -> str:
         """
         Generate text using the OpenAI model.
 
         Args:
-            prompts (List[str]): List of input prompts for the model.
-            stream (bool): Whether to stream the response (not directly supported here).
+            prompt (str): The input prompt for the model.
+            kwargs (Any): Additional parameters for the OpenAI API.
+
+        Returns:
+            str: The generated text.
+        """
+        try:
+            return self.llm.invoke(prompt, **kwargs).content
+        except Exception as e:
+            raise RuntimeError(f"Error in LangChain OpenAI LLM: {str(e)}")
+
+    async def agenerate(self, prompt: str, **kwargs: Any) -> str:
+        """
+        Asynchronously generate text using the OpenAI model.
+
+        Args:
+            prompt (str): The input prompt for the model.
             kwargs (Any): Additional parameters for the OpenAI API.
 
         Returns:
-            Generator[str, None, None] | str: The generated text.
+            str: The generated text.
+        """
+        try:
+            response = await self.llm.ainvoke(prompt, **kwargs)
+            return response.content
+        except Exception as e:
+            raise RuntimeError(f"Error in LangChain OpenAI LLM: {str(e)}")
+
+    async def astream(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
         """
-        if len(prompts) != 1:
-            raise ValueError("Only single prompt is supported.")
+        Stream generated tokens from the OpenAI model as they arrive.
 
-        prompt = prompts[0]
+        Args:
+            prompt (str): The input prompt for the model.
+            kwargs (Any): Additional parameters for the OpenAI API.
+
+        Yields:
+            str: The next chunk of generated text.
+        """
         try:
-            if stream:
-                raise NotImplementedError(
-                    "Streaming is not supported in this implementation."
-                )
-            else:
-                response = self.llm.predict(prompt)
-                return response
+            async for chunk in self.llm.astream(prompt, **kwargs):
+                if chunk.content:
+                    yield chunk.content
         except Exception as e:
             raise RuntimeError(f"Error in LangChain OpenAI LLM: {str(e)}")
 
@@ -63,8 +91,8 @@ class OpenAILLM(BaseLLMModel):
             kwargs (Any): Parameters to update the model configuration.
         """
         self.config.update(kwargs)
-        self.llm = ChatOpenAI(
-            model=self.model_name,
-            openai_api_key=self.api_key,
-            **self.config,
-        )
+        self.llm = self._build_llm()
+
+    def _build_llm(self) -> ChatOpenAI:
+        credentials = {"openai_api_key": self.api_key} if self.api_key else {}
+        return ChatOpenAI(model=self.model_name, **credentials, **self.config)
@@ -0,0 +1,242 @@
+import io
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+
+@dataclass
+class Section:
+    """
+    A page or section of a parsed document.
+    """
+
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class ParserBase(ABC):
+    """
+    Abstract base class for all document parsers.
+
+    Parsers are generators: `parse` yields sections while the file is being
+    read, and never holds more than one section (at most `max_section_chars`
+    characters) plus an I/O buffer in memory, whatever the file size.
+    """
+
+    # File extensions handled by the parser, lowercase with the leading dot.
+    extensions: Tuple[str, ...] = ()
+    # Whether `parse` accepts byte ranges, so a large file can be split into
+    # shards parsed in parallel.
+    splittable: bool = False
+
+    def __init__(
+        self,
+        max_section_chars: int = 8000,
+        encoding: str = "utf-8",
+        buffer_size: int = 1 << 16,
+    ):
+        """
+        Initialize the parser.
+
+        Args:
+            max_section_chars (int): Longer sections are split into several.
+            encoding (str): Text encoding of the files. Undecodable bytes are replaced.
+            buffer_size (int): Size of the read buffer in bytes.
+        """
+        if max_section_chars < 1:
+            raise ValueError("max_section_chars must be at least 1.")
+        self.max_section_chars = max_section_chars
+        self.encoding = encoding
+        self.buffer_size = buffer_size
+
+    def parse(
+        self,
+        path: Union[str, os.PathLike],
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> Iterator[Section]:
+        """
+        Lazily parse a file, or with a `splittable` parser only the paragraphs
+        whose first byte lies in [start, end). Ranges are moved to the next
+        paragraph start, so ranges cut at arbitrary byte offsets cover every
+        paragraph exactly once and several workers can share one large file.
+
+        Args:
+            path (str | os.PathLike): The file to parse.
+            start (int): First byte of the range.
+            end (Optional[int]): End of the range, exclusive. Defaults to the file size.
+
+        Yields:
+            Section: The next section, in document order. Sections of a range
+                not starting at 0 have no "line" metadata.
+        """
+        source = os.fspath(path)
+        if start == 0 and end is None:
+            with open(
+                path,
+                "r",
+                encoding=self.encoding,
+                errors="replace",
+                buffering=self.buffer_size,
+            ) as stream:
+                yield from self.parse_stream(stream, source=source)
+            return
+        if not self.splittable:
+            raise ValueError(f"{type(self).__name__} cannot parse byte ranges.")
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            start = self._paragraph_start(file, start, size)
+            end = size if end is None else self._paragraph_start(file, end, size)
+            if start >= end:
+                return
+            file.seek(start)
+            stream = io.TextIOWrapper(
+                io.BufferedReader(_RangeReader(file, end - start), self.buffer_size),
+                encoding=self.encoding,
+                errors="replace",
+            )
+            for section in self.parse_stream(stream, source=source):
+                if start > 0:
+                    # Lines before the range are not counted.
+                    section.metadata.pop("line", None)
+                    section.metadata["offset"] = start
+                yield section
+
+    def _paragraph_start(self, file: BinaryIO, offset: int, size: int) -> int:
+        """
+        First byte at or after `offset` that starts a line following a blank
+        line, or the file size. Assumes an ASCII-compatible encoding.
+        """
+        if offset <= 0:
+            return 0
+        if offset >= size:
+            return size
+        file.seek(offset - 1)
+        # Finish the line holding offset - 1, then look for a blank line.
+        if self._skip_line(file) is None:
+            return size
+        while True:
+            blank = self._skip_line(file)
+            if blank is None:
+                return size
+            if blank:
+                return file.tell()
+
+    def _skip_line(self, file: BinaryIO) -> Optional[bool]:
+        """
+        Read to the end of the current line, `buffer_size` bytes at a time.
+        Returns whether the line was blank, or None at the end of the file.
+        """
+        blank, read = True, False
+        while True:
+            piece = file.readline(self.buffer_size)
+            if not piece:
+                return blank if read else None
+            read = True
+            blank = blank and not piece.strip()
+            if piece.endswith(b"\n"):
+                return blank
+
+    @abstractmethod
+    def parse_stream(self, stream: TextIO, source: str = "") -> Iterator[Section]:
+        """
+        Lazily parse an open text stream.
+
+        Args:
+            stream (TextIO): The stream to read from.
+            source (str): Recorded as the "source" metadata of every section.
+
+        Yields:
+            Section: The next section, in document order.
+        """
+        pass
+
+    def parse_text(self, text: str, source: str = "") -> Iterator[Section]:
+        """
+        Parse an in-memory string.
+        """
+        return self.parse_stream(io.StringIO(text), source=source)
+
+    def iter_lines(self, stream: TextIO) -> Iterator[Tuple[int, str]]:
+        """
+        Iterate over the (1-based line number, line) pairs of a stream. A line
+        longer than `max_section_chars` is returned in pieces cut at whitespace
+        where possible, so a file without newlines is never read at once.
+        """
+        carry = ""
+        line_number = 1
+        while True:
+            line = carry + stream.readline(self.max_section_chars - len(carry))
+            carry = ""
+            if not line:
+                return
+            if len(line) >= self.max_section_chars and not line.endswith("\n"):
+                cut = line.rfind(" ") + 1
+                if cut > len(line) // 2:
+                    line, carry = line[:cut], line[cut:]
+            yield line_number, line
+            line_number += line.endswith("\n")
+
+
+class _RangeReader(io.RawIOBase):
+    """
+    Reads at most `length` bytes of a file from its current position.
+    """
+
+    def __init__(self, file: BinaryIO, length: int):
+        self.file = file
+        self.remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        read = self.file.readinto(memoryview(buffer)[:size])
+        self.remaining -= read
+        return read
+
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into pieces of at most `max_chars` characters, preferring to cut
+    after the last newline or space of each piece.
+    """
+    pieces = []
+    while len(text) > max_chars:
+        cut = max(text.rfind("\n", 0, max_chars), text.rfind(" ", 0, max_chars))
+        cut = cut + 1 if cut > max_chars // 2 else max_chars
+        pieces.append(text[:cut])
+        text = text[cut:]
+    if text:
+        pieces.append(text)
+    return pieces
+
+
+class SectionBuffer:
+    """
+    Accumulates lines of the current section and reports when it is full.
+    """
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.lines: List[str] = []
+        self.size = 0
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def fits(self, line: str) -> bool:
+        return self.size + len(line) <= self.max_chars
+
+    def append(self, line: str):
+        self.lines.append(line)
+        self.size += len(line)
+
+    def pop_text(self) -> str:
+        text = "".join(self.lines).strip()
+        self.lines, self.size = [], 0
+        return text
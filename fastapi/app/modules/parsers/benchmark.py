@@ -0,0 +1,116 @@
+"""
+Throughput and peak memory of the streaming parsers on large synthetic files.
+
+    python -m app.modules.parsers.benchmark --size-mb 200
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import tempfile
+import time
+from typing import Callable, Dict, List, TextIO
+from app.modules.parsers.loader import get_parser
+
+_WORDS = (
+    "검색 증강 생성 문서 벡터 임베딩 질문 답변 모델 데이터 retrieval augmented "
+    "generation document vector embedding query answer model index chunk token"
+).split()
+
+
+def _paragraph(rng: random.Random, n_words: int = 60) -> str:
+    return " ".join(rng.choices(_WORDS, k=n_words))
+
+
+def _write_text(out: TextIO, rng: random.Random):
+    out.write(_paragraph(rng) + "\n" + _paragraph(rng) + "\n\n")
+
+
+def _write_markdown(out: TextIO, rng: random.Random):
+    out.write(f"## {_paragraph(rng, 4)}\n\n{_paragraph(rng)}\n\n")
+
+
+def _write_html(out: TextIO, rng: random.Random):
+    out.write(f"<h2>{_paragraph(rng, 4)}</h2><p>{_paragraph(rng)}</p>\n")
+
+
+def _write_jsonl(out: TextIO, rng: random.Random):
+    record = {"id": rng.getrandbits(32), "text": _paragraph(rng)}
+    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+WRITERS: Dict[str, Callable[[TextIO, random.Random], None]] = {
+    ".txt": _write_text,
+    ".md": _write_markdown,
+    ".html": _write_html,
+    ".jsonl": _write_jsonl,
+}
+
+
+def write_synthetic(path: str, size_bytes: int, seed: int = 0):
+    """
+    Write a synthetic file of about `size_bytes`, streaming to disk.
+    """
+    rng = random.Random(seed)
+    writer = WRITERS[os.path.splitext(path)[1]]
+    with open(path, "w", encoding="utf-8") as out:
+        if path.endswith(".html"):
+            out.write("<html><head><title>benchmark</title></head><body>\n")
+        while out.tell() < size_bytes:
+            writer(out, rng)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(size_mb: int, extensions: List[str], directory: str) -> List[Dict[str, float]]:
+    rows = []
+    for extension in extensions:
+        path = os.path.join(directory, f"synthetic{extension}")
+        write_synthetic(path, size_mb << 20)
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        sections = chars = 0
+        for section in get_parser(path).parse(path):
+            sections += 1
+            chars += len(section.text)
+        elapsed = time.perf_counter() - start
+        rows.append(
+            {
+                "format": extension,
+                "file_mb": size / 2**20,
+                "sections": sections,
+                "mb_per_s": size / 2**20 / elapsed,
+                "peak_rss_mb": peak_rss_mb(),
+            }
+        )
+        os.remove(path)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--formats", nargs="+", default=list(WRITERS))
+    parser.add_argument("--dir", default=None, help="Where to write the files.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        print(f"peak RSS before parsing: {peak_rss_mb():.1f} MB")
+        rows = run(args.size_mb, args.formats, directory)
+    print(
+        f"{'format':<8}{'file MB':>10}{'sections':>12}{'MB/s':>10}{'peak RSS MB':>14}"
+    )
+    for row in rows:
+        print(
+            f"{row['format']:<8}{row['file_mb']:>10.1f}{row['sections']:>12}"
+            f"{row['mb_per_s']:>10.1f}{row['peak_rss_mb']:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import re
+from html.parser import HTMLParser as _StdlibHTMLParser
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+from app.modules.parsers.base import ParserBase, Section
+
+_WHITESPACE_PATTERN = re.compile(r"[ \t\r\f\v\n]+")
+
+_SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "figcaption", "figure", "footer", "form", "header", "hr", "li", "main", "nav",
+    "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+}  # fmt: skip
+_HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+
+class _Sectionizer(_StdlibHTMLParser):
+    """
+    Incremental HTML-to-text converter. Fed in chunks; completed sections are
+    appended to `sections` as soon as the next heading starts.
+    """
+
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.sections: List[Tuple[str, List[str]]] = []
+        self.title: Optional[str] = None
+        self._parts: List[str] = []
+        self._size = 0
+        self._headings: List[Tuple[int, str]] = []
+        self._heading: Optional[Tuple[int, List[str]]] = None
+        self._skip_depth = 0
+        self._in_title = False
+        self._pre_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Any]]):
+        if tag == "title":
+            self._in_title = True
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        if self._skip_depth:
+            return
+        if tag in _HEADING_TAGS:
+            self.flush()
+            self._heading = (_HEADING_TAGS[tag], [])
+        elif tag in _BLOCK_TAGS:
+            self._write("\n")
+        if tag == "pre":
+            self._pre_depth += 1
+
+    def handle_endtag(self, tag: str):
+        if tag == "title":
+            self._in_title = False
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+            return
+        if self._skip_depth:
+            return
+        if tag == "pre":
+            self._pre_depth = max(self._pre_depth - 1, 0)
+        if tag in _HEADING_TAGS and self._heading is not None:
+            level, parts = self._heading
+            title = _WHITESPACE_PATTERN.sub(" ", "".join(parts)).strip()
+            self._heading = None
+            while self._headings and self._headings[-1][0] >= level:
+                self._headings.pop()
+            if title:
+                self._headings.append((level, title))
+                self._write(title + "\n")
+        elif tag in _BLOCK_TAGS:
+            self._write("\n")
+
+    def handle_data(self, data: str):
+        if self._in_title:
+            self.title = (self.title or "") + data.strip()
+        if self._skip_depth:
+            return
+        if self._heading is not None:
+            self._heading[1].append(data)
+            return
+        if not self._pre_depth:
+            data = _WHITESPACE_PATTERN.sub(" ", data)
+        self._write(data)
+
+    def _write(self, text: str):
+        if self._size + len(text) > self.max_chars:
+            self.flush()
+        self._parts.append(text)
+        self._size += len(text)
+
+    def flush(self):
+        lines = (line.strip() for line in "".join(self._parts).split("\n"))
+        text = "\n".join(line for line in lines if line)
+        if text:
+            self.sections.append((text, [title for _, title in self._headings]))
+        self._parts, self._size = [], 0
+
+
+class HTMLParser(ParserBase):
+    """
+    HTML parser that yields one section per heading (h1-h6), with the visible
+    text only: scripts, styles and the document head are dropped and block
+    elements become line breaks. The file is fed to the stdlib parser in
+    `buffer_size` chunks, so sections are produced while reading.
+    """
+
+    extensions = (".html", ".htm", ".xhtml")
+
+    def parse_stream(self, stream: TextIO, source: str = "") -> Iterator[Section]:
+        sectionizer = _Sectionizer(self.max_section_chars)
+        index = 0
+
+        def drain() -> Iterator[Section]:
+            nonlocal index
+            for text, headings in sectionizer.sections:
+                metadata: Dict[str, Any] = {
+                    "source": source,
+                    "section": index,
+                    "headings": headings,
+                }
+                if sectionizer.title:
+                    metadata["title"] = sectionizer.title
+                yield Section(text=text, metadata=metadata)
+                index += 1
+            sectionizer.sections.clear()
+
+        for chunk in iter(lambda: stream.read(self.buffer_size), ""):
+            sectionizer.feed(chunk)
+            yield from drain()
+        sectionizer.close()
+        sectionizer.flush()
+        yield from drain()
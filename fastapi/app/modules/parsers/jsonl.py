@@ -0,0 +1,157 @@
+import json
+import mmap
+import os
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
+from app.modules.parsers.base import ParserBase, Section, split_text
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class JSONLParser(ParserBase):
+    """
+    JSON Lines parser: one section per record (split further if its text is
+    longer than `max_section_chars`).
+
+    Files are memory-mapped and read line by line. Pages already consumed are
+    released with `madvise(MADV_DONTNEED)` every `release_interval` bytes, so
+    resident memory stays bounded even for multi-gigabyte exports.
+    """
+
+    extensions = (".jsonl", ".ndjson")
+    splittable = True
+
+    def __init__(
+        self,
+        text_key: str = "text",
+        metadata_keys: Optional[Sequence[str]] = None,
+        release_interval: int = 16 << 20,
+        **kwargs: Any,
+    ):
+        """
+        Initialize the parser.
+
+        Args:
+            text_key (str): Field holding the text of a record.
+            metadata_keys (Optional[Sequence[str]]): Fields copied to the section
+                metadata. Defaults to every field except `text_key`.
+            release_interval (int): Bytes read between releases of mapped pages.
+            kwargs (Any): See `ParserBase`.
+        """
+        super().__init__(**kwargs)
+        self.text_key = text_key
+        self.metadata_keys = set(metadata_keys) if metadata_keys is not None else None
+        self.release_interval = release_interval
+
+    def parse(
+        self,
+        path: Union[str, os.PathLike],
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> Iterator[Section]:
+        """
+        Lazily parse a file, or only the records whose first byte lies in
+        [start, end). Ranges cut at arbitrary byte offsets cover every record
+        exactly once, so several workers can share one large file.
+
+        Args:
+            path (str | os.PathLike): The file to parse.
+            start (int): First byte of the range.
+            end (Optional[int]): End of the range, exclusive. Defaults to the file size.
+
+        Yields:
+            Section: The next record. "offset" metadata is the byte offset of the
+                record; "line" is only set when parsing from the start of the file.
+        """
+        source = os.fspath(path)
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, "madvise"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                end = len(mapped) if end is None else min(end, len(mapped))
+                if start > 0 and mapped[start - 1] != ord("\n"):
+                    newline = mapped.find(b"\n", start)
+                    start = len(mapped) if newline == -1 else newline + 1
+                mapped.seek(start)
+                yield from self._parse_lines(
+                    self._iter_mapped(mapped, start, end),
+                    source,
+                    first_line=1 if start == 0 else None,
+                )
+
+    def parse_stream(self, stream: TextIO, source: str = "") -> Iterator[Section]:
+        lines = ((None, line) for line in iter(stream.readline, ""))
+        return self._parse_lines(lines, source, first_line=1)
+
+    def _iter_mapped(
+        self, mapped: mmap.mmap, start: int, end: int
+    ) -> Iterator[Tuple[int, bytes]]:
+        released = start - start % mmap.PAGESIZE
+        position = start
+        while position < end:
+            line = mapped.readline()
+            if not line:
+                return
+            yield position, line
+            position = mapped.tell()
+            if (
+                hasattr(mmap, "MADV_DONTNEED")
+                and position - released >= self.release_interval
+            ):
+                release_end = position - position % mmap.PAGESIZE
+                mapped.madvise(mmap.MADV_DONTNEED, released, release_end - released)
+                released = release_end
+
+    def _parse_lines(
+        self,
+        lines: Iterable[Tuple[Optional[int], Union[str, bytes]]],
+        source: str,
+        first_line: Optional[int],
+    ) -> Iterator[Section]:
+        index = 0
+        for i, (offset, line) in enumerate(lines):
+            line_number = first_line + i if first_line is not None else None
+            location = f"{source}:{line_number or f'@{offset}'}"
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                logger.warning(f"Skipping malformed JSON at {location}: {e}")
+                continue
+            if not isinstance(record, dict):
+                record = {self.text_key: record}
+            text = record.get(self.text_key)
+            if not isinstance(text, str) or not text.strip():
+                continue
+
+            metadata: Dict[str, Any] = {
+                key: value
+                for key, value in record.items()
+                if key != self.text_key
+                and (self.metadata_keys is None or key in self.metadata_keys)
+            }
+            metadata["source"] = source
+            if line_number is not None:
+                metadata["line"] = line_number
+            if offset is not None:
+                metadata["offset"] = offset
+            pieces = split_text(text, self.max_section_chars)
+            for part, piece in enumerate(pieces):
+                piece_metadata = dict(metadata, section=index)
+                if len(pieces) > 1:
+                    piece_metadata["part"] = part
+                yield Section(text=piece, metadata=piece_metadata)
+                index += 1
@@ -0,0 +1,38 @@
+import os
+from typing import Any, Dict, Iterator, Type, Union
+from app.modules.parsers.base import ParserBase, Section
+from app.modules.parsers.html import HTMLParser
+from app.modules.parsers.jsonl import JSONLParser
+from app.modules.parsers.markdown import MarkdownParser
+from app.modules.parsers.text import TextParser
+
+PARSERS: Dict[str, Type[ParserBase]] = {
+    extension: parser_cls
+    for parser_cls in (TextParser, MarkdownParser, HTMLParser, JSONLParser)
+    for extension in parser_cls.extensions
+}
+
+
+def get_parser(path: Union[str, os.PathLike], **kwargs: Any) -> ParserBase:
+    """
+    Create the parser registered for the file's extension.
+
+    Args:
+        path (str | os.PathLike): The file to parse.
+        kwargs (Any): Arguments passed to the parser.
+
+    Returns:
+        ParserBase: A parser instance.
+    """
+    extension = os.path.splitext(os.fspath(path))[1].lower()
+    parser_cls = PARSERS.get(extension)
+    if parser_cls is None:
+        raise ValueError(f"No parser registered for '{extension}' files.")
+    return parser_cls(**kwargs)
+
+
+def parse_file(path: Union[str, os.PathLike], **kwargs: Any) -> Iterator[Section]:
+    """
+    Lazily parse a file with the parser registered for its extension.
+    """
+    return get_parser(path, **kwargs).parse(path)
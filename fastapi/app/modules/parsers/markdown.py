@@ -0,0 +1,73 @@
+import re
+from typing import Iterator, List, TextIO, Tuple
+from app.modules.parsers.base import ParserBase, Section, SectionBuffer
+
+_HEADING_PATTERN = re.compile(r"^ {0,3}(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$")
+_FENCE_PATTERN = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+
+
+class MarkdownParser(ParserBase):
+    """
+    Markdown parser that yields one section per heading.
+
+    Each section starts with its heading line and records the path of enclosing
+    headings in the "headings" metadata. Headings inside fenced code blocks are
+    ignored. Sections longer than `max_section_chars` are split and keep the
+    same headings.
+
+    Large files can be parsed in byte ranges, cut at paragraph boundaries. A
+    range does not know the headings above it or whether it starts inside a
+    fenced code block, so only its own headings are recorded.
+    """
+
+    extensions = (".md", ".markdown", ".mdx")
+    splittable = True
+
+    def parse_stream(self, stream: TextIO, source: str = "") -> Iterator[Section]:
+        buffer = SectionBuffer(self.max_section_chars)
+        headings: List[Tuple[int, str]] = []
+        fence = None
+        index = 0
+        start_line = 1
+
+        def flush() -> Iterator[Section]:
+            nonlocal index
+            text = buffer.pop_text()
+            if text:
+                yield Section(
+                    text=text,
+                    metadata={
+                        "source": source,
+                        "section": index,
+                        "line": start_line,
+                        "headings": [title for _, title in headings],
+                    },
+                )
+                index += 1
+
+        for line_number, line in self.iter_lines(stream):
+            fence_match = _FENCE_PATTERN.match(line)
+            if fence_match:
+                marker = fence_match.group(1)
+                if fence is None:
+                    fence = marker
+                elif marker[0] == fence[0] and len(marker) >= len(fence):
+                    fence = None
+            elif fence is None:
+                heading = _HEADING_PATTERN.match(line)
+                if heading:
+                    yield from flush()
+                    level = len(heading.group(1))
+                    while headings and headings[-1][0] >= level:
+                        headings.pop()
+                    headings.append((level, heading.group(2)))
+                    start_line = line_number
+
+            if not buffer.fits(line):
+                yield from flush()
+                start_line = line_number
+            if not buffer and not line.strip():
+                start_line = line_number + 1
+                continue
+            buffer.append(line)
+        yield from flush()
@@ -0,0 +1,45 @@
+from typing import Iterator, TextIO
+from app.modules.parsers.base import ParserBase, Section, SectionBuffer
+
+
+class TextParser(ParserBase):
+    """
+    Plain text parser. Sections are runs of paragraphs: a section ends at a
+    blank line once it holds at least half of `max_section_chars`, and never
+    grows beyond `max_section_chars`.
+
+    Large files can be parsed in byte ranges, cut at paragraph boundaries.
+    """
+
+    extensions = (".txt", ".text", ".log", ".csv", ".tsv")
+    splittable = True
+
+    def parse_stream(self, stream: TextIO, source: str = "") -> Iterator[Section]:
+        buffer = SectionBuffer(self.max_section_chars)
+        index = 0
+        start_line = 1
+
+        def flush() -> Iterator[Section]:
+            nonlocal index
+            text = buffer.pop_text()
+            if text:
+                yield Section(
+                    text=text,
+                    metadata={"source": source, "section": index, "line": start_line},
+                )
+                index += 1
+
+        for line_number, line in self.iter_lines(stream):
+            if not buffer.fits(line):
+                yield from flush()
+                start_line = line_number
+            if not line.strip():
+                if buffer.size >= self.max_section_chars // 2:
+                    yield from flush()
+                    start_line = line_number + 1
+                    continue
+                if not buffer:
+                    start_line = line_number + 1
+                    continue
+            buffer.append(line)
+        yield from flush()
@@ -0,0 +1,61 @@
+import hashlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List
+from app.modules.parsers.base import Section
+
+
+@dataclass
+class Chunk:
+    """
+    A piece of a document sized for embedding and retrieval.
+    """
+
+    id: str
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class ChunkerBase(ABC):
+    """
+    Abstract base class for all chunkers.
+    Chunkers must be picklable: the ingestion pipeline runs them in worker processes.
+    """
+
+    @abstractmethod
+    def split_text(self, text: str) -> List[str]:
+        """
+        Split text into chunks.
+
+        Args:
+            text (str): The text to split.
+
+        Returns:
+            List[str]: The chunks, in order.
+        """
+        pass
+
+    def chunk_sections(
+        self, sections: Iterable[Section], id_prefix: str = ""
+    ) -> Iterator[Chunk]:
+        """
+        Split parsed sections into chunks with deterministic ids.
+
+        Args:
+            sections (Iterable[Section]): Sections of one document.
+            id_prefix (str): Identifies the document; chunk ids hash it together
+                with the section and chunk positions, so re-ingesting the same
+                document produces the same ids.
+
+        Yields:
+            Chunk: Chunks carrying the section metadata plus "chunk" (position
+                within the section).
+        """
+        for section_index, section in enumerate(sections):
+            for chunk_index, text in enumerate(self.split_text(section.text)):
+                key = f"{id_prefix}\x00{section_index}\x00{chunk_index}"
+                yield Chunk(
+                    id=hashlib.sha1(key.encode()).hexdigest(),
+                    text=text,
+                    metadata=dict(section.metadata, chunk=chunk_index),
+                )
@@ -0,0 +1,96 @@
+"""
+Chunking throughput on large synthetic Korean/English text.
+
+    python -m app.modules.preprocessing.benchmark --size-mb 50
+"""
+
+import argparse
+import io
+import random
+import time
+from typing import Callable, Dict, List
+from app.modules.parsers.benchmark import WRITERS
+from app.modules.preprocessing.character import CharacterChunker
+from app.modules.preprocessing.tokens import TokenChunker
+
+
+def synthetic_text(size_bytes: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    out = io.StringIO()
+    write = WRITERS[".txt"]
+    while out.tell() < size_bytes:
+        write(out, rng)
+    return out.getvalue()
+
+
+def retokenizing_split(chunker: TokenChunker, text: str) -> List[str]:
+    """
+    Baseline: grow each chunk word by word and re-count its tokens every time,
+    as splitters that measure candidate chunks with a length function do.
+    """
+    chunks, current = [], []
+    for word in text.split(" "):
+        candidate = " ".join(current + [word])
+        if current and chunker.count_tokens(candidate) > chunker.chunk_size:
+            chunks.append(" ".join(current))
+            current = [word]
+        else:
+            current.append(word)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def measure(split: Callable[[str], List[str]], text: str) -> Dict[str, float]:
+    start = time.perf_counter()
+    chunks = split(text)
+    elapsed = time.perf_counter() - start
+    size_mb = len(text.encode("utf-8")) / 2**20
+    return {"mb": size_mb, "chunks": len(chunks), "mb_per_s": size_mb / elapsed}
+
+
+def run(
+    size_mb: int, baseline_mb: float, chunker: TokenChunker
+) -> Dict[str, Dict[str, float]]:
+    text = synthetic_text(size_mb << 20)
+    # Split per section, as the ingestion pipeline does.
+    sections = [text[i : i + 8000] for i in range(0, len(text), 8000)]
+
+    def per_section(split: Callable[[str], List[str]]) -> Callable[[str], List[str]]:
+        return lambda _: [chunk for section in sections for chunk in split(section)]
+
+    rows = {
+        "token": measure(chunker.split_text, text),
+        "token/8k sections": measure(per_section(chunker.split_text), text),
+        "character": measure(CharacterChunker().split_text, text),
+    }
+    if baseline_mb:
+        sample = text[: int(baseline_mb * 2**20 / 2)]
+        rows["re-tokenizing"] = measure(
+            lambda t: retokenizing_split(chunker, t), sample
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--encoding", default="cl100k_base")
+    parser.add_argument(
+        "--baseline-mb",
+        type=float,
+        default=0.25,
+        help="Text size for the slow re-tokenizing baseline; 0 to skip.",
+    )
+    args = parser.parse_args()
+
+    chunker = TokenChunker(args.chunk_size, args.chunk_size // 8, args.encoding)
+    rows = run(args.size_mb, args.baseline_mb, chunker)
+    print(f"{'chunker':<20}{'MB':>8}{'chunks':>10}{'MB/s':>10}")
+    for name, row in rows.items():
+        print(f"{name:<20}{row['mb']:>8.2f}{row['chunks']:>10}{row['mb_per_s']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
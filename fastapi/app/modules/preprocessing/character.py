@@ -0,0 +1,42 @@
+from typing import List
+from app.modules.preprocessing.base import ChunkerBase
+
+
+class CharacterChunker(ChunkerBase):
+    """
+    Splits text into chunks of at most `chunk_size` characters, cutting at the
+    last paragraph break, line break or space of each window, with
+    `chunk_overlap` characters repeated between consecutive chunks.
+    """
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 100):
+        """
+        Initialize the chunker.
+
+        Args:
+            chunk_size (int): Maximum characters per chunk.
+            chunk_overlap (int): Characters shared by consecutive chunks.
+        """
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be in [0, chunk_size).")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def split_text(self, text: str) -> List[str]:
+        chunks = []
+        start = 0
+        while start < len(text):
+            end = min(start + self.chunk_size, len(text))
+            if end < len(text):
+                for separator in ("\n\n", "\n", " "):
+                    cut = text.rfind(separator, start, end)
+                    if cut > start + self.chunk_overlap:
+                        end = cut + len(separator)
+                        break
+            chunk = text[start:end].strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= len(text):
+                break
+            start = max(end - self.chunk_overlap, start + 1)
+        return chunks
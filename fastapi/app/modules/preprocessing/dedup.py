@@ -0,0 +1,372 @@
+"""
+Near-duplicate detection with MinHash signatures and an LSH banding index.
+
+A chunk is reduced to the set of its character shingles (n-grams of the
+lower-cased, whitespace-collapsed text, which works the same for Korean and
+English). Its MinHash signature holds, for each of `num_perm` hash functions,
+the minimum hash over that set; the fraction of equal signature entries
+estimates the Jaccard similarity of two chunks. Signatures are split into bands
+of `rows` entries and chunks sharing any whole band are candidates, confirmed by
+their estimated similarity.
+
+A persisted index is a directory:
+
+- params.json: hashing and banding parameters; reopening with others fails.
+- signatures.u32: `count x num_perm` little-endian uint32, appended to.
+- ids.txt: one chunk id per line, in the same order.
+
+Both files are append-only; rows past the shorter of the two (a crash during
+`save`) are dropped on load.
+"""
+
+import enum
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.modules.preprocessing.base import Chunk
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Signatures are computed for blocks of texts of about this many characters.
+_BLOCK_CHARS = 1 << 14
+
+
+class DedupAction(str, enum.Enum):
+    DROP = "drop"
+    # Drop the duplicate, recording its source in the "duplicates" metadata of
+    # the chunk it duplicates when that chunk is in the same batch.
+    MERGE = "merge"
+
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer: spreads the polynomial hash over all 64 bits.
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xBF58476D1CE4E5B9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def optimal_bands(
+    threshold: float,
+    num_perm: int,
+    false_positive_weight: float = 0.5,
+    false_negative_weight: float = 0.5,
+) -> Tuple[int, int]:
+    """
+    Choose the number of bands and rows per band minimizing the weighted
+    probability mass of false positives (similarity below the threshold) and
+    false negatives (above it) of the banding scheme.
+
+    Returns:
+        Tuple[int, int]: (bands, rows), with bands * rows <= num_perm.
+    """
+    s = np.linspace(0.0, 1.0, 1001)
+    ds = s[1] - s[0]
+    below = s < threshold
+    best, best_error = (1, num_perm), np.inf
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        collision = 1.0 - (1.0 - s**rows) ** bands
+        false_positives = collision[below].sum() * ds
+        false_negatives = (1.0 - collision[~below]).sum() * ds
+        error = (
+            false_positive_weight * false_positives
+            + false_negative_weight * false_negatives
+        )
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHasher:
+    """
+    Vectorized MinHash. Picklable, so signatures can be computed in the
+    ingestion worker processes.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        """
+        Initialize the hash functions.
+
+        Args:
+            num_perm (int): Signature length.
+            shingle_size (int): Characters per shingle.
+            seed (int): Seed of the hash functions; signatures are only
+                comparable between hashers with the same parameters.
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: (a * x + b) >> 32 with odd a, modulo 2**64.
+        self._a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+
+    def shingles(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        64-bit hashes of the character shingles of many texts, in one pass over
+        their concatenation. Repeated shingles are kept: they do not change the
+        minimum, and skipping a per-text `np.unique` is faster.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Hashes of all texts, concatenated, and
+                the number of hashes of each text (at least one).
+        """
+        width = self.shingle_size
+        # Texts shorter than a shingle are padded to one shingle.
+        normalized = [
+            " ".join(text.lower().split()).ljust(width, "\0") for text in texts
+        ]
+        lengths = np.fromiter(map(len, normalized), dtype=np.int64, count=len(texts))
+        codes = np.frombuffer("".join(normalized).encode("utf-32-le"), dtype="<u4")
+        codes = codes.astype(np.uint64)
+        count = len(codes) - width + 1
+        h = np.zeros(count, dtype=np.uint64)
+        for offset in range(width):
+            h = h * np.uint64(1000003) + codes[offset : offset + count]
+        # Drop the windows that run into the next text.
+        starts = np.cumsum(lengths) - lengths
+        text_of = np.repeat(np.arange(len(texts)), lengths)[:count]
+        valid = np.arange(count) - starts[text_of] <= lengths[text_of] - width
+        return _mix(h[valid]), lengths - width + 1
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        MinHash signatures of many texts.
+
+        Returns:
+            np.ndarray: `len(texts) x num_perm` uint32.
+        """
+        out = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        a, b = self._a[:, None], self._b[:, None]
+        first = 0
+        while first < len(texts):
+            # Blocks of about _BLOCK_CHARS characters keep the
+            # num_perm x shingles matrix small.
+            last, total = first, 0
+            while last < len(texts) and (last == first or total < _BLOCK_CHARS):
+                total += len(texts[last])
+                last += 1
+            hashes, counts = self.shingles(texts[first:last])
+            starts = np.cumsum(counts) - counts
+            hashed = a * hashes[None, :]
+            hashed += b
+            hashed >>= np.uint64(32)
+            out[first:last] = np.minimum.reduceat(hashed, starts, axis=1).T
+            first = last
+        return out
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of chunk signatures that filters near-duplicate chunks.
+
+    With a path the index is persistent: `save` appends the signatures added
+    since the last save, and reopening the index dedupes new ingests against
+    everything ingested before. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        shingle_size: int = 5,
+        action: DedupAction = DedupAction.DROP,
+        seed: int = 1,
+    ):
+        """
+        Open or create the index.
+
+        Args:
+            path (Optional[str]): Directory of a persistent index.
+            threshold (float): Estimated Jaccard similarity at or above which a
+                chunk is a near-duplicate.
+            num_perm (int): Signature length; more is more accurate and slower.
+            shingle_size (int): Characters per shingle.
+            action (DedupAction): What to do with near-duplicates.
+            seed (int): Seed of the hash functions.
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1].")
+        self.path = path
+        self.threshold = threshold
+        self.action = DedupAction(action)
+        self.hasher = MinHasher(num_perm, shingle_size, seed)
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._signatures = np.empty((1024, num_perm), dtype=np.uint32)
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self._saved = 0
+        self._lock = threading.Lock()
+        self.duplicates = 0
+        if path is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """
+        One 64-bit key per band of each signature: `n x bands` uint64.
+        """
+        banded = signatures[:, : self.bands * self.rows].astype(np.uint64)
+        banded = banded.reshape(len(signatures), self.bands, self.rows)
+        keys = np.zeros((len(signatures), self.bands), dtype=np.uint64)
+        for row in range(self.rows):
+            keys = keys * np.uint64(0x100000001B3) + banded[:, :, row]
+        return _mix(keys)
+
+    def _append(self, id: str, signature: np.ndarray, keys: List[int]):
+        row = len(self._ids)
+        if row == len(self._signatures):
+            grown = np.empty((2 * row, self._signatures.shape[1]), dtype=np.uint32)
+            grown[:row] = self._signatures
+            self._signatures = grown
+        self._signatures[row] = signature
+        self._ids.append(id)
+        self._rows[id] = row
+        for table, key in zip(self._tables, keys):
+            table.setdefault(key, []).append(row)
+
+    def _match(self, signature: np.ndarray, keys: List[int]) -> Optional[int]:
+        """
+        Row of an indexed near-duplicate of a signature, if any.
+        """
+        candidates = set()
+        for table, key in zip(self._tables, keys):
+            candidates.update(table.get(key, ()))
+        if not candidates:
+            return None
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarity = (self._signatures[rows] == signature).mean(axis=1)
+        best = int(np.argmax(similarity))
+        return int(rows[best]) if similarity[best] >= self.threshold else None
+
+    def filter(
+        self, chunks: Sequence[Chunk], signatures: Optional[np.ndarray] = None
+    ) -> List[Chunk]:
+        """
+        Index chunks and return those that are not near-duplicates of an indexed
+        chunk or of an earlier chunk of the batch.
+
+        A chunk whose id is already indexed is kept: it is the same chunk being
+        ingested again, e.g. when a shard is redone after a crash.
+
+        Args:
+            chunks (Sequence[Chunk]): Chunks to filter.
+            signatures (Optional[np.ndarray]): Their signatures, if computed
+                already (e.g. in a worker process).
+
+        Returns:
+            List[Chunk]: Kept chunks, in order.
+        """
+        if not chunks:
+            return []
+        if signatures is None:
+            signatures = self.hasher.signatures([chunk.text for chunk in chunks])
+        all_keys = self._band_keys(signatures).tolist()
+        kept: List[Chunk] = []
+        batch: Dict[str, Chunk] = {}
+        with self._lock:
+            for chunk, signature, keys in zip(chunks, signatures, all_keys):
+                if chunk.id in self._rows:
+                    kept.append(chunk)
+                    continue
+                match = self._match(signature, keys)
+                if match is None:
+                    self._append(chunk.id, signature, keys)
+                    kept.append(chunk)
+                    batch[chunk.id] = chunk
+                    continue
+                self.duplicates += 1
+                original = batch.get(self._ids[match])
+                if self.action == DedupAction.MERGE and original is not None:
+                    source = chunk.metadata.get("source", chunk.id)
+                    original.metadata.setdefault("duplicates", []).append(source)
+        return kept
+
+    def save(self) -> None:
+        """
+        Append the signatures added since the last save to the index directory.
+        Blocking; call it from a worker thread in async code.
+        """
+        if self.path is None:
+            return
+        with self._lock:
+            count = len(self._ids)
+            if count == self._saved:
+                return
+            with open(os.path.join(self.path, "signatures.u32"), "ab") as file:
+                file.write(
+                    self._signatures[self._saved : count].astype("<u4").tobytes()
+                )
+                file.flush()
+                os.fsync(file.fileno())
+            with open(
+                os.path.join(self.path, "ids.txt"), "a", encoding="utf-8"
+            ) as file:
+                file.writelines(id + "\n" for id in self._ids[self._saved : count])
+                file.flush()
+                os.fsync(file.fileno())
+            self._saved = count
+
+    def _params(self) -> Dict[str, int]:
+        return {
+            "num_perm": self.hasher.num_perm,
+            "shingle_size": self.hasher.shingle_size,
+            "seed": self.hasher.seed,
+            "bands": self.bands,
+            "rows": self.rows,
+        }
+
+    def _load(self):
+        os.makedirs(self.path, exist_ok=True)
+        params_path = os.path.join(self.path, "params.json")
+        if not os.path.exists(params_path):
+            with open(params_path, "w", encoding="utf-8") as file:
+                json.dump(self._params(), file)
+            return
+        with open(params_path, "r", encoding="utf-8") as file:
+            params = json.load(file)
+        if params != self._params():
+            raise ValueError(
+                f"Index at {self.path} was built with {params}, "
+                f"not {self._params()}."
+            )
+
+        signatures_path = os.path.join(self.path, "signatures.u32")
+        ids_path = os.path.join(self.path, "ids.txt")
+        if not os.path.exists(signatures_path) or not os.path.exists(ids_path):
+            return
+        num_perm = self.hasher.num_perm
+        signatures = np.fromfile(signatures_path, dtype="<u4")
+        signatures = signatures[: len(signatures) // num_perm * num_perm]
+        signatures = signatures.reshape(-1, num_perm)
+        with open(ids_path, "r", encoding="utf-8") as file:
+            ids = [line.rstrip("\n") for line in file if line.endswith("\n")]
+        count = min(len(signatures), len(ids))
+        if (
+            os.path.getsize(signatures_path) != count * num_perm * 4
+            or len(ids) != count
+        ):
+            logger.warning(f"Dropping partially saved rows of {self.path}")
+            with open(signatures_path, "r+b") as file:
+                file.truncate(count * num_perm * 4)
+            with open(ids_path, "w", encoding="utf-8") as file:
+                file.writelines(id + "\n" for id in ids[:count])
+
+        self._signatures = np.empty((max(2 * count, 1024), num_perm), dtype=np.uint32)
+        self._signatures[:count] = signatures[:count]
+        self._ids = ids[:count]
+        self._rows = {id: row for row, id in enumerate(self._ids)}
+        keys = self._band_keys(self._signatures[:count])
+        for band, table in enumerate(self._tables):
+            for row, key in enumerate(keys[:, band].tolist()):
+                table.setdefault(key, []).append(row)
+        self._saved = count
@@ -0,0 +1,167 @@
+import re
+from typing import List, Optional, Sequence, Union
+import numpy as np
+import tiktoken
+from app.modules.preprocessing.base import ChunkerBase
+from app.modules.prompts.tokens import load_encoding
+
+# Sentence ends: terminal punctuation, or a Korean sentence-final ending followed
+# by whitespace (transcripts and chat logs often omit the period). The next
+# sentence must not start with a lowercase letter, which skips "e.g. foo".
+SENTENCE_END = (
+    r"(?:[.!?。！？…][\"'”’)\]]*|(?:니다|[어아에예해]요|죠)(?=\s))(?=\s+[^\sa-z])"
+)
+
+# Split points from the most to the least preferred. A chunk ends at the last
+# split point of the first level that has one inside the chunk window.
+DEFAULT_SEPARATORS = (
+    r"(?=\n[^\S\n]*\n)",  # paragraph
+    r"(?=\n)",  # line
+    SENTENCE_END,  # sentence
+    r"(?=\s)",  # word
+)
+
+
+class TokenChunker(ChunkerBase):
+    """
+    Splits text into chunks of at most `chunk_size` tokens.
+
+    The text is tokenized once; every separator is located with one regex scan
+    and mapped to a token index through the token offsets, so splitting is
+    linear in the text length however many chunks it produces. Like a recursive
+    character splitter, each chunk ends at a paragraph break if one fits, else
+    at a line break, a sentence end, a space, and finally at a token boundary.
+    The encoding is loaded on first use.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 512,
+        chunk_overlap: int = 64,
+        encoding: Union[str, tiktoken.Encoding] = "cl100k_base",
+        separators: Optional[Sequence[str]] = None,
+    ):
+        """
+        Initialize the chunker.
+
+        Args:
+            chunk_size (int): Maximum tokens per chunk.
+            chunk_overlap (int): Tokens shared by consecutive chunks. The overlap
+                starts at a word boundary when there is one.
+            encoding (Union[str, tiktoken.Encoding]): tiktoken encoding, or its name.
+            separators (Optional[Sequence[str]]): Regex patterns of split points,
+                most preferred first. A chunk may end where a match ends.
+        """
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be in [0, chunk_size).")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self._encoding = encoding
+        self.separators = [
+            re.compile(pattern) for pattern in (separators or DEFAULT_SEPARATORS)
+        ]
+        self._token_bytes: Optional[np.ndarray] = None
+
+    @property
+    def encoding(self) -> tiktoken.Encoding:
+        if isinstance(self._encoding, str):
+            self._encoding = load_encoding(self._encoding)
+        return self._encoding
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Rebuilt lazily in each worker process.
+        state["_token_bytes"] = None
+        return state
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.encoding.encode_ordinary(text))
+
+    def token_offsets(self, text: str) -> np.ndarray:
+        """
+        Tokenize text and return the character offset at which each token starts,
+        followed by len(text).
+
+        A token starting inside a multi-byte character (common for Hangul) gets
+        the offset of that character.
+        """
+        tokens = np.asarray(self.encoding.encode_ordinary(text), dtype=np.int64)
+        starts = np.zeros(len(tokens) + 1, dtype=np.int64)
+        np.cumsum(self._byte_lengths()[tokens], out=starts[1:])
+        data = text.encode("utf-8")
+        if len(data) == len(text):
+            return starts
+        raw = np.frombuffer(data, dtype=np.uint8)
+        # Character index of every byte, plus one past the end.
+        char_of_byte = np.empty(len(raw) + 1, dtype=np.int64)
+        np.cumsum((raw & 0xC0) != 0x80, out=char_of_byte[:-1])
+        char_of_byte[:-1] -= 1
+        char_of_byte[-1] = len(text)
+        return char_of_byte[starts]
+
+    def split_text(self, text: str) -> List[str]:
+        if not text:
+            return []
+        offsets = self.token_offsets(text)
+        n_tokens = len(offsets) - 1
+        if n_tokens <= self.chunk_size:
+            chunk = text.strip()
+            return [chunk] if chunk else []
+
+        chunks = []
+        start = 0
+        while start < n_tokens:
+            end = min(start + self.chunk_size, n_tokens)
+            if end < n_tokens:
+                end = self._find_split(text, offsets, start + self.chunk_overlap, end)
+            chunk = text[offsets[start] : offsets[end]].strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= n_tokens:
+                break
+            next_start = end - self.chunk_overlap
+            if self.chunk_overlap:
+                # Start the overlap at the next word boundary.
+                match = self.separators[-1].search(
+                    text, offsets[next_start], offsets[end]
+                )
+                if match:
+                    next_start = int(np.searchsorted(offsets, match.end()))
+            start = max(min(next_start, end), start + 1)
+        return chunks
+
+    def _find_split(self, text: str, offsets: np.ndarray, low: int, high: int) -> int:
+        """
+        Token index in (low, high] at which to end a chunk: the last split point
+        of the most preferred separator found in that window, else `high`.
+
+        Separators are searched only inside the window and only until one
+        matches, so the dense ones (spaces) are rarely scanned at all.
+        """
+        window_start, window_end = offsets[low] + 1, offsets[high]
+        for pattern in self.separators:
+            last = None
+            # Leave room past the window for lookaheads such as SENTENCE_END's.
+            for match in pattern.finditer(text, window_start, window_end + 64):
+                if match.end() > window_end:
+                    break
+                last = match.end()
+            if last is not None:
+                # First token starting at or after the split point: a token that
+                # spans the separator stays whole in the earlier chunk.
+                split = int(np.searchsorted(offsets, last))
+                if low < split <= high:
+                    return split
+        return high
+
+    def _byte_lengths(self) -> np.ndarray:
+        if self._token_bytes is None:
+            lengths = np.zeros(self.encoding.n_vocab, dtype=np.int64)
+            for token in range(self.encoding.n_vocab):
+                try:
+                    lengths[token] = len(self.encoding.decode_single_token_bytes(token))
+                except KeyError:
+                    # Gaps in the vocabulary and special tokens.
+                    pass
+            self._token_bytes = lengths
+        return self._token_bytes
@@ -0,0 +1,63 @@
+import string
+from functools import lru_cache
+from typing import Any, FrozenSet, List, Optional, Tuple
+
+
+class PromptTemplate:
+    """
+    A prompt with `{name}` placeholders, parsed once into literal and variable
+    parts. `format` only joins strings; use `compile_template` to share compiled
+    templates across requests.
+
+    Placeholders are plain identifiers; format specs, conversions and attribute
+    access are rejected so a template cannot reach into the values it renders.
+    Literal braces are written `{{` and `}}`.
+    """
+
+    def __init__(self, source: str):
+        """
+        Parse a template.
+
+        Args:
+            source (str): Template text.
+        """
+        self.source = source
+        parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                raise ValueError(f"Unsupported placeholder '{{{field}}}' in template.")
+            parts.append((literal, field))
+        self._parts = parts
+        self.variables: FrozenSet[str] = frozenset(
+            field for _, field in parts if field is not None
+        )
+        # The template text without its placeholders, for token accounting.
+        self.literal_text = "".join(literal for literal, _ in parts)
+
+    def format(self, **values: Any) -> str:
+        """
+        Render the template.
+
+        Args:
+            values (Any): One value per placeholder; extra values are ignored.
+
+        Returns:
+            str: The rendered prompt.
+        """
+        missing = self.variables - values.keys()
+        if missing:
+            raise ValueError(f"Missing prompt variables: {sorted(missing)}")
+        pieces = []
+        for literal, field in self._parts:
+            pieces.append(literal)
+            if field is not None:
+                pieces.append(str(values[field]))
+        return "".join(pieces)
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> PromptTemplate:
+    """
+    Parse a template, or return the already compiled one for the same text.
+    """
+    return PromptTemplate(source)
@@ -0,0 +1,203 @@
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence, Union
+from app.modules.prompts.base import PromptTemplate, compile_template
+from app.modules.prompts.tokens import TokenCounter
+from app.modules.vectorstores.base import SearchResult
+
+RAG_TEMPLATE = """{system}
+
+# 참고 문서
+{context}
+
+# 이전 대화
+{history}
+
+# 질문
+{question}"""
+
+DEFAULT_SYSTEM = (
+    "당신은 참고 문서를 근거로 답하는 어시스턴트입니다. "
+    "문서에 없는 내용은 모른다고 답하고, 근거가 된 문서 번호를 [1]처럼 표시하세요."
+)
+
+
+@dataclass
+class PackedPrompt:
+    prompt: str
+    tokens: int
+    chunks: List[SearchResult] = field(default_factory=list)
+    history: List[Any] = field(default_factory=list)
+    dropped_chunks: int = 0
+    dropped_history: int = 0
+
+
+class ContextBuilder:
+    """
+    Packs system instructions, chat history and retrieved chunks into a prompt
+    that never exceeds `max_tokens - reserve_tokens` tokens.
+
+    - The system text, question and template are always included.
+    - History is added newest first, up to `max_history_tokens`.
+    - Chunks are added greedily by score: each chunk that still fits is taken,
+      one that does not is skipped in favour of smaller lower-scored ones.
+    - Token counts come from a shared `TokenCounter`, memoized by chunk and
+      message id, so a chunk is tokenized once however many prompts use it.
+      Only the final prompt is tokenized again, to enforce the budget exactly.
+    """
+
+    def __init__(
+        self,
+        template: Union[str, PromptTemplate] = RAG_TEMPLATE,
+        max_tokens: int = 8192,
+        reserve_tokens: int = 1024,
+        max_history_tokens: int = 1024,
+        counter: Optional[TokenCounter] = None,
+        chunk_format: str = "[{index}] {text}",
+        text_key: str = "text",
+        separator: str = "\n\n",
+        order_by_score: bool = True,
+    ):
+        """
+        Initialize the builder.
+
+        Args:
+            template (Union[str, PromptTemplate]): Template with `{system}`,
+                `{context}`, `{history}` and `{question}` placeholders.
+            max_tokens (int): Context window of the model.
+            reserve_tokens (int): Tokens left free for the answer.
+            max_history_tokens (int): Tokens of chat history at most.
+            counter (Optional[TokenCounter]): Shared memoized counter.
+            chunk_format (str): Template of one chunk, with `{index}` and `{text}`.
+            text_key (str): Metadata key holding the chunk text.
+            separator (str): Joins chunks and history messages.
+            order_by_score (bool): Render chunks best first; otherwise in their
+                retrieval order.
+        """
+        self.template = (
+            compile_template(template) if isinstance(template, str) else template
+        )
+        self.max_tokens = max_tokens
+        self.reserve_tokens = reserve_tokens
+        self.max_history_tokens = max_history_tokens
+        self.counter = counter if counter is not None else TokenCounter()
+        self.chunk_format = compile_template(chunk_format)
+        self.text_key = text_key
+        self.separator = separator
+        self.order_by_score = order_by_score
+
+    @property
+    def budget(self) -> int:
+        return self.max_tokens - self.reserve_tokens
+
+    def build(
+        self,
+        question: str,
+        chunks: Sequence[SearchResult] = (),
+        history: Sequence[Any] = (),
+        system: str = DEFAULT_SYSTEM,
+    ) -> PackedPrompt:
+        """
+        Assemble a prompt.
+
+        Args:
+            question (str): The user question.
+            chunks (Sequence[SearchResult]): Retrieved chunks, with their text in
+                `metadata[text_key]`.
+            history (Sequence[Any]): Chat messages, oldest first, with `sender`
+                and `content` attributes (e.g. `ChatMessageInDB`).
+            system (str): System instructions.
+
+        Returns:
+            PackedPrompt: The prompt, its token count and what it contains.
+        """
+        count = self.counter.count
+        separator = count(self.separator)
+        fixed = (
+            count(self.template.literal_text)
+            + count(system)
+            # Questions are one-off; memoizing them would only evict chunks.
+            + self.counter.count_uncached(question)
+        )
+        remaining = self.budget - fixed
+        if remaining < 0:
+            raise ValueError(
+                f"System text and question take {fixed} tokens, over the "
+                f"{self.budget} token budget."
+            )
+
+        history_budget = min(self.max_history_tokens, remaining)
+        kept_history = []
+        for message in reversed(history):
+            key = getattr(message, "id", None)
+            cost = (
+                count(f"{self._sender(message)}: ")
+                + count(message.content, key=("message", key) if key else None)
+                + separator
+            )
+            if cost > history_budget:
+                break
+            history_budget -= cost
+            remaining -= cost
+            kept_history.append(message)
+        kept_history.reverse()
+
+        # Upper bound of the "[n] " prefix of any chunk.
+        prefix = count(self.chunk_format.format(index=len(chunks), text=""))
+        ranked = sorted(range(len(chunks)), key=lambda i: -chunks[i].score)
+        selected = []
+        for i in ranked:
+            text = chunks[i].metadata.get(self.text_key) or ""
+            cost = prefix + count(text, key=("chunk", chunks[i].id)) + separator
+            if cost <= remaining:
+                remaining -= cost
+                selected.append(i)
+        if not self.order_by_score:
+            selected.sort()
+
+        while True:
+            prompt = self._render(question, system, chunks, selected, kept_history)
+            tokens = self.counter.count_uncached(prompt)
+            if tokens <= self.budget:
+                break
+            # Token merges across part boundaries can exceed the estimate.
+            if selected:
+                selected.remove(min(selected, key=lambda i: chunks[i].score))
+            elif kept_history:
+                kept_history.pop(0)
+            else:
+                raise ValueError(f"Prompt needs {tokens} tokens, over the budget.")
+
+        return PackedPrompt(
+            prompt=prompt,
+            tokens=tokens,
+            chunks=[chunks[i] for i in selected],
+            history=kept_history,
+            dropped_chunks=len(chunks) - len(selected),
+            dropped_history=len(history) - len(kept_history),
+        )
+
+    @staticmethod
+    def _sender(message: Any) -> str:
+        sender = message.sender
+        return getattr(sender, "value", sender)
+
+    def _render(
+        self,
+        question: str,
+        system: str,
+        chunks: Sequence[SearchResult],
+        selected: List[int],
+        history: List[Any],
+    ) -> str:
+        context = self.separator.join(
+            self.chunk_format.format(
+                index=n + 1, text=chunks[i].metadata.get(self.text_key) or ""
+            )
+            for n, i in enumerate(selected)
+        )
+        history_text = self.separator.join(
+            f"{self._sender(message)}: {message.content}" for message in history
+        )
+        return self.template.format(
+            system=system, context=context, history=history_text, question=question
+        )
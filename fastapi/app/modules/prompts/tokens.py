@@ -0,0 +1,99 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Union
+import tiktoken
+
+
+def load_encoding(encoding: Union[str, tiktoken.Encoding]) -> tiktoken.Encoding:
+    """
+    A tiktoken encoding, or the one with this name.
+
+    tiktoken downloads an encoding the first time it is used and keeps it under
+    `TIKTOKEN_CACHE_DIR`. Hosts without network access need that directory
+    filled beforehand; the Docker image does so at build time.
+
+    Raises:
+        RuntimeError: If the encoding cannot be loaded.
+    """
+    if not isinstance(encoding, str):
+        return encoding
+    try:
+        return tiktoken.get_encoding(encoding)
+    except Exception as e:
+        raise RuntimeError(
+            f"Could not load tiktoken encoding '{encoding}'. It is downloaded on "
+            "first use; without network access, set TIKTOKEN_CACHE_DIR to a "
+            "directory that already holds it."
+        ) from e
+
+
+class TokenCounter:
+    """
+    Memoized token counts. Chunks and chat messages are counted once, keyed by
+    their id, and then looked up on every request that uses them. The encoding
+    is loaded on first use.
+    """
+
+    def __init__(
+        self,
+        encoding: Union[str, tiktoken.Encoding] = "cl100k_base",
+        max_entries: int = 100000,
+    ):
+        """
+        Initialize the counter.
+
+        Args:
+            encoding (Union[str, tiktoken.Encoding]): tiktoken encoding, or its name.
+            max_entries (int): Memoized counts kept, least recently used evicted.
+        """
+        self._encoding = encoding
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._counts: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def encoding(self) -> tiktoken.Encoding:
+        if isinstance(self._encoding, str):
+            self._encoding = load_encoding(self._encoding)
+        return self._encoding
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def count(self, text: str, key: Optional[Hashable] = None) -> int:
+        """
+        Number of tokens of a text.
+
+        Args:
+            text (str): The text.
+            key (Optional[Hashable]): Memo key, e.g. a chunk id. Defaults to the
+                text itself. A key must always be used with the same text.
+
+        Returns:
+            int: The token count.
+        """
+        key = text if key is None else key
+        with self._lock:
+            tokens = self._counts.get(key)
+            if tokens is not None:
+                self._counts.move_to_end(key)
+                self.hits += 1
+                return tokens
+        tokens = self.count_uncached(text)
+        with self._lock:
+            self.misses += 1
+            self._counts[key] = tokens
+            if len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+        return tokens
+
+    def count_uncached(self, text: str) -> int:
+        return len(self.encoding.encode_ordinary(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self.encoding.encode_ordinary(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return self.encoding.decode(tokens[:max_tokens], errors="ignore")
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class RerankScorerBase(ABC):
+    """
+    Abstract base class for reranking scorers.
+    A scorer rates the relevance of many passages to one query in one call, so
+    implementations can batch the work (one model forward pass, one LLM prompt).
+    """
+
+    # Passages per `ascore` call; the reranker never sends more.
+    max_batch_size: int = 16
+
+    @abstractmethod
+    async def ascore(self, query: str, passages: List[str]) -> List[float]:
+        """
+        Score passages against a query.
+
+        Args:
+            query (str): The query text.
+            passages (List[str]): At most `max_batch_size` passages.
+
+        Returns:
+            List[float]: One score per passage, higher is more relevant.
+        """
+        pass
@@ -0,0 +1,44 @@
+import asyncio
+from typing import List, Optional
+from app.modules.rerankers.base import RerankScorerBase
+
+
+class CrossEncoderScorer(RerankScorerBase):
+    """
+    Local cross-encoder (e.g. a BGE or ms-marco reranker) scoring each batch of
+    (query, passage) pairs in one forward pass.
+    Requires the optional `sentence-transformers` package.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "BAAI/bge-reranker-v2-m3",
+        max_batch_size: int = 32,
+        device: Optional[str] = None,
+    ):
+        """
+        Load the model.
+
+        Args:
+            model_name (str): Hugging Face model id or local path.
+            max_batch_size (int): Pairs per forward pass.
+            device (Optional[str]): Torch device; chosen automatically if omitted.
+        """
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError as e:
+            raise ImportError(
+                "CrossEncoderScorer requires sentence-transformers: "
+                "pip install sentence-transformers"
+            ) from e
+        self.model = CrossEncoder(model_name, device=device)
+        self.max_batch_size = max_batch_size
+
+    async def ascore(self, query: str, passages: List[str]) -> List[float]:
+        # Inference is CPU/GPU bound; keep the event loop free.
+        scores = await asyncio.to_thread(
+            self.model.predict,
+            [(query, passage) for passage in passages],
+            batch_size=self.max_batch_size,
+        )
+        return [float(score) for score in scores]
@@ -0,0 +1,49 @@
+import math
+from collections import Counter
+from typing import List
+from app.modules.rerankers.base import RerankScorerBase
+from app.modules.retrievals.tokenizer import tokenize
+
+
+class LexicalScorer(RerankScorerBase):
+    """
+    BM25 over the candidate passages themselves (document frequencies are
+    counted within the batch). Costs microseconds per passage, so it is used
+    to pre-filter candidates before an expensive scorer.
+    """
+
+    max_batch_size = 10000
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+    async def ascore(self, query: str, passages: List[str]) -> List[float]:
+        return self.score(query, passages)
+
+    def score(self, query: str, passages: List[str]) -> List[float]:
+        terms = set(tokenize(query))
+        if not terms or not passages:
+            return [0.0] * len(passages)
+        counts = []
+        lengths = []
+        for passage in passages:
+            tokens = tokenize(passage)
+            lengths.append(len(tokens))
+            counts.append(Counter(token for token in tokens if token in terms))
+        average_length = max(sum(lengths) / len(passages), 1.0)
+        df = Counter(term for count in counts for term in count)
+        idf = {
+            term: math.log(1 + (len(passages) - n + 0.5) / (n + 0.5))
+            for term, n in df.items()
+        }
+        scores = []
+        for count, length in zip(counts, lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / average_length)
+            scores.append(
+                sum(
+                    idf[term] * tf * (self.k1 + 1) / (tf + norm)
+                    for term, tf in count.items()
+                )
+            )
+        return scores
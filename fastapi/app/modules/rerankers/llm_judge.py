@@ -0,0 +1,74 @@
+import json
+import re
+from typing import List
+from app.modules.llm_models.base import BaseLLMModel
+from app.modules.rerankers.base import RerankScorerBase
+import logging
+
+logger = logging.getLogger(__name__)
+
+JUDGE_PROMPT = """다음 질문에 대해 각 문단이 얼마나 관련 있는지 0점(무관)부터 10점(질문에 직접 답함)까지 평가하세요.
+Rate how relevant each passage is to the question, from 0 (unrelated) to 10 (directly answers it).
+
+질문 / Question: {query}
+
+{passages}
+
+Answer with only a JSON array of {count} numbers, one per passage in order, e.g. [7, 0, 3]."""
+
+_ARRAY_PATTERN = re.compile(r"\[[^\[\]]*\]")
+
+
+class LLMJudgeScorer(RerankScorerBase):
+    """
+    Listwise LLM-as-judge scorer: one prompt rates a whole batch of passages,
+    so reranking n candidates costs n / max_batch_size LLM calls.
+    """
+
+    def __init__(self, llm: BaseLLMModel, max_batch_size: int = 8, **llm_kwargs):
+        """
+        Initialize the scorer.
+
+        Args:
+            llm (BaseLLMModel): The judge model.
+            max_batch_size (int): Passages per prompt.
+            llm_kwargs: Generation parameters, e.g. temperature=0.
+        """
+        self.llm = llm
+        self.max_batch_size = max_batch_size
+        self.llm_kwargs = llm_kwargs
+
+    def build_prompt(self, query: str, passages: List[str]) -> str:
+        numbered = "\n\n".join(
+            f"[{i + 1}] {passage}" for i, passage in enumerate(passages)
+        )
+        return JUDGE_PROMPT.format(query=query, passages=numbered, count=len(passages))
+
+    async def ascore(self, query: str, passages: List[str]) -> List[float]:
+        response = await self.llm.agenerate(
+            self.build_prompt(query, passages), **self.llm_kwargs
+        )
+        return self.parse_scores(response, len(passages))
+
+    @staticmethod
+    def parse_scores(response: str, count: int) -> List[float]:
+        """
+        Read the JSON array of scores from a judge response. Missing or
+        malformed scores count as 0, so one bad answer never fails a query.
+        """
+        for match in _ARRAY_PATTERN.finditer(response):
+            try:
+                values = json.loads(match.group())
+            except ValueError:
+                continue
+            scores = []
+            for value in values[:count]:
+                try:
+                    scores.append(float(value))
+                except (TypeError, ValueError):
+                    scores.append(0.0)
+            if len(scores) < count:
+                logger.warning(f"LLM judge returned {len(scores)}/{count} scores")
+            return scores + [0.0] * (count - len(scores))
+        logger.warning("LLM judge response has no score array")
+        return [0.0] * count
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Union
+import tiktoken
+from app.modules.prompts.tokens import load_encoding
+from app.modules.rerankers.base import RerankScorerBase
+from app.modules.rerankers.lexical import LexicalScorer
+from app.modules.vectorstores.base import SearchResult
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RerankStats:
+    queries: int = 0
+    candidates: int = 0
+    prefiltered_out: int = 0
+    scored: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    early_stops: int = 0
+    seconds: float = 0.0
+
+
+class Reranker:
+    """
+    Second-stage ranking between retrieval and answer generation, with a bounded
+    cost per query.
+
+    1. An optional lexical pre-filter ranks candidates by BM25 fused with their
+       retrieval rank and keeps the best `prefilter_k`.
+    2. Passages are truncated to `max_passage_tokens`.
+    3. The scorer rates candidates in batches of `scorer.max_batch_size`, best
+       first, `max_concurrency` batches per wave. Once `patience` consecutive
+       waves leave the top-k unchanged, the remaining candidates are skipped.
+
+    At most `ceil(prefilter_k / max_batch_size)` scorer calls are made per query.
+    A batch whose scorer call fails is logged and counted, and its candidates
+    follow the scored ones in pre-filter order, so one failure does not fail
+    the query.
+    """
+
+    def __init__(
+        self,
+        scorer: RerankScorerBase,
+        prefilter: Optional[LexicalScorer] = None,
+        prefilter_k: int = 32,
+        max_passage_tokens: int = 256,
+        encoding: Union[str, tiktoken.Encoding] = "cl100k_base",
+        max_concurrency: int = 2,
+        patience: int = 1,
+        text_key: str = "text",
+        rrf_k: int = 60,
+    ):
+        """
+        Initialize the reranker.
+
+        Args:
+            scorer (RerankScorerBase): The expensive scorer, e.g. `LLMJudgeScorer`.
+            prefilter (Optional[LexicalScorer]): Cheap scorer applied to all
+                candidates. Without it, candidates keep their retrieval order.
+            prefilter_k (int): Maximum candidates passed to `scorer`.
+            max_passage_tokens (int): Token budget of each passage.
+            encoding (Union[str, tiktoken.Encoding]): Tokenizer of the budget,
+                loaded on first use.
+            max_concurrency (int): Scorer batches run concurrently per wave.
+            patience (int): Waves without a top-k change before stopping early;
+                0 disables early stopping.
+            text_key (str): Metadata key holding the candidate text.
+            rrf_k (int): Rank constant fusing retrieval and lexical ranks.
+        """
+        self.scorer = scorer
+        self.prefilter = prefilter
+        self.prefilter_k = prefilter_k
+        self.max_passage_tokens = max_passage_tokens
+        self._encoding = encoding
+        self.max_concurrency = max_concurrency
+        self.patience = patience
+        self.text_key = text_key
+        self.rrf_k = rrf_k
+        self.stats = RerankStats()
+
+    @property
+    def encoding(self) -> tiktoken.Encoding:
+        if isinstance(self._encoding, str):
+            self._encoding = load_encoding(self._encoding)
+        return self._encoding
+
+    def truncate(self, text: str) -> str:
+        """
+        Cut text to at most `max_passage_tokens` tokens. Only a prefix is
+        tokenized, so the cost does not grow with the passage length.
+        """
+        # Tokens average well under 8 characters, so this prefix almost always
+        # holds the whole budget.
+        prefix = text[: self.max_passage_tokens * 8]
+        tokens = self.encoding.encode_ordinary(prefix)
+        if len(tokens) <= self.max_passage_tokens and len(prefix) == len(text):
+            return text
+        return self.encoding.decode(tokens[: self.max_passage_tokens], errors="ignore")
+
+    def _prefilter(
+        self, query: str, candidates: List[SearchResult], texts: List[str]
+    ) -> List[int]:
+        """
+        Candidate positions in scoring order.
+        """
+        order = list(range(len(candidates)))
+        if self.prefilter is not None and len(candidates) > 1:
+            lexical = self.prefilter.score(query, texts)
+            by_lexical = sorted(order, key=lambda i: -lexical[i])
+            fused = [0.0] * len(candidates)
+            for rank, i in enumerate(order):
+                fused[i] += 1.0 / (self.rrf_k + rank + 1)
+            for rank, i in enumerate(by_lexical):
+                fused[i] += 1.0 / (self.rrf_k + rank + 1)
+            order.sort(key=lambda i: -fused[i])
+        return order[: self.prefilter_k]
+
+    async def arerank(
+        self, query: str, candidates: List[SearchResult], k: int = 4
+    ) -> List[SearchResult]:
+        """
+        Rerank retrieved candidates.
+
+        Args:
+            query (str): The query text.
+            candidates (List[SearchResult]): Retrieval results, best first, with
+                their text in `metadata[text_key]`.
+            k (int): Number of results to return.
+
+        Returns:
+            List[SearchResult]: The top-k by scorer score, with the retrieval
+                score kept in metadata["retrieval_score"]. Candidates of failed
+                batches come last, with a score of 0.
+        """
+        start = time.perf_counter()
+        self.stats.queries += 1
+        self.stats.candidates += len(candidates)
+        texts = [
+            self.truncate(candidate.metadata.get(self.text_key) or "")
+            for candidate in candidates
+        ]
+        order = self._prefilter(query, candidates, texts)
+        self.stats.prefiltered_out += len(candidates) - len(order)
+
+        batch_size = max(1, self.scorer.max_batch_size)
+        batches = [order[i : i + batch_size] for i in range(0, len(order), batch_size)]
+        scores: Dict[int, float] = {}
+        failed: List[int] = []
+        top: List[int] = []
+        stable_waves = 0
+        for wave_start in range(0, len(batches), self.max_concurrency):
+            wave = batches[wave_start : wave_start + self.max_concurrency]
+            results = await asyncio.gather(
+                *(
+                    self.scorer.ascore(query, [texts[i] for i in batch])
+                    for batch in wave
+                ),
+                return_exceptions=True,
+            )
+            scored = 0
+            for batch, batch_scores in zip(wave, results):
+                if isinstance(batch_scores, BaseException):
+                    self.stats.failed_batches += 1
+                    logger.warning(
+                        f"Rerank scorer failed on {len(batch)} candidates: {batch_scores!r}"
+                    )
+                    failed.extend(batch)
+                    continue
+                scores.update(zip(batch, batch_scores))
+                scored += len(batch)
+            self.stats.batches += len(wave)
+            self.stats.scored += scored
+
+            previous = top
+            top = sorted(scores, key=lambda i: -scores[i])[:k]
+            if scored:
+                stable_waves = stable_waves + 1 if set(top) == set(previous) else 0
+            more = wave_start + self.max_concurrency < len(batches)
+            if self.patience and stable_waves >= self.patience and more:
+                self.stats.early_stops += 1
+                break
+
+        self.stats.seconds += time.perf_counter() - start
+        # 점수를 받지 못한 배치는 사전 필터 순서대로 뒤에 붙인다
+        top += failed[: k - len(top)]
+        return [
+            SearchResult(
+                id=candidates[i].id,
+                score=scores.get(i, 0.0),
+                metadata=dict(
+                    candidates[i].metadata, retrieval_score=candidates[i].score
+                ),
+            )
+            for i in top
+        ]
+
+    def get_stats(self) -> Dict[str, float]:
+        return asdict(self.stats)
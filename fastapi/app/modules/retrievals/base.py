@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+import asyncio
+from app.modules.vectorstores.base import MetadataFilter, SearchResult
+
+
+class RetrieverBase(ABC):
+    """
+    Abstract base class for all retrievers.
+    A retriever maps a text query to the ids, scores and metadata of the most
+    relevant documents.
+    """
+
+    @abstractmethod
+    async def aretrieve(
+        self, query: str, k: int = 4, filter: Optional[MetadataFilter] = None
+    ) -> List[SearchResult]:
+        """
+        Retrieve the top-k documents for a query.
+
+        Args:
+            query (str): The query text.
+            k (int): Number of documents to return.
+            filter (Optional[MetadataFilter]): Metadata equality constraints or a
+                predicate; only matching documents are returned.
+
+        Returns:
+            List[SearchResult]: Results, best first.
+        """
+        pass
+
+    def retrieve(
+        self, query: str, k: int = 4, filter: Optional[MetadataFilter] = None
+    ) -> List[SearchResult]:
+        """
+        Synchronous wrapper around `aretrieve` for code running outside an event loop.
+        """
+        return asyncio.run(self.aretrieve(query, k=k, filter=filter))
@@ -0,0 +1,291 @@
+import math
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from app.modules.retrievals.tokenizer import tokenize
+from app.modules.vectorstores.base import (
+    MetadataFilter,
+    SearchResult,
+    matches_filter,
+    top_k,
+)
+
+
+class _PostingList:
+    """
+    Postings of one term as two parallel arrays: document slots (uint32) and term
+    frequencies (uint16). Postings added by `add` batches are buffered as array
+    chunks and concatenated on the next read, so indexing never copies the
+    existing arrays.
+    """
+
+    __slots__ = ("docs", "tfs", "pending", "df")
+
+    def __init__(self):
+        self.docs = np.empty(0, dtype=np.uint32)
+        self.tfs = np.empty(0, dtype=np.uint16)
+        self.pending: List[Tuple[np.ndarray, np.ndarray]] = []
+        self.df = 0
+
+    def extend(self, docs: np.ndarray, tfs: np.ndarray):
+        self.pending.append((docs, tfs))
+        self.df += docs.size
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self.pending:
+            self.docs = np.concatenate([self.docs, *(docs for docs, _ in self.pending)])
+            self.tfs = np.concatenate([self.tfs, *(tfs for _, tfs in self.pending)])
+            self.pending = []
+        return self.docs, self.tfs
+
+    def nbytes(self) -> int:
+        self.arrays()
+        return self.docs.nbytes + self.tfs.nbytes
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an in-memory inverted index.
+
+    Documents are stored in integer slots. Deleting a document only marks its slot
+    dead and updates the statistics, so add and delete never rebuild the index;
+    dead postings are dropped by `compact()`, which runs automatically once
+    `compact_ratio` of the slots are dead.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.5,
+        b: float = 0.75,
+        tokenizer: Callable[[str], List[str]] = tokenize,
+        compact_ratio: float = 0.25,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            k1 (float): Term frequency saturation.
+            b (float): Document length normalization.
+            tokenizer (Callable[[str], List[str]]): Text to tokens. The default
+                handles Korean particles and compound nouns.
+            compact_ratio (float): Fraction of dead slots that triggers compaction.
+        """
+        self.k1 = k1
+        self.b = b
+        self.tokenizer = tokenizer
+        self.compact_ratio = compact_ratio
+        self._lock = threading.RLock()
+        self._vocab: Dict[str, int] = {}
+        self._postings: List[_PostingList] = []
+        self._slots: Dict[str, int] = {}
+        self._slot_ids: List[Optional[str]] = []
+        self._metadatas: List[Optional[Dict[str, Any]]] = []
+        self._doc_terms: List[Optional[np.ndarray]] = []
+        self._lengths = np.empty(1024, dtype=np.float32)
+        self._alive = np.zeros(1024, dtype=bool)
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._slots
+
+    def nbytes(self) -> int:
+        """
+        Memory used by the postings arrays.
+        """
+        return sum(postings.nbytes() for postings in self._postings)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Index or replace documents.
+
+        Args:
+            ids (Sequence[str]): Unique ids of the documents.
+            texts (Sequence[str]): Document texts.
+            metadatas (Optional[Sequence[Dict[str, Any]]]): Metadata for each document.
+        """
+        if len(ids) != len(texts):
+            raise ValueError("ids and texts must have the same length.")
+        if metadatas is not None and len(metadatas) != len(ids):
+            raise ValueError("ids and metadatas must have the same length.")
+        last = {id: i for i, id in enumerate(ids)}
+        if len(last) < len(ids):
+            # Repeated ids within one batch: the last occurrence wins.
+            rows = sorted(last.values())
+            ids, texts = [ids[i] for i in rows], [texts[i] for i in rows]
+            metadatas = [metadatas[i] for i in rows] if metadatas is not None else None
+        if not ids:
+            return
+        # Tokenize outside the lock; it is the expensive part.
+        counts = [Counter(self.tokenizer(text)) for text in texts]
+        with self._lock:
+            self.delete([id for id in ids if id in self._slots])
+            first_slot = len(self._slot_ids)
+            self._reserve(first_slot + len(ids))
+            term_ids, tfs = [], []
+            for i, id in enumerate(ids):
+                slot = first_slot + i
+                # New terms get the next id; their posting lists are created below.
+                term_ids.extend(
+                    self._vocab.setdefault(term, len(self._vocab)) for term in counts[i]
+                )
+                tfs.extend(counts[i].values())
+                length = float(sum(counts[i].values()))
+                self._slots[id] = slot
+                self._slot_ids.append(id)
+                self._metadatas.append(
+                    dict(metadatas[i]) if metadatas is not None else {}
+                )
+                self._lengths[slot] = length
+                self._alive[slot] = True
+                self._total_length += length
+
+            self._postings.extend(
+                _PostingList() for _ in range(len(self._vocab) - len(self._postings))
+            )
+            # Group the batch's postings by term: one array chunk per term.
+            term_ids = np.array(term_ids, dtype=np.uint32)
+            n_terms = np.array([len(count) for count in counts], dtype=np.int64)
+            docs = np.repeat(
+                np.arange(first_slot, first_slot + len(ids), dtype=np.uint32), n_terms
+            )
+            tfs = np.minimum(np.array(tfs, dtype=np.int64), 65535).astype(np.uint16)
+            self._doc_terms.extend(np.split(term_ids, np.cumsum(n_terms)[:-1]))
+            order = np.argsort(term_ids, kind="stable")
+            unique_terms, starts = np.unique(term_ids[order], return_index=True)
+            ends = np.append(starts[1:], order.size)
+            for term_id, start, end in zip(unique_terms, starts, ends):
+                rows = order[start:end]
+                self._postings[term_id].extend(docs[rows], tfs[rows])
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """
+        Delete documents by id. Unknown ids are ignored.
+
+        Returns:
+            int: The number of deleted documents.
+        """
+        deleted = 0
+        with self._lock:
+            for id in ids:
+                slot = self._slots.pop(id, None)
+                if slot is None:
+                    continue
+                for term_id in self._doc_terms[slot]:
+                    self._postings[term_id].df -= 1
+                self._alive[slot] = False
+                self._total_length -= float(self._lengths[slot])
+                self._slot_ids[slot] = None
+                self._metadatas[slot] = None
+                self._doc_terms[slot] = None
+                deleted += 1
+            dead = len(self._slot_ids) - len(self._slots)
+            if dead and dead >= self.compact_ratio * len(self._slot_ids):
+                self.compact()
+        return deleted
+
+    def compact(self) -> None:
+        """
+        Drop postings of deleted documents and renumber the live slots.
+        """
+        with self._lock:
+            n_slots = len(self._slot_ids)
+            alive = self._alive[:n_slots]
+            remap = (np.cumsum(alive) - 1).astype(np.uint32)
+            for postings in self._postings:
+                docs, tfs = postings.arrays()
+                keep = alive[docs]
+                postings.docs, postings.tfs = remap[docs[keep]], tfs[keep]
+            live = np.nonzero(alive)[0]
+            self._slot_ids = [self._slot_ids[slot] for slot in live]
+            self._metadatas = [self._metadatas[slot] for slot in live]
+            self._doc_terms = [self._doc_terms[slot] for slot in live]
+            self._slots = {id: slot for slot, id in enumerate(self._slot_ids)}
+            self._lengths[: live.size] = self._lengths[live]
+            self._alive[: live.size] = True
+            self._alive[live.size :] = False
+
+    def search(
+        self, query: str, k: int = 4, filter: Optional[MetadataFilter] = None
+    ) -> List[SearchResult]:
+        """
+        Find the top-k documents for a query by BM25 score.
+
+        Args:
+            query (str): The query text.
+            k (int): Number of results.
+            filter (Optional[MetadataFilter]): Metadata equality constraints or a
+                predicate; only matching documents are considered.
+
+        Returns:
+            List[SearchResult]: Results, best first. Documents sharing no term with
+                the query are never returned.
+        """
+        query_counts = Counter(self.tokenizer(query))
+        with self._lock:
+            n_docs = len(self._slots)
+            if n_docs == 0:
+                return []
+            avg_length = self._total_length / n_docs
+            doc_parts, score_parts = [], []
+            for term, query_tf in query_counts.items():
+                term_id = self._vocab.get(term)
+                if term_id is None or self._postings[term_id].df <= 0:
+                    continue
+                postings = self._postings[term_id]
+                docs, tfs = postings.arrays()
+                idf = math.log(1 + (n_docs - postings.df + 0.5) / (postings.df + 0.5))
+                tfs = tfs.astype(np.float32)
+                norms = self.k1 * (
+                    1 - self.b + self.b * self._lengths[docs] / avg_length
+                )
+                doc_parts.append(docs)
+                score_parts.append(
+                    (query_tf * idf * (self.k1 + 1)) * tfs / (tfs + norms)
+                )
+            if not doc_parts:
+                return []
+
+            # Sum the per-term contributions of every candidate document.
+            candidates, inverse = np.unique(
+                np.concatenate(doc_parts), return_inverse=True
+            )
+            scores = np.bincount(inverse, weights=np.concatenate(score_parts))
+            keep = self._alive[candidates]
+            if filter is not None:
+                keep &= np.fromiter(
+                    (
+                        self._alive[slot]
+                        and matches_filter(self._metadatas[slot], filter)
+                        for slot in candidates
+                    ),
+                    dtype=bool,
+                    count=candidates.size,
+                )
+            candidates, scores = candidates[keep], scores[keep]
+            return [
+                SearchResult(
+                    id=self._slot_ids[candidates[i]],
+                    score=float(scores[i]),
+                    metadata=self._metadatas[candidates[i]],
+                )
+                for i in top_k(scores[None, :], k)[0]
+            ]
+
+    def _reserve(self, capacity: int):
+        if capacity <= self._lengths.shape[0]:
+            return
+        new_capacity = max(capacity, 2 * self._lengths.shape[0])
+        lengths = np.empty(new_capacity, dtype=np.float32)
+        lengths[: self._lengths.shape[0]] = self._lengths
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[: self._alive.shape[0]] = self._alive
+        self._lengths, self._alive = lengths, alive
@@ -0,0 +1,222 @@
+import asyncio
+import enum
+import threading
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+import numpy as np
+from app.modules.retrievals.base import RetrieverBase
+from app.modules.retrievals.bm25 import BM25Index
+from app.modules.vectorstores.base import MetadataFilter, SearchResult, VectorStoreBase
+import logging
+
+logger = logging.getLogger(__name__)
+
+EmbedFunction = Callable[[str], Awaitable[Sequence[float]]]
+
+
+class FusionMethod(str, enum.Enum):
+    RRF = "rrf"
+    WEIGHTED = "weighted"
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[Sequence[SearchResult]],
+    weights: Optional[Sequence[float]] = None,
+    rrf_k: int = 60,
+) -> List[SearchResult]:
+    """
+    Fuse ranked lists by weighted reciprocal rank: sum of w / (rrf_k + rank).
+    Only ranks are used, so the legs' score scales do not need to agree.
+    """
+    weights = weights or [1.0] * len(result_lists)
+    fused: Dict[str, float] = {}
+    metadatas: Dict[str, Dict[str, Any]] = {}
+    for weight, results in zip(weights, result_lists):
+        for rank, result in enumerate(results, start=1):
+            fused[result.id] = fused.get(result.id, 0.0) + weight / (rrf_k + rank)
+            metadatas.setdefault(result.id, result.metadata)
+    return sorted(
+        (
+            SearchResult(id=id, score=value, metadata=metadatas[id])
+            for id, value in fused.items()
+        ),
+        key=lambda result: result.score,
+        reverse=True,
+    )
+
+
+def weighted_score_fusion(
+    result_lists: Sequence[Sequence[SearchResult]],
+    weights: Optional[Sequence[float]] = None,
+) -> List[SearchResult]:
+    """
+    Fuse lists by the weighted sum of min-max normalized scores. A document missing
+    from a list contributes 0 for that list.
+    """
+    weights = weights or [1.0] * len(result_lists)
+    fused: Dict[str, float] = {}
+    metadatas: Dict[str, Dict[str, Any]] = {}
+    for weight, results in zip(weights, result_lists):
+        if not results:
+            continue
+        scores = np.array([result.score for result in results], dtype=np.float64)
+        low, span = scores.min(), scores.max() - scores.min()
+        normalized = (scores - low) / span if span > 0 else np.ones_like(scores)
+        for result, value in zip(results, normalized):
+            fused[result.id] = fused.get(result.id, 0.0) + weight * float(value)
+            metadatas.setdefault(result.id, result.metadata)
+    return sorted(
+        (
+            SearchResult(id=id, score=value, metadata=metadatas[id])
+            for id, value in fused.items()
+        ),
+        key=lambda result: result.score,
+        reverse=True,
+    )
+
+
+class HybridRetriever(RetrieverBase):
+    """
+    Retriever fusing a sparse BM25 leg and a dense vector store leg.
+
+    Both legs run concurrently: BM25 scoring runs in a worker thread while the
+    query embedding is awaited, and the vector search follows in another thread.
+    The whole retrieval is bounded by `latency_budget`; a leg that has not
+    finished by then is dropped and the result is fused from the legs that did.
+    """
+
+    def __init__(
+        self,
+        dense: VectorStoreBase,
+        embed: EmbedFunction,
+        sparse: Optional[BM25Index] = None,
+        fusion: Union[FusionMethod, str] = FusionMethod.RRF,
+        weights: Sequence[float] = (1.0, 1.0),
+        rrf_k: int = 60,
+        candidate_factor: int = 4,
+        latency_budget: Optional[float] = 0.5,
+    ):
+        """
+        Initialize the retriever.
+
+        Args:
+            dense (VectorStoreBase): Vector store holding the document embeddings.
+            embed (EmbedFunction): Async function embedding the query text.
+            sparse (Optional[BM25Index]): BM25 index over the same ids. A new
+                empty index is created if omitted.
+            fusion (FusionMethod | str): "rrf" or "weighted".
+            weights (Sequence[float]): Weights of the (sparse, dense) legs.
+            rrf_k (int): Rank offset of reciprocal rank fusion.
+            candidate_factor (int): Each leg returns `k * candidate_factor` candidates.
+            latency_budget (Optional[float]): Seconds allowed per retrieval;
+                None waits for both legs.
+        """
+        self.dense = dense
+        self.embed = embed
+        self.sparse = sparse if sparse is not None else BM25Index()
+        self.fusion = FusionMethod(fusion)
+        self.weights = tuple(weights)
+        self.rrf_k = rrf_k
+        self.candidate_factor = candidate_factor
+        self.latency_budget = latency_budget
+        # Vector stores are not thread-safe; searches run in worker threads.
+        self._dense_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.sparse)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Index or replace documents in both legs.
+
+        Args:
+            ids (Sequence[str]): Unique ids of the documents.
+            texts (Sequence[str]): Document texts for BM25.
+            embeddings (np.ndarray | Sequence[Sequence[float]]): Document embeddings.
+            metadatas (Optional[Sequence[Dict[str, Any]]]): Metadata for each document.
+        """
+        self.sparse.add(ids, texts, metadatas)
+        with self._dense_lock:
+            self.dense.add(ids, embeddings, metadatas)
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """
+        Delete documents from both legs.
+
+        Returns:
+            int: The number of deleted documents.
+        """
+        with self._dense_lock:
+            self.dense.delete(ids)
+        return self.sparse.delete(ids)
+
+    async def aretrieve(
+        self, query: str, k: int = 4, filter: Optional[MetadataFilter] = None
+    ) -> List[SearchResult]:
+        n_candidates = k * self.candidate_factor
+        start = time.perf_counter()
+        legs = {
+            asyncio.create_task(
+                asyncio.to_thread(self.sparse.search, query, n_candidates, filter)
+            ): "sparse",
+            asyncio.create_task(
+                self._dense_search(query, n_candidates, filter)
+            ): "dense",
+        }
+        done, pending = await asyncio.wait(legs, timeout=self.latency_budget)
+        for task in pending:
+            task.cancel()
+            logger.warning(
+                f"Hybrid retrieval: {legs[task]} leg exceeded the "
+                f"{self.latency_budget}s budget and was dropped"
+            )
+
+        results: Dict[str, List[SearchResult]] = {}
+        errors = []
+        for task in done:
+            if task.exception() is not None:
+                logger.warning(
+                    f"Hybrid retrieval: {legs[task]} leg failed: {task.exception()}"
+                )
+                errors.append(task.exception())
+            else:
+                results[legs[task]] = task.result()
+        if not results and errors:
+            raise errors[0]
+        logger.debug(
+            f"Hybrid retrieval took {(time.perf_counter() - start) * 1000:.1f}ms "
+            f"({', '.join(results) or 'no legs'})"
+        )
+
+        result_lists = [results.get("sparse", []), results.get("dense", [])]
+        if self.fusion == FusionMethod.RRF:
+            fused = reciprocal_rank_fusion(result_lists, self.weights, self.rrf_k)
+        else:
+            fused = weighted_score_fusion(result_lists, self.weights)
+        return fused[:k]
+
+    async def _dense_search(
+        self, query: str, k: int, filter: Optional[MetadataFilter]
+    ) -> List[SearchResult]:
+        embedding = np.asarray(await self.embed(query), dtype=np.float32)
+
+        def search() -> List[SearchResult]:
+            with self._dense_lock:
+                return self.dense.search(embedding, k=k, filter=filter)
+
+        return await asyncio.to_thread(search)
@@ -0,0 +1,95 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List, Tuple
+
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[^\W_가-힣]+", re.UNICODE)
+_HANGUL_PATTERN = re.compile(r"[가-힣]")
+
+# 체언 뒤에 붙는 조사/어미. 긴 것부터 매칭해야 "에서는"이 "는"보다 먼저 잘린다.
+JOSA = sorted(
+    (
+        "이 가 은 는 을 를 의 에 와 과 도 만 로 으로 에서 에게 한테 께서 부터 까지 보다 "
+        "처럼 이나 나 라도 이라도 마저 조차 에는 에서는 으로는 로는 에도 와는 과는 이다 "
+        "입니다 이며 이고 하고 랑 이랑 들 들은 들이 들을 들의 인가요 인가 란 이란 요 "
+        "해요 하는 한 했다 합니다 하다 된 되는 됩니다"
+    ).split(),
+    key=len,
+    reverse=True,
+)
+_JOSA_SET = frozenset(JOSA)
+
+# 조사와 같은 음절로 끝나는 흔한 명사. 자르는 위치가 이 명사 안이면 자르지 않는다 ("최단경로").
+NOUN_EXCEPTIONS = frozenset(
+    (
+        "평가 추가 증가 국가 작가 전문가 속도 정도 제도 의도 온도 강도 밀도 빈도 각도 "
+        "용도 한도 시도 지도 태도 경로 도로 회로 통로 진로 회의 정의 합의 논의 동의 "
+        "주의 문의 편의 필요 중요 수요 개요 차이 길이 높이 깊이 넓이 나이 아이 결과 "
+        "효과 성과 통과 초과 권한 제한 기한 하나"
+    ).split()
+)
+
+
+def strip_josa(word: str) -> str:
+    """
+    Remove the longest trailing particle/ending, keeping at least one syllable.
+
+    A one-syllable particle is removed only from words of three or more
+    syllables, and no particle is cut out of a noun in `NOUN_EXCEPTIONS`:
+    "평가" and "최단경로" are kept whole while "평가가" becomes "평가".
+    """
+    for suffix in JOSA:
+        if len(word) > len(suffix) and word.endswith(suffix):
+            cut = len(word) - len(suffix)
+            if (len(suffix) == 1 and len(word) < 3) or _cuts_noun(word, cut):
+                continue
+            return word[:cut]
+    return word
+
+
+def _cuts_noun(word: str, cut: int) -> bool:
+    for end in range(cut + 1, len(word) + 1):
+        for size in (2, 3):
+            if 0 <= end - size < cut and word[end - size : end] in NOUN_EXCEPTIONS:
+                return True
+    return False
+
+
+def tokenize(text: str, bigrams: bool = True) -> List[str]:
+    """
+    Lightweight tokenizer for mixed Korean/English text, without a morphological
+    analyzer dependency.
+
+    Latin words and numbers are lowercased as-is. Hangul words have their trailing
+    particle stripped ("검색에서는" -> "검색") and, when `bigrams` is set, also
+    emit syllable bigrams of the stem so that compound nouns match their parts
+    ("벡터데이터베이스" matches "데이터").
+
+    Args:
+        text (str): Input text.
+        bigrams (bool): Emit syllable bigrams for Hangul stems longer than two syllables.
+
+    Returns:
+        List[str]: Tokens in order of appearance.
+    """
+    text = unicodedata.normalize("NFC", text).lower()
+    if not _HANGUL_PATTERN.search(text):
+        return _TOKEN_PATTERN.findall(text)
+    tokens: List[str] = []
+    for word in _TOKEN_PATTERN.findall(text):
+        if not ("가" <= word[0] <= "힣"):
+            tokens.append(word)
+            continue
+        tokens.extend(_analyze_hangul(word, bigrams))
+    return tokens
+
+
+@lru_cache(maxsize=65536)
+def _analyze_hangul(word: str, bigrams: bool) -> Tuple[str, ...]:
+    if word in _JOSA_SET:
+        # A particle split off a Latin word, e.g. "RAG는".
+        return ()
+    stem = strip_josa(word)
+    if bigrams and len(stem) > 2:
+        return (stem, *(stem[i : i + 2] for i in range(len(stem) - 1)))
+    return (stem,)
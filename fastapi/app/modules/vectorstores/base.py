@@ -1,6 +1,214 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+import enum
+import numpy as np
 
-from app.services.web_search.tavily_search import TavilySearch
+MetadataFilter = Union[Dict[str, Any], Callable[[Dict[str, Any]], bool]]
 
 
-a = TavilySearch(query="test")
-a.search_web()
\ No newline at end of file
+class Metric(str, enum.Enum):
+    COSINE = "cosine"
+    DOT = "dot"
+    L2 = "l2"
+
+
+@dataclass
+class SearchResult:
+    """
+    A single search hit. `score` is always "higher is better": cosine similarity,
+    dot product, or the negative Euclidean distance for L2.
+    """
+
+    id: str
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class VectorSearchBase(ABC):
+    """
+    Abstract base class for searchable vector indexes, including read-only ones
+    such as `MmapVectorStore`.
+    """
+
+    dim: int
+    metric: Metric
+
+    @abstractmethod
+    def search_batch(
+        self,
+        queries: Union[np.ndarray, Sequence[Sequence[float]]],
+        k: int = 4,
+        filter: Optional[MetadataFilter] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Find the top-k embeddings for each query.
+
+        Args:
+            queries (np.ndarray | Sequence[Sequence[float]]): Shape (m, dim).
+            k (int): Number of results per query.
+            filter (Optional[MetadataFilter]): Metadata equality constraints or a
+                predicate; only matching embeddings are considered.
+
+        Returns:
+            List[List[SearchResult]]: Results per query, best first.
+        """
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def get_vectors(self, ids: Sequence[str]) -> np.ndarray:
+        """
+        Return the stored full-precision embeddings of the given ids, shape
+        (len(ids), dim). Implemented by stores that keep them, which can then
+        serve as the `rerank_store` of a `QuantizedVectorStore`.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not keep full-precision vectors."
+        )
+
+    def search(
+        self,
+        query: Union[np.ndarray, Sequence[float]],
+        k: int = 4,
+        filter: Optional[MetadataFilter] = None,
+    ) -> List[SearchResult]:
+        """
+        Find the top-k embeddings for a single query.
+
+        Args:
+            query (np.ndarray | Sequence[float]): Shape (dim,).
+            k (int): Number of results.
+            filter (Optional[MetadataFilter]): See `search_batch`.
+
+        Returns:
+            List[SearchResult]: Results, best first.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        return self.search_batch(query[None, :], k=k, filter=filter)[0]
+
+
+class VectorStoreBase(VectorSearchBase):
+    """
+    Abstract base class for all vector stores.
+    Defines a unified interface for adding, deleting and searching embeddings.
+    """
+
+    @abstractmethod
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Add or replace embeddings.
+
+        Args:
+            ids (Sequence[str]): Unique ids of the embeddings.
+            embeddings (np.ndarray | Sequence[Sequence[float]]): Shape (n, dim).
+            metadatas (Optional[Sequence[Dict[str, Any]]]): Metadata for each embedding.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, ids: Sequence[str]) -> int:
+        """
+        Delete embeddings by id. Unknown ids are ignored.
+
+        Args:
+            ids (Sequence[str]): Ids to delete.
+
+        Returns:
+            int: The number of deleted embeddings.
+        """
+        pass
+
+
+def as_matrix(
+    vectors: Union[np.ndarray, Sequence[Sequence[float]]], dim: int
+) -> np.ndarray:
+    """
+    Convert input vectors to a C-contiguous float32 matrix of shape (n, dim).
+    """
+    matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    if matrix.ndim != 2 or matrix.shape[1] != dim:
+        raise ValueError(
+            f"Expected vectors of dimension {dim}, got shape {matrix.shape}"
+        )
+    return matrix
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize the rows of a matrix. Zero rows are left unchanged.
+    """
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def matches_filter(metadata: Dict[str, Any], filter: MetadataFilter) -> bool:
+    if callable(filter):
+        return bool(filter(metadata))
+    return all(metadata.get(key) == value for key, value in filter.items())
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Column indices of the k highest scores of each row, best first.
+    Uses `argpartition` so only the selected columns are sorted.
+
+    Args:
+        scores (np.ndarray): Shape (m, n).
+        k (int): Number of indices per row.
+
+    Returns:
+        np.ndarray: Shape (m, min(k, n)).
+    """
+    n = scores.shape[1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(n), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def score(
+    queries: np.ndarray,
+    vectors: np.ndarray,
+    metric: Metric,
+    sq_norms: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Score queries against vectors, higher is better. For cosine, `vectors` must
+    already be L2-normalized.
+
+    Args:
+        queries (np.ndarray): Shape (m, dim).
+        vectors (np.ndarray): Shape (n, dim).
+        metric (Metric): The similarity metric.
+        sq_norms (Optional[np.ndarray]): Precomputed squared norms of `vectors`,
+            only used for L2.
+
+    Returns:
+        np.ndarray: Shape (m, n).
+    """
+    if metric == Metric.COSINE:
+        queries = normalize(queries)
+    products = queries @ vectors.T
+    if metric != Metric.L2:
+        return products
+    if sq_norms is None:
+        sq_norms = np.einsum("ij,ij->i", vectors, vectors)
+    query_sq_norms = np.einsum("ij,ij->i", queries, queries)[:, None]
+    distances = query_sq_norms - 2 * products + sq_norms[None, :]
+    return -np.sqrt(np.maximum(distances, 0, out=distances))
@@ -0,0 +1,179 @@
+"""
+Recall, latency and memory benchmark of the vector stores on synthetic data.
+
+    python -m app.modules.vectorstores.benchmark --n 200000 --dim 128
+
+"memory MB" is what each index keeps in RAM. "rerank MB" is the
+full-precision store that the quantized indexes re-rank from ("+rr" rows).
+It is held in memory here; in production it is an `MmapVectorStore` on disk
+that is read only for the candidates.
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from app.modules.vectorstores.base import SearchResult, VectorSearchBase
+from app.modules.vectorstores.in_memory import InMemoryVectorStore
+from app.modules.vectorstores.ivf import IVFVectorStore
+from app.modules.vectorstores.quantization import (
+    ProductQuantizer,
+    QuantizedVectorStore,
+    ScalarQuantizer,
+)
+
+
+def synthetic_embeddings(
+    n: int, dim: int, n_clusters: int = 100, spread: float = 0.6, seed: int = 0
+) -> np.ndarray:
+    """
+    Gaussian-mixture vectors, which resemble real embeddings better than
+    uniform noise (where every ANN method degrades to brute force).
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, n)
+    noise = rng.standard_normal((n, dim)).astype(np.float32) * spread
+    return centers[labels] + noise
+
+
+def recall_at_k(
+    results: Sequence[Sequence[SearchResult]],
+    ground_truth: Sequence[Sequence[SearchResult]],
+) -> float:
+    found = sum(
+        len({hit.id for hit in result} & {hit.id for hit in truth})
+        for result, truth in zip(results, ground_truth)
+    )
+    return found / max(sum(len(truth) for truth in ground_truth), 1)
+
+
+def time_search(
+    store: VectorSearchBase, queries: np.ndarray, k: int, batch_size: int, **kwargs
+):
+    results: List[List[SearchResult]] = []
+    start = time.perf_counter()
+    for i in range(0, len(queries), batch_size):
+        results.extend(store.search_batch(queries[i : i + batch_size], k, **kwargs))
+    elapsed = time.perf_counter() - start
+    return results, elapsed * 1000 / len(queries)
+
+
+def run(
+    n: int,
+    dim: int,
+    n_queries: int,
+    k: int,
+    n_lists: int,
+    n_probes: Sequence[int],
+    batch_size: int,
+    pq_subvectors: int = 32,
+    rerank_factors: Optional[Sequence[int]] = None,
+) -> List[Dict[str, float]]:
+    """
+    Benchmark rows. The quantized indexes are re-ranked with each of
+    `rerank_factors`, or with their quantizer's default factor.
+    """
+    data = synthetic_embeddings(n, dim)
+    queries = synthetic_embeddings(n_queries, dim, seed=1)
+    ids = [str(i) for i in range(n)]
+
+    exact = InMemoryVectorStore(dim, initial_capacity=n)
+    exact.add(ids, data)
+    ground_truth, exact_ms = time_search(exact, queries, k, batch_size)
+    rows = [
+        {
+            "index": "exact",
+            "param": 0,
+            "recall": 1.0,
+            "ms_per_query": exact_ms,
+            "memory_mb": exact.vectors.nbytes / 2**20,
+            "rerank_mb": 0.0,
+        }
+    ]
+
+    ivf = IVFVectorStore(dim, n_lists=n_lists, auto_train_size=0)
+    start = time.perf_counter()
+    ivf.add(ids, data)
+    ivf.train()
+    build_s = time.perf_counter() - start
+    print(f"IVF build ({n_lists} lists): {build_s:.2f}s")
+    for n_probe in n_probes:
+        results, ms = time_search(ivf, queries, k, batch_size, n_probe=n_probe)
+        rows.append(
+            {
+                "index": "ivf",
+                "param": n_probe,
+                "recall": recall_at_k(results, ground_truth),
+                "ms_per_query": ms,
+                "memory_mb": exact.vectors.nbytes / 2**20,
+                "rerank_mb": 0.0,
+            }
+        )
+
+    quantizers = {"sq8": ScalarQuantizer()}
+    if dim % pq_subvectors == 0:
+        quantizers[f"pq{pq_subvectors}"] = ProductQuantizer(pq_subvectors)
+    for name, quantizer in quantizers.items():
+        store = QuantizedVectorStore(dim, quantizer, rerank_store=exact)
+        store.train(data[: min(n, 50000)])
+        store.add(ids, data)
+        for factor in [0, *(rerank_factors or [quantizer.rerank_factor])]:
+            store.rerank_factor = max(factor, 1)
+            results, ms = time_search(store, queries, k, batch_size, rerank=factor > 0)
+            rows.append(
+                {
+                    "index": f"{name}+rr" if factor else name,
+                    "param": factor,
+                    "recall": recall_at_k(results, ground_truth),
+                    "ms_per_query": ms,
+                    "memory_mb": store.memory_bytes() / 2**20,
+                    "rerank_mb": exact.vectors.nbytes / 2**20 if factor else 0.0,
+                }
+            )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--n-lists", type=int, default=256)
+    parser.add_argument("--n-probes", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--pq-subvectors", type=int, default=32)
+    parser.add_argument(
+        "--rerank-factors",
+        type=int,
+        nargs="+",
+        help="Re-ranking depths to compare; each quantizer's default if omitted.",
+    )
+    args = parser.parse_args()
+
+    rows = run(
+        args.n,
+        args.dim,
+        args.queries,
+        args.k,
+        args.n_lists,
+        args.n_probes,
+        args.batch_size,
+        args.pq_subvectors,
+        args.rerank_factors,
+    )
+    print(
+        f"{'index':<10}{'param':>8}{'recall@' + str(args.k):>12}"
+        f"{'ms/query':>12}{'memory MB':>12}{'rerank MB':>12}"
+    )
+    for row in rows:
+        print(
+            f"{row['index']:<10}{row['param']:>8}{row['recall']:>12.3f}"
+            f"{row['ms_per_query']:>12.3f}{row['memory_mb']:>12.1f}"
+            f"{row['rerank_mb']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
+from app.modules.vectorstores.base import (
+    MetadataFilter,
+    Metric,
+    SearchResult,
+    VectorStoreBase,
+    as_matrix,
+    matches_filter,
+    normalize,
+    score,
+    top_k,
+)
+
+
+class InMemoryVectorStore(VectorStoreBase):
+    """
+    Exact (brute-force) vector store kept in process memory.
+
+    Embeddings live in one contiguous float32 matrix; ids and metadata are kept in
+    parallel lists aligned with its rows. Search is a matrix product followed by
+    `argpartition`, so a batch of queries costs a single BLAS call.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        metric: Union[Metric, str] = Metric.COSINE,
+        initial_capacity: int = 1024,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            dim (int): Dimension of the embeddings.
+            metric (Metric | str): "cosine", "dot" or "l2".
+            initial_capacity (int): Number of rows allocated up front. The matrix
+                doubles in size whenever it fills up.
+        """
+        self.dim = dim
+        self.metric = Metric(metric)
+        self._vectors = np.empty((max(initial_capacity, 1), dim), dtype=np.float32)
+        self._sq_norms = np.empty(max(initial_capacity, 1), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._rows
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """
+        View of the stored (normalized, for cosine) embeddings, shape (n, dim).
+        """
+        return self._vectors[: self._size]
+
+    @property
+    def ids(self) -> List[str]:
+        return self._ids
+
+    @property
+    def metadatas(self) -> List[Dict[str, Any]]:
+        return self._metadatas
+
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        matrix = as_matrix(embeddings, self.dim)
+        if len(ids) != matrix.shape[0]:
+            raise ValueError("ids and embeddings must have the same length.")
+        if metadatas is not None and len(metadatas) != len(ids):
+            raise ValueError("ids and metadatas must have the same length.")
+        if self.metric == Metric.COSINE:
+            matrix = normalize(matrix)
+
+        new_rows = sum(1 for id in set(ids) if id not in self._rows)
+        self._reserve(self._size + new_rows)
+        for i, id in enumerate(ids):
+            metadata = dict(metadatas[i]) if metadatas is not None else {}
+            row = self._rows.get(id)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self._rows[id] = row
+                self._ids.append(id)
+                self._metadatas.append(metadata)
+            else:
+                self._metadatas[row] = metadata
+            self._vectors[row] = matrix[i]
+            self._sq_norms[row] = matrix[i] @ matrix[i]
+
+    def delete(self, ids: Sequence[str]) -> int:
+        deleted = 0
+        for id in ids:
+            row = self._rows.pop(id, None)
+            if row is None:
+                continue
+            # Move the last row into the hole to keep the matrix contiguous.
+            last = self._size - 1
+            if row != last:
+                self._vectors[row] = self._vectors[last]
+                self._sq_norms[row] = self._sq_norms[last]
+                self._ids[row] = self._ids[last]
+                self._metadatas[row] = self._metadatas[last]
+                self._rows[self._ids[row]] = row
+            self._ids.pop()
+            self._metadatas.pop()
+            self._size -= 1
+            deleted += 1
+        return deleted
+
+    def get_vectors(self, ids: Sequence[str]) -> np.ndarray:
+        """
+        Return the stored embeddings of the given ids, shape (len(ids), dim).
+        """
+        return self._vectors[[self._rows[id] for id in ids]]
+
+    def search_batch(
+        self,
+        queries: Union[np.ndarray, Sequence[Sequence[float]]],
+        k: int = 4,
+        filter: Optional[MetadataFilter] = None,
+    ) -> List[List[SearchResult]]:
+        queries = as_matrix(queries, self.dim)
+        if self._size == 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        if filter is None:
+            rows = None
+            vectors, sq_norms = self.vectors, self._sq_norms[: self._size]
+        else:
+            rows = np.fromiter(
+                (
+                    row
+                    for row, metadata in enumerate(self._metadatas)
+                    if matches_filter(metadata, filter)
+                ),
+                dtype=np.int64,
+            )
+            if rows.size == 0:
+                return [[] for _ in range(queries.shape[0])]
+            vectors, sq_norms = self._vectors[rows], self._sq_norms[rows]
+
+        scores = self.score(queries, vectors, sq_norms)
+        indices = top_k(scores, k)
+        results = []
+        for query_index, candidates in enumerate(indices):
+            hits = []
+            for candidate in candidates:
+                row = int(candidate if rows is None else rows[candidate])
+                hits.append(
+                    SearchResult(
+                        id=self._ids[row],
+                        score=float(scores[query_index, candidate]),
+                        metadata=self._metadatas[row],
+                    )
+                )
+            results.append(hits)
+        return results
+
+    def score(
+        self,
+        queries: np.ndarray,
+        vectors: np.ndarray,
+        sq_norms: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Score queries (m, dim) against stored vectors (n, dim) with the store's metric.
+
+        Returns:
+            np.ndarray: Shape (m, n), higher is better.
+        """
+        return score(queries, vectors, self.metric, sq_norms)
+
+    def _reserve(self, capacity: int):
+        if capacity <= self._vectors.shape[0]:
+            return
+        new_capacity = max(capacity, 2 * self._vectors.shape[0])
+        vectors = np.empty((new_capacity, self.dim), dtype=np.float32)
+        vectors[: self._size] = self._vectors[: self._size]
+        sq_norms = np.empty(new_capacity, dtype=np.float32)
+        sq_norms[: self._size] = self._sq_norms[: self._size]
+        self._vectors, self._sq_norms = vectors, sq_norms
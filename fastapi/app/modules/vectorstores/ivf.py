@@ -0,0 +1,286 @@
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
+from app.modules.vectorstores.base import (
+    MetadataFilter,
+    Metric,
+    SearchResult,
+    VectorStoreBase,
+    as_matrix,
+    normalize,
+    top_k,
+)
+from app.modules.vectorstores.in_memory import InMemoryVectorStore
+
+
+def kmeans(
+    data: np.ndarray,
+    n_clusters: int,
+    n_iter: int = 20,
+    spherical: bool = False,
+    seed: int = 0,
+    chunk_size: int = 65536,
+) -> np.ndarray:
+    """
+    Lloyd's k-means in NumPy.
+
+    Args:
+        data (np.ndarray): Training vectors, shape (n, dim).
+        n_clusters (int): Number of centroids.
+        n_iter (int): Number of iterations.
+        spherical (bool): Keep centroids L2-normalized and assign by dot product.
+        seed (int): Random seed for initialization and empty-cluster reseeding.
+        chunk_size (int): Rows assigned per step, bounding the (rows, k) score matrix.
+
+    Returns:
+        np.ndarray: Centroids, shape (n_clusters, dim).
+    """
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, data.shape[0])
+    centroids = data[rng.choice(data.shape[0], n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assignments = assign(data, centroids, spherical, chunk_size)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        empty = counts == 0
+        # Sum each cluster's rows with one reduceat over the rows sorted by cluster.
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.zeros_like(centroids)
+        sums[~empty] = np.add.reduceat(
+            data[np.argsort(assignments, kind="stable")], starts[~empty]
+        )
+        counts[empty] = 1
+        centroids = sums / counts[:, None]
+        if empty.any():
+            centroids[empty] = data[rng.choice(data.shape[0], int(empty.sum()))]
+        if spherical:
+            centroids = normalize(centroids)
+    return centroids.astype(np.float32)
+
+
+def assign(
+    data: np.ndarray,
+    centroids: np.ndarray,
+    spherical: bool = False,
+    chunk_size: int = 65536,
+) -> np.ndarray:
+    """
+    Index of the closest centroid for every row of `data`.
+    """
+    sq_norms = np.einsum("ij,ij->i", centroids, centroids)
+    assignments = np.empty(data.shape[0], dtype=np.int64)
+    for start in range(0, data.shape[0], chunk_size):
+        scores = data[start : start + chunk_size] @ centroids.T
+        if not spherical:
+            # argmin ||x - c||^2 == argmax (2 x.c - ||c||^2)
+            scores = 2 * scores - sq_norms
+        assignments[start : start + chunk_size] = scores.argmax(axis=1)
+    return assignments
+
+
+class IVFVectorStore(VectorStoreBase):
+    """
+    Approximate vector store using an inverted file (IVF) index.
+
+    Embeddings are partitioned by a k-means coarse quantizer into `n_lists`
+    inverted lists; a query only scans the `n_probe` lists whose centroids are
+    closest to it. Raising `n_probe` trades latency for recall.
+
+    Until the quantizer is trained, embeddings are kept in a single list and
+    searched exactly. Training happens on `train()` or automatically once
+    `auto_train_size` embeddings have been added; later inserts are assigned
+    to the existing centroids incrementally.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        metric: Union[Metric, str] = Metric.COSINE,
+        n_lists: int = 256,
+        n_probe: int = 8,
+        auto_train_size: Optional[int] = None,
+        kmeans_iters: int = 20,
+        seed: int = 0,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            dim (int): Dimension of the embeddings.
+            metric (Metric | str): "cosine", "dot" or "l2".
+            n_lists (int): Number of inverted lists (k-means centroids).
+            n_probe (int): Number of lists scanned per query.
+            auto_train_size (Optional[int]): Train automatically once this many
+                embeddings are stored. Defaults to 39 * n_lists; 0 disables it.
+            kmeans_iters (int): Number of k-means iterations when training.
+            seed (int): Random seed used by k-means.
+        """
+        self.dim = dim
+        self.metric = Metric(metric)
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.auto_train_size = (
+            39 * n_lists if auto_train_size is None else auto_train_size
+        )
+        self.kmeans_iters = kmeans_iters
+        self.max_train_size = 256 * n_lists
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[InMemoryVectorStore] = [self._new_list()]
+        self._list_of: Dict[str, int] = {}
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def __len__(self) -> int:
+        return len(self._list_of)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._list_of
+
+    def list_sizes(self) -> List[int]:
+        return [len(inverted_list) for inverted_list in self._lists]
+
+    def train(self, samples: Optional[np.ndarray] = None):
+        """
+        Fit the coarse quantizer and redistribute stored embeddings.
+
+        Args:
+            samples (Optional[np.ndarray]): Training vectors. Defaults to a sample of
+                at most `max_train_size` stored embeddings.
+        """
+        stored = [(lst.ids, lst.vectors, lst.metadatas) for lst in self._lists]
+        if samples is None:
+            data = np.concatenate([vectors for _, vectors, _ in stored])
+            if data.shape[0] > self.max_train_size:
+                rng = np.random.default_rng(self.seed)
+                data = data[rng.choice(data.shape[0], self.max_train_size, False)]
+        else:
+            data = as_matrix(samples, self.dim)
+        if data.shape[0] == 0:
+            raise ValueError("Cannot train an IVF index without data.")
+        if self.metric == Metric.COSINE:
+            data = normalize(data)
+        self.centroids = kmeans(
+            data,
+            self.n_lists,
+            n_iter=self.kmeans_iters,
+            spherical=self.metric == Metric.COSINE,
+            seed=self.seed,
+        )
+
+        self._lists = [self._new_list() for _ in range(len(self.centroids))]
+        self._list_of = {}
+        for ids, vectors, metadatas in stored:
+            if ids:
+                self._insert(list(ids), vectors.copy(), list(metadatas))
+
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        matrix = as_matrix(embeddings, self.dim)
+        if len(ids) != matrix.shape[0]:
+            raise ValueError("ids and embeddings must have the same length.")
+        metadatas = list(metadatas) if metadatas is not None else [{}] * len(ids)
+        # Re-inserted ids may move to another list.
+        self.delete([id for id in ids if id in self._list_of])
+        self._insert(list(ids), matrix, metadatas)
+
+        if (
+            not self.is_trained
+            and self.auto_train_size
+            and len(self) >= self.auto_train_size
+        ):
+            self.train()
+
+    def delete(self, ids: Sequence[str]) -> int:
+        deleted = 0
+        for id in ids:
+            list_index = self._list_of.pop(id, None)
+            if list_index is not None:
+                deleted += self._lists[list_index].delete([id])
+        return deleted
+
+    def search_batch(
+        self,
+        queries: Union[np.ndarray, Sequence[Sequence[float]]],
+        k: int = 4,
+        filter: Optional[MetadataFilter] = None,
+        n_probe: Optional[int] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Find the approximate top-k embeddings for each query.
+
+        Args:
+            queries (np.ndarray | Sequence[Sequence[float]]): Shape (m, dim).
+            k (int): Number of results per query.
+            filter (Optional[MetadataFilter]): See `VectorStoreBase.search_batch`.
+            n_probe (Optional[int]): Overrides `self.n_probe` for this call.
+
+        Returns:
+            List[List[SearchResult]]: Results per query, best first.
+        """
+        queries = as_matrix(queries, self.dim)
+        if not self.is_trained:
+            return self._lists[0].search_batch(queries, k=k, filter=filter)
+
+        probes = top_k(self._coarse_scores(queries), n_probe or self.n_probe)
+        # Group queries by probed list so each list is scanned with one matmul.
+        candidates: List[List[SearchResult]] = [[] for _ in range(len(queries))]
+        for list_index in np.unique(probes):
+            inverted_list = self._lists[list_index]
+            if len(inverted_list) == 0:
+                continue
+            query_indices = np.nonzero((probes == list_index).any(axis=1))[0]
+            hits = inverted_list.search_batch(queries[query_indices], k, filter)
+            for query_index, list_hits in zip(query_indices, hits):
+                candidates[query_index].extend(list_hits)
+        return [
+            heapq.nlargest(k, hits, key=lambda hit: hit.score) for hits in candidates
+        ]
+
+    def search(
+        self,
+        query: Union[np.ndarray, Sequence[float]],
+        k: int = 4,
+        filter: Optional[MetadataFilter] = None,
+        n_probe: Optional[int] = None,
+    ) -> List[SearchResult]:
+        query = np.asarray(query, dtype=np.float32)
+        return self.search_batch(query[None, :], k, filter, n_probe)[0]
+
+    def _coarse_scores(self, queries: np.ndarray) -> np.ndarray:
+        if self.metric == Metric.COSINE:
+            return normalize(queries) @ self.centroids.T
+        products = queries @ self.centroids.T
+        if self.metric == Metric.DOT:
+            return products
+        return 2 * products - np.einsum("ij,ij->i", self.centroids, self.centroids)
+
+    def _insert(
+        self,
+        ids: List[str],
+        matrix: np.ndarray,
+        metadatas: List[Dict[str, Any]],
+    ):
+        if not self.is_trained:
+            self._lists[0].add(ids, matrix, metadatas)
+            self._list_of.update((id, 0) for id in ids)
+            return
+
+        data = normalize(matrix) if self.metric == Metric.COSINE else matrix
+        assignments = assign(data, self.centroids, self.metric == Metric.COSINE)
+        for list_index in np.unique(assignments):
+            rows = np.nonzero(assignments == list_index)[0]
+            self._lists[list_index].add(
+                [ids[row] for row in rows],
+                matrix[rows],
+                [metadatas[row] for row in rows],
+            )
+            self._list_of.update((ids[row], int(list_index)) for row in rows)
+
+    def _new_list(self) -> InMemoryVectorStore:
+        return InMemoryVectorStore(self.dim, self.metric, initial_capacity=64)
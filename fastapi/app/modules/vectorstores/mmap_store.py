@@ -0,0 +1,378 @@
+"""
+Persisted, memory-mapped vector index segments.
+
+A segment is a single file:
+
+    header | padding | vector block | id offsets | id blob | metadata offsets | metadata blob
+
+- header: magic, format version, dtype, metric, dim, count and block offsets.
+- vector block: `count x dim` float32 or float16, 64-byte aligned.
+- id / metadata tables: `count + 1` little-endian uint64 offsets into a blob of
+  UTF-8 ids / JSON-encoded metadata.
+
+An index directory holds numbered segments plus a `CURRENT` file naming the live
+one. Segments are written to a temporary file, fsynced and renamed into place,
+then `CURRENT` is swapped with another atomic rename, so readers never see a
+partial segment and a rebuild can be published without downtime. Readers open
+segments with `numpy.memmap`, so every worker shares the same pages through the
+OS page cache and opening an index does not read the vectors.
+"""
+
+import json
+import os
+import re
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
+from app.modules.vectorstores.base import (
+    MetadataFilter,
+    Metric,
+    SearchResult,
+    VectorSearchBase,
+    as_matrix,
+    matches_filter,
+    normalize,
+    score,
+    top_k,
+)
+
+MAGIC = b"MRAGVEC\x00"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+CURRENT_FILE = "CURRENT"
+
+# magic, format version, dtype, metric, dim, count,
+# vectors, id offsets, id blob, metadata offsets, metadata blob, file size
+_HEADER = struct.Struct("<8sHBBIQQQQQQQ")
+_DTYPES = {0: np.dtype("<f4"), 1: np.dtype("<f2")}
+_METRICS = {0: Metric.COSINE, 1: Metric.DOT, 2: Metric.L2}
+_SEGMENT_NAME = re.compile(r"^segment-(\d+)\.vec$")
+
+
+def _code_of(mapping: Dict[int, Any], value: Any) -> int:
+    return next(code for code, item in mapping.items() if item == value)
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _write_table(file, items: List[bytes]) -> int:
+    offsets = np.zeros(len(items) + 1, dtype="<u8")
+    np.cumsum([len(item) for item in items], out=offsets[1:])
+    file.write(offsets.tobytes())
+    return file.tell()
+
+
+def _fsync_directory(directory: str):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def list_segments(directory: str) -> List[str]:
+    """
+    Segment file names in `directory`, oldest first.
+    """
+    names = [name for name in os.listdir(directory) if _SEGMENT_NAME.match(name)]
+    return sorted(names, key=lambda name: int(_SEGMENT_NAME.match(name).group(1)))
+
+
+def write_segment(
+    directory: str,
+    ids: Sequence[str],
+    vectors: np.ndarray,
+    metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+    metric: Union[Metric, str] = Metric.COSINE,
+    dtype: str = "float32",
+    keep: int = 2,
+    chunk_size: int = 65536,
+) -> str:
+    """
+    Write a new segment and atomically make it the live one.
+
+    Args:
+        directory (str): Index directory. Created if missing.
+        ids (Sequence[str]): Ids aligned with `vectors`.
+        vectors (np.ndarray): Embeddings, shape (n, dim).
+        metadatas (Optional[Sequence[Dict[str, Any]]]): JSON-serializable metadata.
+        metric (Metric | str): Metric the segment will be searched with. Cosine
+            vectors are stored L2-normalized.
+        dtype (str): "float32" or "float16" for the vector block.
+        keep (int): Number of most recent segments kept on disk. Older ones are
+            unlinked; readers that still map them are unaffected.
+        chunk_size (int): Rows converted per write, bounding temporary memory.
+
+    Returns:
+        str: Path of the new segment.
+    """
+    metric = Metric(metric)
+    vector_dtype = np.dtype(dtype).newbyteorder("<")
+    dtype_code = _code_of(_DTYPES, vector_dtype)
+    count, dim = vectors.shape
+    if len(ids) != count:
+        raise ValueError("ids and vectors must have the same length.")
+    if metadatas is not None and len(metadatas) != count:
+        raise ValueError("ids and metadatas must have the same length.")
+
+    os.makedirs(directory, exist_ok=True)
+    segments = list_segments(directory)
+    version = int(_SEGMENT_NAME.match(segments[-1]).group(1)) + 1 if segments else 1
+    name = f"segment-{version:06d}.vec"
+    path = os.path.join(directory, name)
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, "wb") as file:
+        file.write(b"\x00" * _HEADER.size)
+        vectors_offset = _align(_HEADER.size)
+        file.write(b"\x00" * (vectors_offset - _HEADER.size))
+        for start in range(0, count, chunk_size):
+            block = np.asarray(vectors[start : start + chunk_size], dtype=np.float32)
+            if metric == Metric.COSINE:
+                block = normalize(block)
+            file.write(block.astype(vector_dtype).tobytes())
+
+        encoded_ids = [id.encode("utf-8") for id in ids]
+        ids_offset = file.tell()
+        ids_blob_offset = _write_table(file, encoded_ids)
+        file.writelines(encoded_ids)
+
+        encoded_metadatas = [
+            json.dumps(metadata or {}, ensure_ascii=False).encode("utf-8")
+            for metadata in (metadatas or [{}] * count)
+        ]
+        metadata_offset = file.tell()
+        metadata_blob_offset = _write_table(file, encoded_metadatas)
+        file.writelines(encoded_metadatas)
+        file_size = file.tell()
+
+        file.seek(0)
+        file.write(
+            _HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                dtype_code,
+                _code_of(_METRICS, metric),
+                dim,
+                count,
+                vectors_offset,
+                ids_offset,
+                ids_blob_offset,
+                metadata_offset,
+                metadata_blob_offset,
+                file_size,
+            )
+        )
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+    current_tmp = os.path.join(directory, f"{CURRENT_FILE}.tmp")
+    with open(current_tmp, "w") as file:
+        file.write(name)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(current_tmp, os.path.join(directory, CURRENT_FILE))
+    _fsync_directory(directory)
+
+    for old in list_segments(directory)[: -max(keep, 1)]:
+        os.remove(os.path.join(directory, old))
+    return path
+
+
+class Segment:
+    """
+    Read-only, memory-mapped view of one segment file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        (
+            magic,
+            version,
+            dtype_code,
+            metric_code,
+            self.dim,
+            self.count,
+            vectors_offset,
+            ids_offset,
+            ids_blob_offset,
+            metadata_offset,
+            metadata_blob_offset,
+            file_size,
+        ) = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} segment.")
+        if file_size != self._buffer.size:
+            raise ValueError(f"{path} is truncated.")
+        self.metric = _METRICS[metric_code]
+
+        self.vectors = np.ndarray(
+            (self.count, self.dim),
+            dtype=_DTYPES[dtype_code],
+            buffer=self._buffer,
+            offset=vectors_offset,
+        )
+        self._id_offsets = np.ndarray(
+            (self.count + 1,), dtype="<u8", buffer=self._buffer, offset=ids_offset
+        )
+        self._ids_blob_offset = ids_blob_offset
+        self._metadata_offsets = np.ndarray(
+            (self.count + 1,), dtype="<u8", buffer=self._buffer, offset=metadata_offset
+        )
+        self._metadata_blob_offset = metadata_blob_offset
+
+    def id(self, row: int) -> str:
+        start = self._ids_blob_offset + int(self._id_offsets[row])
+        end = self._ids_blob_offset + int(self._id_offsets[row + 1])
+        return self._buffer[start:end].tobytes().decode("utf-8")
+
+    def metadata(self, row: int) -> Dict[str, Any]:
+        start = self._metadata_blob_offset + int(self._metadata_offsets[row])
+        end = self._metadata_blob_offset + int(self._metadata_offsets[row + 1])
+        return json.loads(self._buffer[start:end].tobytes())
+
+
+class MmapVectorStore(VectorSearchBase):
+    """
+    Read-only vector store serving the live segment of an index directory.
+
+    Opening is O(1): vectors, ids and metadata are decoded lazily from the mapped
+    file. Exact search scans the vector block in chunks, so float16 segments are
+    upcast one chunk at a time. Call `reload()` to pick up a newly published
+    segment; in-flight searches keep using the segment they started with.
+
+    It implements only `VectorSearchBase`: there is no `add` or `delete`, and
+    changes are published as a new segment with `write_segment`.
+    """
+
+    def __init__(self, directory: str, chunk_size: int = 65536):
+        """
+        Open the live segment of an index directory.
+
+        Args:
+            directory (str): Index directory written by `write_segment`.
+            chunk_size (int): Rows scored per step during search.
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.segment: Optional[Segment] = None
+        self._rows: Optional[Dict[str, int]] = None
+        self._metadatas: Optional[List[Dict[str, Any]]] = None
+        if not self.reload():
+            raise FileNotFoundError(f"No live segment in {directory}.")
+
+    @property
+    def dim(self) -> int:
+        return self.segment.dim
+
+    @property
+    def metric(self) -> Metric:
+        return self.segment.metric
+
+    def __len__(self) -> int:
+        return self.segment.count
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._row_index()
+
+    def reload(self) -> bool:
+        """
+        Switch to the live segment if it changed since the last call.
+
+        Returns:
+            bool: Whether a segment was (re)opened.
+        """
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE)) as file:
+                name = file.read().strip()
+        except FileNotFoundError:
+            return False
+        path = os.path.join(self.directory, name)
+        if self.segment is not None and self.segment.path == path:
+            return False
+        self.segment = Segment(path)
+        self._rows = None
+        self._metadatas = None
+        return True
+
+    def get_vectors(self, ids: Sequence[str]) -> np.ndarray:
+        """
+        Return the stored embeddings of the given ids as float32, shape (len(ids), dim).
+        """
+        rows = [self._row_index()[id] for id in ids]
+        return np.asarray(self.segment.vectors[rows], dtype=np.float32)
+
+    def search_batch(
+        self,
+        queries: Union[np.ndarray, Sequence[Sequence[float]]],
+        k: int = 4,
+        filter: Optional[MetadataFilter] = None,
+    ) -> List[List[SearchResult]]:
+        segment = self.segment
+        queries = as_matrix(queries, segment.dim)
+        rows = None
+        if filter is not None:
+            metadatas = self._all_metadatas()
+            rows = np.fromiter(
+                (row for row, md in enumerate(metadatas) if matches_filter(md, filter)),
+                dtype=np.int64,
+            )
+        total = segment.count if rows is None else rows.size
+        if total == 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        best_scores = np.empty((queries.shape[0], 0), dtype=np.float32)
+        best_rows = np.empty((queries.shape[0], 0), dtype=np.int64)
+        for start in range(0, total, self.chunk_size):
+            if rows is None:
+                chunk_rows = np.arange(start, min(start + self.chunk_size, total))
+                vectors = segment.vectors[start : start + self.chunk_size]
+            else:
+                chunk_rows = rows[start : start + self.chunk_size]
+                vectors = segment.vectors[chunk_rows]
+            scores = score(
+                queries, np.asarray(vectors, dtype=np.float32), segment.metric
+            )
+            candidates = top_k(scores, k)
+            merged_scores = np.concatenate(
+                [best_scores, np.take_along_axis(scores, candidates, axis=1)], axis=1
+            )
+            merged_rows = np.concatenate([best_rows, chunk_rows[candidates]], axis=1)
+            order = top_k(merged_scores, k)
+            best_scores = np.take_along_axis(merged_scores, order, axis=1)
+            best_rows = np.take_along_axis(merged_rows, order, axis=1)
+
+        return [
+            [
+                SearchResult(
+                    id=segment.id(int(row)),
+                    score=float(value),
+                    metadata=self._metadata(int(row)),
+                )
+                for row, value in zip(query_rows, query_scores)
+            ]
+            for query_rows, query_scores in zip(best_rows, best_scores)
+        ]
+
+    def _metadata(self, row: int) -> Dict[str, Any]:
+        if self._metadatas is not None:
+            return self._metadatas[row]
+        return self.segment.metadata(row)
+
+    def _all_metadatas(self) -> List[Dict[str, Any]]:
+        if self._metadatas is None:
+            self._metadatas = [
+                self.segment.metadata(row) for row in range(self.segment.count)
+            ]
+        return self._metadatas
+
+    def _row_index(self) -> Dict[str, int]:
+        if self._rows is None:
+            self._rows = {
+                self.segment.id(row): row for row in range(self.segment.count)
+            }
+        return self._rows
@@ -0,0 +1,473 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
+from app.modules.vectorstores.base import (
+    MetadataFilter,
+    Metric,
+    SearchResult,
+    VectorSearchBase,
+    VectorStoreBase,
+    as_matrix,
+    matches_filter,
+    normalize,
+    score,
+    top_k,
+)
+from app.modules.vectorstores.in_memory import InMemoryVectorStore
+from app.modules.vectorstores.ivf import assign, kmeans
+
+
+class Quantizer(ABC):
+    """
+    Compresses float32 vectors into compact codes and scores float32 queries
+    directly against the codes (asymmetric distance computation).
+    """
+
+    code_dtype: np.dtype
+    # Candidates re-scored per requested result by default. Coarser codes
+    # misorder more neighbors, so they need a deeper re-ranking.
+    rerank_factor: int = 4
+    # Training vectors needed for codes worth keeping.
+    min_train_size: int = 1000
+
+    @property
+    @abstractmethod
+    def is_trained(self) -> bool:
+        pass
+
+    @abstractmethod
+    def code_size(self, dim: int) -> int:
+        """
+        Number of code columns stored per vector.
+        """
+        pass
+
+    @abstractmethod
+    def train(self, data: np.ndarray) -> None:
+        pass
+
+    @abstractmethod
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def score(
+        self, queries: np.ndarray, codes: np.ndarray, metric: Metric
+    ) -> np.ndarray:
+        """
+        Approximate scores of queries (m, dim) against codes (n, code_size),
+        higher is better. Queries are already normalized for cosine.
+
+        Returns:
+            np.ndarray: Shape (m, n).
+        """
+        pass
+
+    def nbytes(self) -> int:
+        """
+        Memory used by the trained parameters.
+        """
+        return 0
+
+
+class ScalarQuantizer(Quantizer):
+    """
+    Per-dimension 8-bit scalar quantization (4x smaller than float32).
+    Each dimension is mapped linearly from its trained [min, max] range to int8.
+    """
+
+    code_dtype = np.dtype(np.int8)
+
+    def __init__(self):
+        self.low: Optional[np.ndarray] = None
+        self.step: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.low is not None
+
+    def code_size(self, dim: int) -> int:
+        return dim
+
+    def train(self, data: np.ndarray) -> None:
+        self.low = data.min(axis=0).astype(np.float32)
+        span = data.max(axis=0) - self.low
+        self.step = (np.where(span > 0, span, 1.0) / 255).astype(np.float32)
+
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        levels = np.rint((data - self.low) / self.step)
+        return (np.clip(levels, 0, 255) - 128).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return (codes.astype(np.float32) + 128) * self.step + self.low
+
+    def score(
+        self, queries: np.ndarray, codes: np.ndarray, metric: Metric
+    ) -> np.ndarray:
+        # q . x_hat = (q * step) . code + q . (low + 128 * step), so the codes are
+        # only cast to float32, never decoded.
+        products = (codes.astype(np.float32) @ (queries * self.step).T).T
+        products += (queries @ (self.low + 128 * self.step))[:, None]
+        if metric != Metric.L2:
+            return products
+        decoded = self.decode(codes)
+        decoded_sq_norms = np.einsum("ij,ij->i", decoded, decoded)
+        query_sq_norms = np.einsum("ij,ij->i", queries, queries)[:, None]
+        distances = query_sq_norms - 2 * products + decoded_sq_norms[None, :]
+        return -np.sqrt(np.maximum(distances, 0, out=distances))
+
+    def nbytes(self) -> int:
+        return 0 if self.low is None else self.low.nbytes + self.step.nbytes
+
+
+class ProductQuantizer(Quantizer):
+    """
+    Product quantization: the vector is split into `n_subvectors` chunks and each
+    chunk is replaced by the index of its nearest of 256 k-means centroids, so a
+    vector costs `n_subvectors` bytes. Queries are scored with per-subspace lookup
+    tables.
+
+    The codes alone rank poorly; search is meant to re-rank with full-precision
+    vectors. With 4 dimensions per subvector, re-ranking 32 candidates per result
+    brings recall@10 close to `ScalarQuantizer` (see the benchmark). Fewer
+    subvectors need a larger `rerank_factor`.
+    """
+
+    code_dtype = np.dtype(np.uint8)
+    rerank_factor = 32
+
+    def __init__(self, n_subvectors: int = 16, kmeans_iters: int = 20, seed: int = 0):
+        """
+        Initialize the quantizer.
+
+        Args:
+            n_subvectors (int): Number of subspaces; must divide the dimension.
+            kmeans_iters (int): k-means iterations per subspace.
+            seed (int): Random seed used by k-means.
+        """
+        self.n_subvectors = n_subvectors
+        self.kmeans_iters = kmeans_iters
+        self.seed = seed
+        # Enough vectors for 256 centroids in every subspace.
+        self.min_train_size = 256 * n_subvectors
+        self.codebooks: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.codebooks is not None
+
+    def code_size(self, dim: int) -> int:
+        return self.n_subvectors
+
+    def _split(self, data: np.ndarray) -> np.ndarray:
+        n, dim = data.shape
+        if dim % self.n_subvectors:
+            raise ValueError(
+                f"Dimension {dim} is not divisible by {self.n_subvectors} subvectors."
+            )
+        return data.reshape(n, self.n_subvectors, dim // self.n_subvectors)
+
+    def train(self, data: np.ndarray) -> None:
+        subvectors = self._split(data)
+        codebooks = [
+            kmeans(
+                np.ascontiguousarray(subvectors[:, m]),
+                256,
+                n_iter=self.kmeans_iters,
+                seed=self.seed + m,
+            )
+            for m in range(self.n_subvectors)
+        ]
+        # Pad codebooks when fewer than 256 training vectors were available.
+        size = max(codebook.shape[0] for codebook in codebooks)
+        self.codebooks = np.stack(
+            [np.resize(codebook, (size, codebook.shape[1])) for codebook in codebooks]
+        )
+
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        subvectors = self._split(data)
+        codes = np.empty((data.shape[0], self.n_subvectors), dtype=np.uint8)
+        for m in range(self.n_subvectors):
+            codes[:, m] = assign(
+                np.ascontiguousarray(subvectors[:, m]), self.codebooks[m]
+            )
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        parts = self.codebooks[np.arange(self.n_subvectors), codes]
+        return parts.reshape(codes.shape[0], -1)
+
+    def score(
+        self, queries: np.ndarray, codes: np.ndarray, metric: Metric
+    ) -> np.ndarray:
+        subqueries = self._split(queries)
+        # tables[q, m, c] = contribution of centroid c of subspace m to query q.
+        tables = np.einsum("qmd,mcd->qmc", subqueries, self.codebooks)
+        if metric == Metric.L2:
+            codebook_sq_norms = np.einsum("mcd,mcd->mc", self.codebooks, self.codebooks)
+            query_sq_norms = np.einsum("qmd,qmd->qm", subqueries, subqueries)
+            tables = query_sq_norms[:, :, None] - 2 * tables + codebook_sq_norms
+        # One gather per subspace over contiguous code columns; gathering all
+        # subspaces at once materializes an (m, n, n_subvectors) temporary.
+        columns = np.ascontiguousarray(codes.T)
+        totals = np.zeros((queries.shape[0], codes.shape[0]), dtype=np.float32)
+        for m in range(self.n_subvectors):
+            totals += tables[:, m, columns[m]]
+        if metric == Metric.L2:
+            return -np.sqrt(np.maximum(totals, 0, out=totals))
+        return totals
+
+    def nbytes(self) -> int:
+        return 0 if self.codebooks is None else self.codebooks.nbytes
+
+
+class QuantizedVectorStore(VectorStoreBase):
+    """
+    Vector store that keeps only quantized codes in memory.
+
+    Search scores float32 queries against the codes in chunks. When a
+    `rerank_store` holding the full-precision vectors is given (for example an
+    `MmapVectorStore` on disk), the best `k * rerank_factor` candidates are
+    re-scored exactly to restore accuracy.
+
+    Codes need a trained quantizer. Until it is trained, embeddings are kept in
+    full precision and searched exactly; the quantizer is trained on them once
+    `auto_train_size` are stored, or when `train` is called.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        quantizer: Quantizer,
+        metric: Union[Metric, str] = Metric.COSINE,
+        rerank_store: Optional[VectorSearchBase] = None,
+        rerank_factor: Optional[int] = None,
+        chunk_size: int = 16384,
+        auto_train_size: Optional[int] = None,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            dim (int): Dimension of the embeddings.
+            quantizer (Quantizer): `ScalarQuantizer` or `ProductQuantizer`.
+            metric (Metric | str): "cosine", "dot" or "l2".
+            rerank_store (Optional[VectorSearchBase]): Store implementing
+                `get_vectors(ids)` with full-precision vectors for the same ids.
+            rerank_factor (Optional[int]): Candidates re-scored per requested
+                result. Defaults to the quantizer's `rerank_factor`.
+            chunk_size (int): Codes scored per step during search.
+            auto_train_size (Optional[int]): Train an untrained quantizer once
+                this many embeddings are stored. Defaults to the quantizer's
+                `min_train_size`; 0 disables it.
+        """
+        self.dim = dim
+        self.metric = Metric(metric)
+        self.quantizer = quantizer
+        self.rerank_store = rerank_store
+        self.rerank_factor = (
+            rerank_factor if rerank_factor is not None else quantizer.rerank_factor
+        )
+        self.chunk_size = chunk_size
+        self.auto_train_size = (
+            quantizer.min_train_size if auto_train_size is None else auto_train_size
+        )
+        # Full-precision embeddings added before the quantizer was trained.
+        self._pending: Optional[InMemoryVectorStore] = None
+        if not quantizer.is_trained:
+            self._pending = InMemoryVectorStore(dim, self.metric, initial_capacity=64)
+        self._codes = np.empty(
+            (0, quantizer.code_size(dim)), dtype=quantizer.code_dtype
+        )
+        self._size = 0
+        self._ids: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        if self._pending is not None:
+            return len(self._pending)
+        return self._size
+
+    def __contains__(self, id: str) -> bool:
+        if self._pending is not None:
+            return id in self._pending
+        return id in self._rows
+
+    def memory_bytes(self) -> int:
+        """
+        Bytes used by the codes and the quantizer parameters, or by the
+        full-precision embeddings before training.
+        """
+        if self._pending is not None:
+            return self._pending.vectors.nbytes
+        return self._codes[: self._size].nbytes + self.quantizer.nbytes()
+
+    def train(
+        self, samples: Optional[Union[np.ndarray, Sequence[Sequence[float]]]] = None
+    ) -> None:
+        """
+        Train the quantizer and encode the embeddings stored so far.
+
+        Args:
+            samples (Optional[np.ndarray | Sequence[Sequence[float]]]): Training
+                vectors. Defaults to the stored embeddings.
+        """
+        if self._pending is None:
+            raise ValueError("The quantizer is already trained.")
+        if samples is None:
+            data = self._pending.vectors
+        else:
+            data = as_matrix(samples, self.dim)
+            if self.metric == Metric.COSINE:
+                data = normalize(data)
+        if data.shape[0] == 0:
+            raise ValueError("Cannot train a quantizer without data.")
+        self.quantizer.train(data)
+
+        pending, self._pending = self._pending, None
+        if len(pending):
+            self.add(pending.ids, pending.vectors, pending.metadatas)
+
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> None:
+        matrix = as_matrix(embeddings, self.dim)
+        if len(ids) != matrix.shape[0]:
+            raise ValueError("ids and embeddings must have the same length.")
+        if metadatas is not None and len(metadatas) != len(ids):
+            raise ValueError("ids and metadatas must have the same length.")
+        if self._pending is not None:
+            self._pending.add(ids, matrix, metadatas)
+            if self.auto_train_size and len(self._pending) >= self.auto_train_size:
+                self.train()
+            return
+        if self.metric == Metric.COSINE:
+            matrix = normalize(matrix)
+        codes = self.quantizer.encode(matrix)
+
+        new_rows = sum(1 for id in set(ids) if id not in self._rows)
+        if self._size + new_rows > self._codes.shape[0]:
+            capacity = max(self._size + new_rows, 2 * self._codes.shape[0])
+            grown = np.empty((capacity, self._codes.shape[1]), dtype=self._codes.dtype)
+            grown[: self._size] = self._codes[: self._size]
+            self._codes = grown
+        for i, id in enumerate(ids):
+            metadata = dict(metadatas[i]) if metadatas is not None else {}
+            row = self._rows.get(id)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self._rows[id] = row
+                self._ids.append(id)
+                self._metadatas.append(metadata)
+            else:
+                self._metadatas[row] = metadata
+            self._codes[row] = codes[i]
+
+    def delete(self, ids: Sequence[str]) -> int:
+        if self._pending is not None:
+            return self._pending.delete(ids)
+        deleted = 0
+        for id in ids:
+            row = self._rows.pop(id, None)
+            if row is None:
+                continue
+            last = self._size - 1
+            if row != last:
+                self._codes[row] = self._codes[last]
+                self._ids[row] = self._ids[last]
+                self._metadatas[row] = self._metadatas[last]
+                self._rows[self._ids[row]] = row
+            self._ids.pop()
+            self._metadatas.pop()
+            self._size -= 1
+            deleted += 1
+        return deleted
+
+    def search_batch(
+        self,
+        queries: Union[np.ndarray, Sequence[Sequence[float]]],
+        k: int = 4,
+        filter: Optional[MetadataFilter] = None,
+        rerank: bool = True,
+    ) -> List[List[SearchResult]]:
+        """
+        Find the top-k embeddings for each query.
+
+        Args:
+            queries (np.ndarray | Sequence[Sequence[float]]): Shape (m, dim).
+            k (int): Number of results per query.
+            filter (Optional[MetadataFilter]): See `VectorStoreBase.search_batch`.
+            rerank (bool): Re-score candidates with `rerank_store` when available.
+
+        Returns:
+            List[List[SearchResult]]: Results per query, best first.
+        """
+        queries = as_matrix(queries, self.dim)
+        if self._pending is not None:
+            return self._pending.search_batch(queries, k=k, filter=filter)
+        if self.metric == Metric.COSINE:
+            queries = normalize(queries)
+        if filter is None:
+            rows = np.arange(self._size)
+        else:
+            rows = np.fromiter(
+                (
+                    row
+                    for row, metadata in enumerate(self._metadatas)
+                    if matches_filter(metadata, filter)
+                ),
+                dtype=np.int64,
+            )
+        if rows.size == 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        rerank = rerank and self.rerank_store is not None
+        n_candidates = k * self.rerank_factor if rerank else k
+        best_scores = np.empty((queries.shape[0], 0), dtype=np.float32)
+        best_rows = np.empty((queries.shape[0], 0), dtype=np.int64)
+        for start in range(0, rows.size, self.chunk_size):
+            chunk_rows = rows[start : start + self.chunk_size]
+            codes = (
+                self._codes[start : start + chunk_rows.size]
+                if filter is None
+                else self._codes[chunk_rows]
+            )
+            scores = self.quantizer.score(queries, codes, self.metric)
+            candidates = top_k(scores, n_candidates)
+            merged_scores = np.concatenate(
+                [best_scores, np.take_along_axis(scores, candidates, axis=1)], axis=1
+            )
+            merged_rows = np.concatenate([best_rows, chunk_rows[candidates]], axis=1)
+            order = top_k(merged_scores, n_candidates)
+            best_scores = np.take_along_axis(merged_scores, order, axis=1)
+            best_rows = np.take_along_axis(merged_rows, order, axis=1)
+
+        results = []
+        for query, query_rows, query_scores in zip(queries, best_rows, best_scores):
+            if rerank:
+                ids = [self._ids[row] for row in query_rows]
+                exact = score(
+                    query[None, :], self.rerank_store.get_vectors(ids), self.metric
+                )[0]
+                order = np.argsort(-exact)[:k]
+                query_rows, query_scores = query_rows[order], exact[order]
+            results.append(
+                [
+                    SearchResult(
+                        id=self._ids[row],
+                        score=float(value),
+                        metadata=self._metadatas[row],
+                    )
+                    for row, value in zip(query_rows, query_scores)
+                ]
+            )
+        return results
@@ -1,10 +1,76 @@
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from pydantic import BaseModel
 
+# Query parameters that only track the click and never change the page.
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "yclid", "ref", "ref_src"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
 
-class WebSearchBase(BaseModel):
-    query: str
-    max_results: int = 10
 
-    def search_web(self):
-        pass
+class SearchResult(BaseModel):
+    title: str
+    url: str
+    snippet: str = ""
+    provider: str = ""
+    score: Optional[float] = None
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", query)).strip().lower()
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL, so the same page found by several providers
+    compares equal: lower-cased scheme and host without "www." or a default
+    port, no fragment, tracking parameters removed, the remaining parameters
+    sorted and no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/")
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
 
+class WebSearchBase(ABC):
+    """
+    Abstract base class for web search providers.
+    """
+
+    def __init__(self, name: str, timeout: float = 3.0):
+        """
+        Initialize the provider.
+
+        Args:
+            name (str): Provider name, recorded on every result.
+            timeout (float): Seconds a search may take before it is abandoned.
+        """
+        self.name = name
+        self.timeout = timeout
+
+    @abstractmethod
+    async def asearch(self, query: str, max_results: int = 10) -> List[SearchResult]:
+        """
+        Search the web.
+
+        Args:
+            query (str): The search query.
+            max_results (int): Maximum number of results.
+
+        Returns:
+            List[SearchResult]: Results, best first.
+        """
+        pass
@@ -1,6 +1,91 @@
-from app.services.web_search.base import WebSearchBase
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+import httpx
+from app.modules.web_search.base import SearchResult, WebSearchBase
+
+
+class _ResultParser(HTMLParser):
+    """
+    Extracts results from the DuckDuckGo HTML endpoint: a "result__a" link
+    (title) followed by a "result__snippet" element.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.results: List[Dict[str, str]] = []
+        self._field: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        if "result__a" in classes:
+            self.results.append(
+                {"url": attrs.get("href", ""), "title": "", "snippet": ""}
+            )
+            self._field = "title"
+        elif "result__snippet" in classes and self.results:
+            self._field = "snippet"
+
+    def handle_endtag(self, tag):
+        if tag in ("a", "td", "div"):
+            self._field = None
+
+    def handle_data(self, data):
+        if self._field is not None:
+            self.results[-1][self._field] += data
+
+
+def _target_url(href: str) -> str:
+    # Result links go through a redirect: //duckduckgo.com/l/?uddg=<url>
+    parts = urlsplit(href)
+    if parts.path.startswith("/l/"):
+        return parse_qs(parts.query).get("uddg", [href])[0]
+    return href
 
 
 class DuckduckgoSearch(WebSearchBase):
-    query: str
-    max_results: int = 10
\ No newline at end of file
+    """
+    Search through DuckDuckGo's HTML endpoint, which needs no API key.
+    """
+
+    endpoint = "https://html.duckduckgo.com/html/"
+
+    def __init__(
+        self,
+        timeout: float = 3.0,
+        region: str = "kr-kr",
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            timeout (float): Seconds a search may take.
+            region (str): DuckDuckGo region code.
+            client (Optional[httpx.AsyncClient]): Shared HTTP client; one with
+                keep-alive connections is created if omitted.
+        """
+        super().__init__("duckduckgo", timeout)
+        self.region = region
+        self.client = client or httpx.AsyncClient(
+            timeout=timeout, headers={"User-Agent": "Mozilla/5.0"}
+        )
+
+    async def asearch(self, query: str, max_results: int = 10) -> List[SearchResult]:
+        response = await self.client.post(
+            self.endpoint, data={"q": query, "kl": self.region}
+        )
+        response.raise_for_status()
+        parser = _ResultParser()
+        parser.feed(response.text)
+        return [
+            SearchResult(
+                title=item["title"].strip(),
+                url=_target_url(item["url"]),
+                snippet=item["snippet"].strip(),
+                provider=self.name,
+            )
+            for item in parser.results[:max_results]
+            if item["url"]
+        ]
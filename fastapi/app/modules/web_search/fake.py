@@ -0,0 +1,58 @@
+import asyncio
+import hashlib
+from typing import Dict, List, Optional
+from app.modules.web_search.base import SearchResult, WebSearchBase
+
+
+class FakeSearch(WebSearchBase):
+    """
+    Local provider for tests and benchmarks. Returns canned results for known
+    queries and deterministic generated ones otherwise, after `latency` seconds.
+    """
+
+    def __init__(
+        self,
+        name: str = "fake",
+        timeout: float = 3.0,
+        latency: float = 0.0,
+        results: Optional[Dict[str, List[SearchResult]]] = None,
+        error: Optional[Exception] = None,
+        domain: str = "example.com",
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            name (str): Provider name.
+            timeout (float): Seconds a search may take.
+            latency (float): Simulated response time in seconds.
+            results (Optional[Dict[str, List[SearchResult]]]): Canned results by query.
+            error (Optional[Exception]): Raised by every search when set.
+            domain (str): Domain of the generated result URLs. Providers with the
+                same domain return overlapping URLs.
+        """
+        super().__init__(name, timeout)
+        self.latency = latency
+        self.results = results or {}
+        self.error = error
+        self.domain = domain
+        self.call_count = 0
+
+    async def asearch(self, query: str, max_results: int = 10) -> List[SearchResult]:
+        self.call_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        if query in self.results:
+            return self.results[query][:max_results]
+        digest = hashlib.sha1(query.encode()).hexdigest()[:8]
+        return [
+            SearchResult(
+                title=f"{query} ({i + 1})",
+                url=f"https://www.{self.domain}/{digest}/{i}?utm_source={self.name}",
+                snippet=f"Result {i + 1} for {query} from {self.name}.",
+                provider=self.name,
+            )
+            for i in range(max_results)
+        ]
@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence
+from app.configs.redis import RedisClient
+from app.modules.web_search.base import (
+    SearchResult,
+    WebSearchBase,
+    normalize_query,
+    normalize_url,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WebSearchStats:
+    searches: int = 0
+    cache_hits: int = 0
+    joined: int = 0
+    provider_timeouts: int = 0
+    provider_errors: int = 0
+
+
+class WebSearchService:
+    """
+    Queries several web search providers concurrently and merges their results.
+
+    - Every provider runs under its own `timeout`, and the whole search under
+      `deadline`: whatever came back by then is returned, the rest is cancelled.
+    - Results are interleaved by rank across providers and deduplicated by
+      normalized URL.
+    - Merged results are cached in Redis by normalized query. Results missing a
+      provider (timeout or error) are cached for `partial_cache_ttl` only.
+    - A query already being searched is joined instead of searched again.
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[WebSearchBase],
+        redis_client: Optional[RedisClient] = None,
+        deadline: float = 5.0,
+        cache_ttl: int = 600,
+        partial_cache_ttl: int = 30,
+        namespace: str = "web_search",
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            providers (Sequence[WebSearchBase]): Providers, in merge priority order.
+            redis_client (Optional[RedisClient]): Result cache; disabled if omitted.
+            deadline (float): Seconds after which a search returns what it has.
+            cache_ttl (int): Lifetime of a cached search in seconds.
+            partial_cache_ttl (int): Lifetime of a cached search with missing
+                providers; 0 to not cache them.
+            namespace (str): Prefix of every Redis key written by the service.
+        """
+        if not providers:
+            raise ValueError("At least one provider is required.")
+        self.providers = list(providers)
+        self.redis_client = redis_client
+        self.deadline = deadline
+        self.cache_ttl = cache_ttl
+        self.partial_cache_ttl = partial_cache_ttl
+        self.namespace = namespace
+        self.stats = WebSearchStats()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _cache_key(self, query: str, max_results: int) -> str:
+        raw = json.dumps(
+            [normalize_query(query), max_results, [p.name for p in self.providers]],
+            ensure_ascii=False,
+        )
+        return f"{self.namespace}:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+    async def search(self, query: str, max_results: int = 10) -> List[SearchResult]:
+        """
+        Search all providers and return the merged results.
+
+        Args:
+            query (str): The search query.
+            max_results (int): Maximum number of merged results.
+
+        Returns:
+            List[SearchResult]: Deduplicated results, best first.
+        """
+        self.stats.searches += 1
+        key = self._cache_key(query, max_results)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._search(key, query, max_results))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats.joined += 1
+        # Shielded: a cancelled caller does not cancel the search for the others.
+        return list(await asyncio.shield(task))
+
+    async def _search(
+        self, key: str, query: str, max_results: int
+    ) -> List[SearchResult]:
+        cached = await self._cache_get(key)
+        if cached is not None:
+            self.stats.cache_hits += 1
+            return cached
+
+        tasks = {
+            asyncio.create_task(
+                asyncio.wait_for(provider.asearch(query, max_results), provider.timeout)
+            ): provider
+            for provider in self.providers
+        }
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in pending:
+            task.cancel()
+        # Collected in provider order, so earlier providers win rank ties.
+        ranked: List[List[SearchResult]] = []
+        complete = not pending
+        for task, provider in tasks.items():
+            if task in pending:
+                self.stats.provider_timeouts += 1
+                logger.warning(
+                    f"Web search provider {provider.name} missed the deadline"
+                )
+            elif isinstance(task.exception(), asyncio.TimeoutError):
+                complete = False
+                self.stats.provider_timeouts += 1
+                logger.warning(f"Web search provider {provider.name} timed out")
+            elif task.exception() is not None:
+                complete = False
+                self.stats.provider_errors += 1
+                logger.warning(
+                    f"Web search provider {provider.name} failed: {task.exception()}"
+                )
+            else:
+                ranked.append(task.result())
+
+        results = self.merge(ranked, max_results)
+        if ranked:
+            ttl = self.cache_ttl if complete else self.partial_cache_ttl
+            await self._cache_set(key, results, ttl)
+        return results
+
+    @staticmethod
+    def merge(ranked: List[List[SearchResult]], max_results: int) -> List[SearchResult]:
+        """
+        Interleave result lists by rank and drop URLs already taken.
+        """
+        merged: List[SearchResult] = []
+        seen = set()
+        for rank in range(max((len(results) for results in ranked), default=0)):
+            for results in ranked:
+                if rank >= len(results):
+                    continue
+                # http and https versions of a page are the same result.
+                dedupe_key = normalize_url(results[rank].url).split("://", 1)[-1]
+                if dedupe_key in seen:
+                    continue
+                seen.add(dedupe_key)
+                merged.append(results[rank])
+                if len(merged) == max_results:
+                    return merged
+        return merged
+
+    async def _cache_get(self, key: str) -> Optional[List[SearchResult]]:
+        if self.redis_client is None:
+            return None
+        try:
+            redis = await self.redis_client.connect()
+            raw = await redis.get(key)
+        except Exception as e:
+            logger.warning(f"Web search cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        return [SearchResult(**item) for item in json.loads(raw)]
+
+    async def _cache_set(self, key: str, results: List[SearchResult], ttl: int):
+        if self.redis_client is None or ttl <= 0:
+            return
+        raw = json.dumps([r.model_dump() for r in results], ensure_ascii=False)
+        try:
+            redis = await self.redis_client.connect()
+            await redis.setex(key, ttl, raw)
+        except Exception as e:
+            logger.warning(f"Web search cache write failed: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return asdict(self.stats)
@@ -1,8 +1,55 @@
-from app.services.web_search.base import WebSearchBase
+from typing import List, Optional
+import httpx
+from app.modules.web_search.base import SearchResult, WebSearchBase
+
 
 class TavilySearch(WebSearchBase):
-    query: str
-    max_results: int = 10
+    """
+    Search through the Tavily API.
+    """
+
+    endpoint = "https://api.tavily.com/search"
 
+    def __init__(
+        self,
+        api_key: str,
+        timeout: float = 3.0,
+        search_depth: str = "basic",
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Initialize the provider.
 
+        Args:
+            api_key (str): Tavily API key.
+            timeout (float): Seconds a search may take.
+            search_depth (str): "basic" or "advanced".
+            client (Optional[httpx.AsyncClient]): Shared HTTP client; one with
+                keep-alive connections is created if omitted.
+        """
+        super().__init__("tavily", timeout)
+        self.api_key = api_key
+        self.search_depth = search_depth
+        self.client = client or httpx.AsyncClient(timeout=timeout)
 
+    async def asearch(self, query: str, max_results: int = 10) -> List[SearchResult]:
+        response = await self.client.post(
+            self.endpoint,
+            json={
+                "api_key": self.api_key,
+                "query": query,
+                "max_results": max_results,
+                "search_depth": self.search_depth,
+            },
+        )
+        response.raise_for_status()
+        return [
+            SearchResult(
+                title=item.get("title", ""),
+                url=item["url"],
+                snippet=item.get("content", ""),
+                provider=self.name,
+                score=item.get("score"),
+            )
+            for item in response.json().get("results", [])[:max_results]
+        ]
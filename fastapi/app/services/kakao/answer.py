@@ -0,0 +1,68 @@
+import asyncio
+from typing import Optional
+from app.modules.llm_models.base import BaseLLMModel
+from app.modules.prompts.context import ContextBuilder
+from app.modules.vectorstores.base import SearchResult
+from app.modules.web_search.service import WebSearchService
+import logging
+
+logger = logging.getLogger(__name__)
+
+KAKAO_SYSTEM = (
+    "당신은 카카오톡 채널 상담 챗봇입니다. 참고 문서를 근거로 짧고 명확하게 답하세요. "
+    "문서에 없는 내용은 모른다고 답하고, 마크다운 문법은 쓰지 마세요."
+)
+
+
+class KakaoAnswerer:
+    """
+    Retrieval and generation behind the Kakao skill: web search results are
+    packed into a prompt with `ContextBuilder` and answered by the LLM.
+    """
+
+    def __init__(
+        self,
+        llm: BaseLLMModel,
+        web_search: Optional[WebSearchService] = None,
+        builder: Optional[ContextBuilder] = None,
+        max_results: int = 5,
+        search_timeout: float = 8.0,
+    ):
+        """
+        Initialize the answerer.
+
+        Args:
+            llm (BaseLLMModel): Answer model.
+            web_search (Optional[WebSearchService]): Retrieval; answers from the
+                model alone if omitted.
+            builder (Optional[ContextBuilder]): Prompt packer.
+            max_results (int): Search results put in the prompt at most.
+            search_timeout (float): Seconds after which the answer is generated
+                without search results.
+        """
+        self.llm = llm
+        self.web_search = web_search
+        self.builder = builder if builder is not None else ContextBuilder()
+        self.max_results = max_results
+        self.search_timeout = search_timeout
+
+    async def __call__(self, utterance: str) -> str:
+        chunks = []
+        if self.web_search is not None:
+            try:
+                results = await asyncio.wait_for(
+                    self.web_search.search(utterance, self.max_results),
+                    self.search_timeout,
+                )
+                chunks = [
+                    SearchResult(
+                        id=result.url,
+                        score=result.score or 0.0,
+                        metadata={"text": f"{result.title}\n{result.snippet}"},
+                    )
+                    for result in results
+                ]
+            except Exception as e:
+                logger.warning(f"Web search failed, answering without it: {e!r}")
+        packed = self.builder.build(utterance, chunks, system=KAKAO_SYSTEM)
+        return (await self.llm.agenerate(packed.prompt)).strip()
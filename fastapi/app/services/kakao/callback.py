@@ -0,0 +1,239 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Collection, Dict, List, Optional
+from urllib.parse import urlsplit
+import httpx
+from app.services.kakao.chat_schema import simple_text
+import logging
+
+logger = logging.getLogger(__name__)
+
+AnswerFn = Callable[[str], Awaitable[str]]
+
+FAILURE_TEXT = "죄송합니다. 답변을 준비하지 못했어요. 잠시 후 다시 질문해 주세요."
+
+
+def allowed_callback_url(url: str, hosts: Collection[str]) -> bool:
+    """
+    Whether `url` is an http(s) URL on one of `hosts`, given as `host` or
+    `host:port`, so a skill request cannot make the server post to any host.
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return False
+    if parts.scheme not in ("https", "http") or not parts.hostname:
+        return False
+    if parts.username is not None or parts.password is not None:
+        return False
+    host = parts.hostname.lower()
+    return (host if port is None else f"{host}:{port}") in hosts
+
+
+@dataclass
+class CallbackJob:
+    callback_url: str
+    utterance: str
+    user_id: str
+    received_at: float
+
+
+@dataclass
+class CallbackStats:
+    submitted: int = 0
+    rejected: int = 0
+    answered: int = 0
+    answer_failures: int = 0
+    delivered: int = 0
+    delivery_failures: int = 0
+    retries: int = 0
+    expired: int = 0
+
+
+class CallbackWorker:
+    """
+    Answers Kakao skill requests in callback mode. The skill endpoint queues a
+    job and acknowledges at once; `workers` tasks take jobs from the queue,
+    generate the answer and POST it to the job's callback URL.
+
+    - Concurrency is bounded by the number of workers, and the backlog by
+      `queue_size`: `submit` returns False when the queue is full so the
+      endpoint can answer inline instead.
+    - A callback URL is valid for about a minute after the request. Generation
+      is cut at `answer_timeout` and a failure message is posted instead, so the
+      user always gets a reply while the URL is still valid.
+    - Deliveries are retried on network errors and 5xx/429 responses with
+      exponential backoff, until `max_attempts` or `callback_deadline`. Other
+      4xx responses mean the URL was used or expired and are not retried.
+    - With `callback_hosts`, callbacks to any other host are refused.
+    """
+
+    def __init__(
+        self,
+        answer: AnswerFn,
+        workers: int = 8,
+        queue_size: int = 256,
+        answer_timeout: float = 45.0,
+        callback_deadline: float = 55.0,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        request_timeout: float = 5.0,
+        client: Optional[httpx.AsyncClient] = None,
+        callback_hosts: Optional[Collection[str]] = None,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            answer (AnswerFn): Generates the answer to an utterance.
+            workers (int): Jobs processed concurrently.
+            queue_size (int): Jobs waiting at most.
+            answer_timeout (float): Seconds from the request until generation
+                is abandoned.
+            callback_deadline (float): Seconds from the request after which the
+                callback URL is considered expired.
+            max_attempts (int): Delivery attempts per callback.
+            backoff (float): Delay before the first retry, doubled each retry.
+            request_timeout (float): Seconds per delivery attempt.
+            client (Optional[httpx.AsyncClient]): HTTP client, e.g. bound to a
+                mock server; one is created on `start` if omitted.
+            callback_hosts (Optional[Collection[str]]): Hosts callbacks may be
+                posted to, as `host` or `host:port`; any if omitted.
+        """
+        self.answer = answer
+        self.workers = workers
+        self.answer_timeout = answer_timeout
+        self.callback_deadline = callback_deadline
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.request_timeout = request_timeout
+        self.client = client
+        self._owns_client = client is None
+        self.callback_hosts = callback_hosts
+        self.stats = CallbackStats()
+        self._queue: "asyncio.Queue[CallbackJob]" = asyncio.Queue(maxsize=queue_size)
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        if self._tasks:
+            return
+        if self.client is None:
+            self.client = httpx.AsyncClient(timeout=self.request_timeout)
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"kakao-callback-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"Kakao callback worker started with {self.workers} workers")
+
+    async def stop(self, drain_timeout: float = 10.0):
+        """
+        Stop the workers, waiting up to `drain_timeout` seconds for queued jobs.
+        """
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Kakao callback worker stopped with {self._queue.qsize()} jobs queued"
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._owns_client and self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def submit(self, job: CallbackJob) -> bool:
+        """
+        Queue a job.
+
+        Returns:
+            bool: False if the worker is not running or its queue is full.
+        """
+        if not self._tasks:
+            self.stats.rejected += 1
+            return False
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.stats.rejected += 1
+            return False
+        self.stats.submitted += 1
+        return True
+
+    async def join(self):
+        await self._queue.join()
+
+    async def _run(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self.process(job)
+            except Exception as e:
+                logger.error(f"Kakao callback job failed: {e!r}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def process(self, job: CallbackJob):
+        remaining = self.answer_timeout - (time.time() - job.received_at)
+        try:
+            if remaining <= 0:
+                raise asyncio.TimeoutError
+            text = await asyncio.wait_for(self.answer(job.utterance), remaining)
+            self.stats.answered += 1
+        except Exception as e:
+            self.stats.answer_failures += 1
+            logger.warning(f"Answer for Kakao user {job.user_id} failed: {e!r}")
+            text = FAILURE_TEXT
+        await self.deliver(job, simple_text(text).model_dump(exclude_none=True))
+
+    async def deliver(self, job: CallbackJob, payload: Dict) -> bool:
+        if self.callback_hosts is not None and not allowed_callback_url(
+            job.callback_url, self.callback_hosts
+        ):
+            self.stats.delivery_failures += 1
+            logger.error(
+                f"Refused callback for Kakao user {job.user_id} to another host"
+            )
+            return False
+        for attempt in range(1, self.max_attempts + 1):
+            if time.time() - job.received_at > self.callback_deadline:
+                self.stats.expired += 1
+                logger.warning(f"Callback for Kakao user {job.user_id} expired")
+                return False
+            try:
+                response = await self.client.post(
+                    job.callback_url, json=payload, timeout=self.request_timeout
+                )
+                if response.status_code < 400:
+                    self.stats.delivered += 1
+                    return True
+                retryable = response.status_code >= 500 or response.status_code == 429
+                error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                retryable = True
+                error = repr(e)
+            if not retryable or attempt == self.max_attempts:
+                break
+            self.stats.retries += 1
+            delay = self.backoff * 2 ** (attempt - 1) * (1 + random.uniform(0, 0.1))
+            logger.info(
+                f"Callback attempt {attempt} for Kakao user {job.user_id} failed "
+                f"({error}), retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+        self.stats.delivery_failures += 1
+        logger.error(f"Callback for Kakao user {job.user_id} failed: {error}")
+        return False
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(asdict(self.stats), queued=self._queue.qsize())
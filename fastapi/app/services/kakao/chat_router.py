@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+import hmac
+import time
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.chat_session.chat_session_crud import (
     create_chat_session,
     get_chat_session,
@@ -12,20 +15,35 @@ from app.chat_session.chat_session_schema import (
     ChatSessionUpdate,
     ChatSessionInDB,
 )
+from app.configs.kakao import get_callback_hosts, get_callback_worker
+from app.configs.settings import settings
 from app.db.session import get_db
+from app.services.kakao.callback import (
+    CallbackJob,
+    CallbackWorker,
+    FAILURE_TEXT,
+    allowed_callback_url,
+)
+from app.services.kakao.chat_schema import (
+    KakaoSkillRequest,
+    KakaoSkillResponse,
+    callback_ack,
+    simple_text,
+)
 from app.user.auth import get_current_active_user, get_current_user
 import logging
-from typing import List
-import logging
+from typing import List, Optional
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+CALLBACK_WAIT_TEXT = "답변을 준비하고 있어요. 잠시만 기다려 주세요!"
+
 
 @router.post("/", response_model=ChatSessionInDB)
-def create_chat_session_route(
+async def create_chat_session_route(
     session_id: str = 1,  # room_id가 세션 ID로 사용됨
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
     logger.info(
@@ -33,10 +51,79 @@ def create_chat_session_route(
     )
 
     # Check if session for the room already exists
-    existing_session = get_chat_session(db, session_id)
+    existing_session = await get_chat_session(db, session_id)
     if existing_session:
+        if existing_session.user_id != current_user.id:
+            raise HTTPException(
+                status_code=403, detail="Not authorized to access this chat session"
+            )
         return existing_session
 
     # Create new session if it doesn't exist
     chat_session = ChatSessionCreate(id=session_id, user_id=current_user.id)
-    return create_chat_session(db, chat_session)
+    return await create_chat_session(db, chat_session)
+
+
+def verify_skill_request(payload: KakaoSkillRequest, secret: Optional[str]):
+    """
+    Check that a skill request comes from our bot: its bot id must be
+    KAKAO_BOT_ID and its X-Kakao-Skill-Secret header KAKAO_SKILL_SECRET, for
+    whichever of the two is set. With neither set the skill is disabled.
+    """
+    if not settings.KAKAO_BOT_ID and not settings.KAKAO_SKILL_SECRET:
+        raise HTTPException(status_code=503, detail="Kakao skill is not configured")
+    if settings.KAKAO_SKILL_SECRET and not hmac.compare_digest(
+        (secret or "").encode(), settings.KAKAO_SKILL_SECRET.encode()
+    ):
+        logger.warning("Kakao skill request with a wrong secret")
+        raise HTTPException(status_code=403, detail="Invalid skill secret")
+    if settings.KAKAO_BOT_ID and (
+        payload.bot is None or payload.bot.id != settings.KAKAO_BOT_ID
+    ):
+        logger.warning("Kakao skill request from an unknown bot")
+        raise HTTPException(status_code=403, detail="Unknown bot")
+
+
+@router.post(
+    "/skill", response_model=KakaoSkillResponse, response_model_exclude_none=True
+)
+async def kakao_skill_route(
+    payload: KakaoSkillRequest,
+    x_kakao_skill_secret: Optional[str] = Header(None),
+    worker: CallbackWorker = Depends(get_callback_worker),
+):
+    """
+    Kakao i Open Builder skill. Kakao waits about 5 seconds for a reply, so
+    blocks with callback enabled are acknowledged at once and answered through
+    the callback URL by the background worker. Without a callback URL, or with
+    the worker saturated, the answer is generated inline within
+    KAKAO_INLINE_TIMEOUT.
+
+    Callback URLs must be on KAKAO_CALLBACK_HOSTS.
+    """
+    verify_skill_request(payload, x_kakao_skill_secret)
+    user_request = payload.userRequest
+    if user_request.callbackUrl and not allowed_callback_url(
+        user_request.callbackUrl, get_callback_hosts()
+    ):
+        logger.warning("Kakao skill request with a foreign callback URL")
+        raise HTTPException(status_code=400, detail="Invalid callback URL")
+    if user_request.callbackUrl:
+        job = CallbackJob(
+            callback_url=user_request.callbackUrl,
+            utterance=user_request.utterance,
+            user_id=user_request.user.id,
+            received_at=time.time(),
+        )
+        if worker.submit(job):
+            return callback_ack(CALLBACK_WAIT_TEXT)
+        logger.warning("Kakao callback queue is full, answering inline")
+
+    try:
+        text = await asyncio.wait_for(
+            worker.answer(user_request.utterance), settings.KAKAO_INLINE_TIMEOUT
+        )
+    except Exception as e:
+        logger.warning(f"Inline Kakao answer failed: {e!r}")
+        text = FAILURE_TEXT
+    return simple_text(text)
@@ -0,0 +1,63 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, Optional
+
+# simpleText 말풍선에 들어가는 최대 글자 수
+MAX_SIMPLE_TEXT = 1000
+
+
+class KakaoUser(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    id: str
+    type: str = "botUserKey"
+    properties: Dict[str, Any] = {}
+
+
+class KakaoUserRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    utterance: str
+    user: KakaoUser
+    callbackUrl: Optional[str] = None
+    timezone: str = "Asia/Seoul"
+    lang: Optional[str] = None
+    params: Dict[str, Any] = {}
+
+
+class KakaoBot(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    id: str
+    name: Optional[str] = None
+
+
+class KakaoSkillRequest(BaseModel):
+    """
+    Skill payload sent by Kakao i Open Builder. Only the fields the server
+    uses are declared; the rest (`intent`, `action`, ...) are ignored.
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+    userRequest: KakaoUserRequest
+    bot: Optional[KakaoBot] = None
+
+
+class KakaoSkillResponse(BaseModel):
+    version: str = "2.0"
+    template: Optional[Dict[str, Any]] = None
+    useCallback: Optional[bool] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+def simple_text(text: str) -> KakaoSkillResponse:
+    if len(text) > MAX_SIMPLE_TEXT:
+        text = text[: MAX_SIMPLE_TEXT - 1] + "…"
+    return KakaoSkillResponse(template={"outputs": [{"simpleText": {"text": text}}]})
+
+
+def callback_ack(text: str) -> KakaoSkillResponse:
+    """
+    Immediate reply telling Kakao the answer will be posted to the callback URL.
+    """
+    return KakaoSkillResponse(useCallback=True, data={"text": text})
@@ -0,0 +1,143 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+
+class MockKakaoServer:
+    """
+    Stands in for the Kakao platform when testing the skill locally: builds
+    skill payloads with a callback URL and receives the callbacks.
+
+    Callback URLs are single-use like Kakao's; a second delivery gets a 400.
+    The first `fail_first` attempts per URL get `fail_status`, to exercise
+    retries.
+
+    In-process, with no network:
+        server = MockKakaoServer()
+        worker = CallbackWorker(answer, client=server.client())
+
+    Standalone, for a running API started with
+    KAKAO_CALLBACK_HOSTS=localhost:8090 and KAKAO_BOT_ID=mock-bot:
+        python -m app.services.kakao.mock_server
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://mock-kakao",
+        fail_first: int = 0,
+        fail_status: int = 500,
+        latency: float = 0.0,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            base_url (str): Base of the callback URLs it hands out.
+            fail_first (int): Failed attempts per callback URL before accepting.
+            fail_status (int): Status of those failed attempts.
+            latency (float): Seconds each callback request takes.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.latency = latency
+        self.received: Dict[str, Dict[str, Any]] = {}
+        self.attempts: Dict[str, int] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+        self.app = FastAPI(title="Mock Kakao")
+        self.app.post("/callback/{token}")(self._callback)
+        self.app.get("/callbacks")(self._callbacks)
+
+    async def _callback(self, token: str, payload: Dict[str, Any]):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.attempts[token] = self.attempts.get(token, 0) + 1
+        if self.attempts[token] <= self.fail_first:
+            return JSONResponse({"status": "FAIL"}, status_code=self.fail_status)
+        if token in self.received:
+            return JSONResponse(
+                {"status": "FAIL", "message": "callback already used"},
+                status_code=400,
+            )
+        self.received[token] = payload
+        self._event(token).set()
+        return {
+            "taskId": token,
+            "status": "SUCCESS",
+            "message": "OK",
+            "timestamp": int(time.time() * 1000),
+        }
+
+    async def _callbacks(self) -> Dict[str, Dict[str, Any]]:
+        return self.received
+
+    def _event(self, token: str) -> asyncio.Event:
+        if token not in self._events:
+            self._events[token] = asyncio.Event()
+        return self._events[token]
+
+    def callback_url(self, token: Optional[str] = None) -> str:
+        return f"{self.base_url}/callback/{token or uuid.uuid4().hex}"
+
+    def skill_request(
+        self,
+        utterance: str,
+        user_id: str = "mock-user",
+        callback: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        A skill payload as Kakao i Open Builder sends it.
+        """
+        user_request: Dict[str, Any] = {
+            "timezone": "Asia/Seoul",
+            "params": {"ignoreMe": "true"},
+            "block": {"id": "mock-block", "name": "mock"},
+            "utterance": utterance,
+            "lang": "ko",
+            "user": {"id": user_id, "type": "botUserKey", "properties": {}},
+        }
+        if callback:
+            user_request["callbackUrl"] = self.callback_url()
+        return {
+            "intent": {"id": "mock-intent", "name": "mock"},
+            "userRequest": user_request,
+            "bot": {"id": "mock-bot", "name": "mock"},
+            "action": {"name": "mock", "params": {}, "detailParams": {}},
+        }
+
+    def client(self) -> httpx.AsyncClient:
+        """
+        HTTP client whose requests are served by this server in-process.
+        """
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.app), base_url=self.base_url
+        )
+
+    async def wait_for(
+        self, callback_url: str, timeout: float = 10.0
+    ) -> Dict[str, Any]:
+        """
+        Wait until a callback URL has received its answer.
+        """
+        token = callback_url.rsplit("/", 1)[-1]
+        await asyncio.wait_for(self._event(token).wait(), timeout)
+        return self.received[token]
+
+    def texts(self) -> List[str]:
+        return [
+            output["simpleText"]["text"]
+            for payload in self.received.values()
+            for output in payload.get("template", {}).get("outputs", [])
+            if "simpleText" in output
+        ]
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    server = MockKakaoServer(base_url="http://localhost:8090")
+    uvicorn.run(server.app, host="0.0.0.0", port=8090)
@@ -0,0 +1,280 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+from app.services.multiagent.checkpoint import CheckpointerBase
+from app.services.multiagent.node import Node, NodeError
+from app.services.multiagent.state import Reducer, State
+from app.services.multiagent.utils import (
+    NodeRun,
+    NodeStatus,
+    critical_path,
+    format_runs,
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class GraphError(ValueError):
+    """
+    The nodes do not form a valid graph.
+    """
+
+
+@dataclass
+class GraphRun:
+    state: State
+    runs: Dict[str, NodeRun]
+    seconds: float
+    critical_path: List[str] = field(default_factory=list)
+    # Nodes restored from a checkpoint instead of run.
+    resumed: List[str] = field(default_factory=list)
+
+    @property
+    def critical_seconds(self) -> float:
+        """
+        Time spent running critical path nodes; the rest of `seconds` is
+        scheduling overhead and queueing.
+        """
+        return sum(self.runs[name].seconds for name in self.critical_path)
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.runs)} nodes in {self.seconds:.3f}s, critical path "
+            f"{' -> '.join(self.critical_path)} ({self.critical_seconds:.3f}s)\n"
+            + format_runs(self.runs, self.critical_path)
+        )
+
+
+class Graph:
+    """
+    A set of nodes wired by the state keys they read and write. A node depends
+    on every node producing one of its inputs, plus those listed in its `after`.
+
+    `arun` starts each node as soon as its dependencies are done, so independent
+    nodes (e.g. web search and vector retrieval) run concurrently on the event
+    loop. Outputs are merged into an immutable `State` as each node finishes;
+    a node sees the state as it was when it started.
+
+    Several nodes may write the same key only if it has a reducer, which then
+    combines their outputs in completion order.
+
+    With a checkpointer, runs given a `run_id` record each node's outputs as it
+    finishes; running the same `run_id` again replays them and only runs the
+    nodes that had not finished.
+    """
+
+    def __init__(
+        self,
+        nodes: Iterable[Node],
+        reducers: Optional[Mapping[str, Reducer]] = None,
+        max_concurrency: Optional[int] = None,
+        checkpointer: Optional[CheckpointerBase] = None,
+    ):
+        """
+        Initialize the graph.
+
+        Args:
+            nodes (Iterable[Node]): The nodes, names unique.
+            reducers (Optional[Mapping[str, Reducer]]): Per-key merge functions,
+                see `State.merge`.
+            max_concurrency (Optional[int]): Nodes running at once; unbounded by
+                default.
+            checkpointer (Optional[CheckpointerBase]): Stores runs with a
+                `run_id` so they can resume.
+        """
+        self.nodes: Dict[str, Node] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise GraphError(f"Duplicate node name '{node.name}'.")
+            self.nodes[node.name] = node
+        self.reducers = dict(reducers or {})
+        self.max_concurrency = max_concurrency
+        self.checkpointer = checkpointer
+
+        self.producers: Dict[str, List[str]] = {}
+        for node in self.nodes.values():
+            for key in node.outputs:
+                self.producers.setdefault(key, []).append(node.name)
+        for key, names in self.producers.items():
+            if len(names) > 1 and key not in self.reducers:
+                raise GraphError(
+                    f"Key '{key}' is written by {names} and has no reducer."
+                )
+
+        self.dependencies: Dict[str, Set[str]] = {}
+        for node in self.nodes.values():
+            deps = set(node.after)
+            for key in node.inputs:
+                deps.update(self.producers.get(key, ()))
+            deps.discard(node.name)
+            unknown = deps - self.nodes.keys()
+            if unknown:
+                raise GraphError(f"Node '{node.name}' waits for unknown {unknown}.")
+            self.dependencies[node.name] = deps
+        self.dependents: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                self.dependents[dep].append(name)
+        self.order = self._topological_order()
+        # Inputs no node produces; they must be in the initial state.
+        self.entry_keys = frozenset(
+            key
+            for node in self.nodes.values()
+            for key in node.inputs
+            if key not in self.producers
+        )
+
+    def _topological_order(self) -> List[str]:
+        remaining = {name: len(deps) for name, deps in self.dependencies.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for dependent in self.dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) < len(self.nodes):
+            cycle = sorted(name for name, count in remaining.items() if count)
+            raise GraphError(f"Nodes {cycle} form a cycle.")
+        return order
+
+    async def arun(
+        self,
+        initial: Optional[Mapping[str, Any]] = None,
+        run_id: Optional[str] = None,
+    ) -> GraphRun:
+        """
+        Run every node once.
+
+        Args:
+            initial (Optional[Mapping[str, Any]]): Initial state, holding at
+                least `entry_keys`. Ignored when resuming.
+            run_id (Optional[str]): Checkpoint id; resumes the run if a
+                checkpoint exists. Requires a checkpointer.
+
+        Returns:
+            GraphRun: The final state and per-node timings.
+
+        Raises:
+            NodeError: A node without fallback failed; running nodes are
+                cancelled first.
+        """
+        checkpointer = self.checkpointer if run_id is not None else None
+        if run_id is not None and checkpointer is None:
+            raise ValueError("run_id requires a graph with a checkpointer.")
+        checkpoint = await checkpointer.aload(run_id) if checkpointer else None
+        if checkpoint is not None:
+            initial = checkpoint.initial
+        state = initial if isinstance(initial, State) else State(initial)
+        missing = self.entry_keys - set(state)
+        if missing:
+            raise KeyError(f"Initial state is missing {sorted(missing)}")
+
+        start = time.perf_counter()
+        semaphore = (
+            asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        )
+        waiting = {name: len(deps) for name, deps in self.dependencies.items()}
+        resumed = []
+        if checkpoint is not None:
+            for name, outputs in checkpoint.deltas:
+                if name not in self.nodes:
+                    raise GraphError(f"Checkpoint {run_id} has unknown node '{name}'.")
+                state = state.merge(outputs, self.reducers)
+                resumed.append(name)
+                for dependent in self.dependents[name]:
+                    waiting[dependent] -= 1
+            logger.info(f"Resuming run {run_id} after {len(resumed)} nodes")
+        elif checkpointer is not None:
+            checkpointer.start(run_id, state)
+        done_names = set(resumed)
+        running: Dict[asyncio.Task, str] = {}
+        runs: Dict[str, NodeRun] = {}
+
+        def launch(name: str) -> None:
+            ready = time.perf_counter() - start
+            task = asyncio.create_task(
+                self._execute(self.nodes[name], state, semaphore, start, ready),
+                name=f"node:{name}",
+            )
+            running[task] = name
+
+        for name in self.order:
+            if waiting[name] == 0 and name not in done_names:
+                launch(name)
+        try:
+            while running:
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    name = running.pop(task)
+                    outputs, run, error = task.result()
+                    runs[name] = run
+                    if error is not None:
+                        fallback = self.nodes[name].fallback
+                        if fallback is None:
+                            raise error
+                        logger.warning(f"{error}; using fallback outputs")
+                        run.status = NodeStatus.FALLBACK
+                        outputs = fallback
+                    state = state.merge(outputs, self.reducers)
+                    if checkpointer is not None:
+                        checkpointer.save(run_id, name, outputs)
+                    for dependent in self.dependents[name]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0 and dependent not in done_names:
+                            launch(dependent)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            if checkpointer is not None:
+                await checkpointer.aflush()
+
+        result = GraphRun(
+            state=state,
+            runs=runs,
+            seconds=time.perf_counter() - start,
+            critical_path=critical_path(runs, self.dependencies),
+            resumed=resumed,
+        )
+        logger.debug(result.summary())
+        return result
+
+    @staticmethod
+    async def _execute(
+        node: Node,
+        state: State,
+        semaphore: Optional[asyncio.Semaphore],
+        start: float,
+        ready: float,
+    ) -> Tuple[Dict[str, Any], NodeRun, Optional[NodeError]]:
+        if semaphore is not None:
+            await semaphore.acquire()
+        started = time.perf_counter() - start
+        try:
+            outputs, attempts = await node.arun(state)
+            error = None
+            status = NodeStatus.OK
+        except NodeError as e:
+            outputs, attempts, error = {}, e.attempts, e
+            status = NodeStatus.FAILED
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+        run = NodeRun(
+            name=node.name,
+            status=status,
+            attempts=attempts,
+            ready=ready,
+            started=started,
+            finished=time.perf_counter() - start,
+            error=repr(error.error) if error else None,
+        )
+        return outputs, run, error
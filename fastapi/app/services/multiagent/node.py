@@ -1,3 +1,184 @@
-from app.services.web_search.tavily_search import TavilySearch
+import asyncio
+import inspect
+import random
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+import logging
 
+logger = logging.getLogger(__name__)
 
+NodeFunc = Callable[..., Any]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How often a node is retried, and on which errors. Timeouts count as errors,
+    except for plain-function nodes (see `Node`).
+
+    The delay before attempt n+1 is `backoff * multiplier ** (n - 1)`, capped at
+    `max_backoff`, with up to `jitter` of it added at random.
+    """
+
+    max_attempts: int = 1
+    backoff: float = 0.1
+    multiplier: float = 2.0
+    max_backoff: float = 2.0
+    jitter: float = 0.1
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.backoff * self.multiplier ** (attempt - 1), self.max_backoff)
+        return delay * (1 + random.uniform(0, self.jitter))
+
+
+class NodeError(Exception):
+    """
+    A node failed on its last attempt.
+    """
+
+    def __init__(self, node: str, attempts: int, error: BaseException):
+        super().__init__(f"Node '{node}' failed after {attempts} attempt(s): {error!r}")
+        self.node = node
+        self.attempts = attempts
+        self.error = error
+
+
+class Node:
+    """
+    One step of a graph. A node reads the state keys it declares in `inputs`,
+    passed to `func` as keyword arguments, and returns a dict of the keys it
+    declares in `outputs`. Nodes only see the inputs they declare, so the graph
+    can run every node whose inputs are ready at the same time.
+
+    `func` may be a coroutine function; a plain function runs in a worker thread
+    so it does not block the other nodes. A thread cannot be cancelled: a plain
+    function that times out keeps running in the background, so it is not
+    retried, and retries cannot pile up threads in the default executor.
+
+    A result that is not a dict of declared outputs is a bug in the node, not a
+    transient failure: it raises `TypeError` or `KeyError` at once, without
+    retries or fallback.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: NodeFunc,
+        inputs: Sequence[str] = (),
+        outputs: Sequence[str] = (),
+        after: Sequence[str] = (),
+        timeout: Optional[float] = None,
+        retry: Optional[RetryPolicy] = None,
+        fallback: Optional[Mapping[str, Any]] = None,
+    ):
+        """
+        Initialize the node.
+
+        Args:
+            name (str): Unique name in its graph.
+            func (NodeFunc): Called with the inputs as keyword arguments.
+            inputs (Sequence[str]): State keys the node reads.
+            outputs (Sequence[str]): State keys the node writes.
+            after (Sequence[str]): Nodes to wait for without reading their
+                outputs, e.g. for side effects.
+            timeout (Optional[float]): Seconds per attempt; None waits forever.
+            retry (Optional[RetryPolicy]): Retry policy; one attempt by default.
+            fallback (Optional[Mapping[str, Any]]): Outputs used when every
+                attempt failed. Without it the failure stops the run.
+        """
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.after = tuple(after)
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.fallback = dict(fallback) if fallback is not None else None
+        self._is_async = inspect.iscoroutinefunction(func)
+
+    def __repr__(self) -> str:
+        return f"Node({self.name!r}, inputs={self.inputs}, outputs={self.outputs})"
+
+    def _call(self, kwargs: Dict[str, Any]) -> Awaitable[Any]:
+        if self._is_async:
+            return self.func(**kwargs)
+        return asyncio.to_thread(self.func, **kwargs)
+
+    def _check(self, result: Any) -> Dict[str, Any]:
+        if result is None and not self.outputs:
+            return {}
+        if not isinstance(result, Mapping):
+            raise TypeError(
+                f"Node '{self.name}' returned {type(result).__name__}, expected a dict."
+            )
+        undeclared = result.keys() - set(self.outputs)
+        if undeclared:
+            raise KeyError(
+                f"Node '{self.name}' returned undeclared outputs: {sorted(undeclared)}"
+            )
+        return dict(result)
+
+    async def arun(self, state: Mapping[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        Run the node with its timeout and retry policy.
+
+        Args:
+            state (Mapping[str, Any]): State holding every input.
+
+        Returns:
+            Tuple[Dict[str, Any], int]: The outputs and the number of attempts.
+        """
+        kwargs = {key: state[key] for key in self.inputs}
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = await asyncio.wait_for(self._call(kwargs), self.timeout)
+            except self.retry.retry_on as e:
+                # The timed-out thread is still running; another attempt would
+                # start a second one next to it.
+                thread_timed_out = not self._is_async and isinstance(
+                    e, asyncio.TimeoutError
+                )
+                if attempt >= self.retry.max_attempts or thread_timed_out:
+                    raise NodeError(self.name, attempt, e) from e
+                delay = self.retry.delay(attempt)
+                logger.warning(
+                    f"Node '{self.name}' attempt {attempt} failed ({e!r}), "
+                    f"retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                continue
+            return self._check(result), attempt
+
+
+def node(
+    inputs: Sequence[str] = (),
+    outputs: Sequence[str] = (),
+    name: Optional[str] = None,
+    **options: Any,
+) -> Callable[[NodeFunc], Node]:
+    """
+    Decorator turning a function into a `Node`, named after the function.
+
+    Example:
+        @node(inputs=["question"], outputs=["documents"], timeout=3.0)
+        async def retrieve(question):
+            return {"documents": await retriever.aretrieve(question)}
+    """
+
+    def decorator(func: NodeFunc) -> Node:
+        return Node(name or func.__name__, func, inputs, outputs, **options)
+
+    return decorator
@@ -0,0 +1,102 @@
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+Reducer = Callable[[Any, Any], Any]
+
+# Layers kept before a state is flattened into one dict.
+MAX_DEPTH = 8
+
+
+class State(Mapping[str, Any]):
+    """
+    Immutable mapping shared between graph nodes.
+
+    `merge` returns a new state holding only the updated keys and a reference to
+    the previous state, so merging k keys costs O(k) and never copies the
+    existing values; older states stay valid and unchanged. Lookups walk the
+    layers, and a state deeper than `MAX_DEPTH` layers is flattened once,
+    which keeps reads O(1) amortized.
+
+    Values are shared, not copied: nodes must not mutate what they read.
+    """
+
+    __slots__ = ("_values", "_parent", "_depth", "_length")
+
+    def __init__(self, values: Optional[Mapping[str, Any]] = None):
+        self._values: Dict[str, Any] = dict(values or {})
+        self._parent: Optional[State] = None
+        self._depth = 0
+        self._length = len(self._values)
+
+    @classmethod
+    def _layer(cls, parent: "State", updates: Dict[str, Any]) -> "State":
+        state = cls.__new__(cls)
+        state._values = updates
+        state._parent = parent
+        state._depth = parent._depth + 1
+        state._length = parent._length + sum(1 for key in updates if key not in parent)
+        if state._depth > MAX_DEPTH:
+            state._values = state.to_dict()
+            state._parent = None
+            state._depth = 0
+        return state
+
+    def __getitem__(self, key: str) -> Any:
+        state = self
+        while state is not None:
+            if key in state._values:
+                return state._values[key]
+            state = state._parent
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        state = self
+        while state is not None:
+            if key in state._values:
+                return True
+            state = state._parent
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"State({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        layers = []
+        state = self
+        while state is not None:
+            layers.append(state._values)
+            state = state._parent
+        merged: Dict[str, Any] = {}
+        for values in reversed(layers):
+            merged.update(values)
+        return merged
+
+    def merge(
+        self,
+        updates: Mapping[str, Any],
+        reducers: Optional[Mapping[str, Reducer]] = None,
+    ) -> "State":
+        """
+        Return a new state with `updates` applied.
+
+        Args:
+            updates (Mapping[str, Any]): New values by key.
+            reducers (Optional[Mapping[str, Reducer]]): Per-key functions
+                combining the current and the new value, e.g. `operator.add` to
+                append to a list. Keys without one are overwritten.
+
+        Returns:
+            State: The new state; `self` is unchanged.
+        """
+        if not updates:
+            return self
+        values = dict(updates)
+        for key, reducer in (reducers or {}).items():
+            if key in values and key in self:
+                values[key] = reducer(self[key], values[key])
+        return State._layer(self, values)
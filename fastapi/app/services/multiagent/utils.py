@@ -0,0 +1,77 @@
+import enum
+from dataclasses import dataclass
+from typing import Iterable, List, Mapping, Optional
+
+
+class NodeStatus(str, enum.Enum):
+    OK = "ok"
+    FALLBACK = "fallback"
+    FAILED = "failed"
+
+
+@dataclass
+class NodeRun:
+    """
+    Timing of one node in a run, in seconds since the run started. `ready` is
+    when its dependencies were done, `started` when it got a concurrency slot.
+    """
+
+    name: str
+    status: NodeStatus
+    attempts: int
+    ready: float
+    started: float
+    finished: float
+    error: Optional[str] = None
+
+    @property
+    def seconds(self) -> float:
+        return self.finished - self.started
+
+    @property
+    def queued(self) -> float:
+        return self.started - self.ready
+
+
+def critical_path(
+    runs: Mapping[str, NodeRun], dependencies: Mapping[str, Iterable[str]]
+) -> List[str]:
+    """
+    The chain of nodes that determined the length of a run.
+
+    Starting from the node that finished last, each step goes to the dependency
+    that finished last, i.e. the one the node was actually waiting for. Making
+    any node off this path faster does not shorten the run.
+
+    Args:
+        runs (Mapping[str, NodeRun]): Node runs by name.
+        dependencies (Mapping[str, Iterable[str]]): Dependencies by node name.
+
+    Returns:
+        List[str]: Node names, first to last.
+    """
+    if not runs:
+        return []
+    path = [max(runs.values(), key=lambda run: run.finished).name]
+    while True:
+        finished = [dep for dep in dependencies.get(path[-1], ()) if dep in runs]
+        if not finished:
+            break
+        path.append(max(finished, key=lambda dep: runs[dep].finished))
+    path.reverse()
+    return path
+
+
+def format_runs(runs: Mapping[str, NodeRun], path: Iterable[str] = ()) -> str:
+    """
+    A table of node timings in start order, critical path nodes marked with *.
+    """
+    on_path = set(path)
+    lines = [f"  {'node':<24} {'status':<9} {'start':>8} {'secs':>8} {'queued':>8}"]
+    for run in sorted(runs.values(), key=lambda run: run.started):
+        mark = "*" if run.name in on_path else " "
+        lines.append(
+            f"{mark} {run.name:<24} {run.status.value:<9} {run.started:>8.3f} "
+            f"{run.seconds:>8.3f} {run.queued:>8.3f}"
+        )
+    return "\n".join(lines)
@@ -4,12 +4,14 @@ from jose import JWTError, jwt
 from redis.asyncio import Redis
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.configs import settings
-from app.user.user_crud import get_user_by_social_id
+from app.configs.settings import settings
+from app.user.user_cache import UserCache
+from app.user.user_crud import get_cached_user_by_social_id
 from app.db.session import get_db
 from app.user.token_schema import TokenPayload
 from app.user.user_model import User
 from app.configs.redis import get_redis
+from app.configs.user_cache import get_user_cache
 from app.user.security import (
     create_access_token,
     create_refresh_token,
@@ -27,6 +29,7 @@ async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme),
     redis: Redis = Depends(get_redis),
+    cache: UserCache = Depends(get_user_cache),
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,7 +43,7 @@ async def get_current_user(
         token_data = TokenPayload(**payload)
 
         if (token_data.exp - datetime.now(timezone.utc)) < timedelta(
-            settings.ACCESS_TOKEN_PREEMPTIVE_REFRESH_MINUTES
+            minutes=settings.ACCESS_TOKEN_PREEMPTIVE_REFRESH_MINUTES
         ):
             refresh_token = await redis.get(f"refresh_token:{token_data.sub}")
             if refresh_token:
@@ -50,8 +53,8 @@ async def get_current_user(
                 new_refresh_token = create_refresh_token(
                     token_data.sub, token_data.provider
                 )
-                user = await get_user_by_social_id(
-                    db, social_id=token_data.sub, provider=token_data.provider
+                user = await get_cached_user_by_social_id(
+                    db, token_data.sub, token_data.provider, cache
                 )
                 if user:
                     await save_tokens_to_redis(
@@ -70,8 +73,9 @@ async def get_current_user(
     except (jwt.JWTError, ValidationError):
         raise credentials_exception
 
-    user = await get_user_by_social_id(
-        db, social_id=token_data.sub, provider=token_data.provider
+    # 대부분의 요청은 DB 조회 없이 캐시에서 사용자를 가져온다
+    user = await get_cached_user_by_social_id(
+        db, token_data.sub, token_data.provider, cache
     )
     if user is None:
         raise credentials_exception
@@ -3,10 +3,12 @@ from redis.asyncio import Redis
 from typing import Optional, Tuple, Dict
 from fastapi import HTTPException
 from pydantic import ValidationError
-from app.configs import settings
+from app.configs.settings import settings
+from app.configs.user_cache import user_cache
 from app.user.user_crud import get_user_by_social_id, create_user
 from app.user.user_schema import UserCreate
 from app.user.token_schema import TokenPayload
+from app.user.user_cache import UserCache
 from app.user.user_model import User, Gender, SocialProvider
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta, timezone
@@ -55,11 +57,15 @@ async def logout(user_id: str, redis: Redis):
     await delete_tokens_from_redis(redis, user_id)
 
 
-async def update_last_login(db: AsyncSession, user: User):
+async def update_last_login(
+    db: AsyncSession, user: User, cache: Optional[UserCache] = None
+):
     user.last_login = datetime.now()
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    if cache is not None:
+        await cache.invalidate(user.social_provider, user.social_id)
 
 
 def create_access_token(
@@ -160,7 +166,7 @@ async def authenticate_user(
 ) -> Tuple[User, Dict]:
     user = await get_user_by_social_id(db, social_id, provider=provider)
     if user:
-        await update_last_login(db, user)
+        await update_last_login(db, user, user_cache)
     else:
         user_create = UserCreate(
             social_id=social_id, social_provider=provider, **user_data
@@ -0,0 +1,205 @@
+import asyncio
+import enum
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+from app.configs.redis import RedisClient
+from app.db.serialization import pack, unpack
+from app.user.user_model import User
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UserCacheStats:
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    # 다른 워커가 보낸 무효화 메시지
+    remote_invalidations: int = 0
+    errors: int = 0
+
+
+def dump_user(user: User) -> Dict[str, Any]:
+    """
+    Column values of a user as plain data.
+    """
+    data = {}
+    for column in User.__table__.columns:
+        value = getattr(user, column.key)
+        if isinstance(value, enum.Enum):
+            value = value.value
+        elif isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        data[column.key] = value
+    return data
+
+
+def load_user(data: Dict[str, Any]) -> User:
+    """
+    A detached `User` from `dump_user` data. It is not attached to a database
+    session; load the user again to change it.
+    """
+    values = {}
+    for column in User.__table__.columns:
+        value = data.get(column.key)
+        if value is not None:
+            kind = column.type.python_type
+            if kind in (date, datetime):
+                value = kind.fromisoformat(value)
+            elif issubclass(kind, enum.Enum):
+                value = kind(value)
+        values[column.key] = value
+    return User(**values)
+
+
+class UserCache:
+    """
+    Two-level cache of users by (provider, social_id), so authenticating a
+    request does not query the database.
+
+    - An in-process LRU answers first, for `local_ttl` seconds per entry.
+    - Redis is shared by all workers and keeps users for `ttl` seconds.
+    - `invalidate` deletes the Redis entry and publishes the key; every worker
+      listening (`start`) drops its local copy. Invalidations missed while the
+      listener reconnects are bounded by `local_ttl`, so keep it short.
+    - A request that read the database just before an update can store the
+      old row again; `ttl` bounds how long it is served.
+
+    Each lookup returns a new detached `User`, so callers may change it
+    without affecting the cache. Redis errors are logged and treated as
+    misses.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        ttl: int = 60,
+        local_ttl: float = 10.0,
+        max_entries: int = 10000,
+        namespace: str = "user_cache",
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_client (RedisClient): Redis connection.
+            ttl (int): Seconds a user is kept in Redis.
+            local_ttl (float): Seconds a user is kept in process.
+            max_entries (int): Users kept in process, least recently used
+                evicted.
+            namespace (str): Prefix of the Redis keys and channel.
+        """
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.channel = f"{namespace}:invalidate"
+        self.stats = UserCacheStats()
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+
+    def key(self, provider: Any, social_id: str) -> str:
+        provider = getattr(provider, "value", provider)
+        return f"{self.namespace}:{provider}:{social_id}"
+
+    async def get(self, provider: Any, social_id: str) -> Optional[User]:
+        key = self.key(provider, social_id)
+        entry = self._local.get(key)
+        if entry is not None:
+            expires_at, data = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end(key)
+                self.stats.local_hits += 1
+                return load_user(data)
+            del self._local[key]
+        try:
+            redis = await self.redis_client.connect_binary()
+            raw = await redis.get(key)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"User cache read failed: {e!r}")
+            return None
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.redis_hits += 1
+        data = unpack(raw)
+        self._remember(key, data)
+        return load_user(data)
+
+    async def set(self, user: User) -> None:
+        key = self.key(user.social_provider, user.social_id)
+        data = dump_user(user)
+        self._remember(key, data)
+        try:
+            redis = await self.redis_client.connect_binary()
+            await redis.set(key, pack(data), ex=self.ttl)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"User cache write failed: {e!r}")
+
+    async def invalidate(self, provider: Any, social_id: str) -> None:
+        """
+        Drop a user from Redis and from the local cache of every worker.
+        """
+        key = self.key(provider, social_id)
+        self._local.pop(key, None)
+        self.stats.invalidations += 1
+        try:
+            redis = await self.redis_client.connect_binary()
+            pipe = redis.pipeline(transaction=False)
+            pipe.delete(key)
+            pipe.publish(self.channel, key)
+            await pipe.execute()
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"User cache invalidation failed: {e!r}")
+
+    def _remember(self, key: str, data: Dict[str, Any]):
+        self._local[key] = (time.monotonic() + self.local_ttl, data)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def start(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self):
+        while True:
+            try:
+                redis = await self.redis_client.connect()
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._local.pop(message["data"], None)
+                            self.stats.remote_invalidations += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats.errors += 1
+                logger.warning(f"User cache invalidation listener failed: {e!r}")
+            # 구독이 끊긴 동안의 무효화를 놓쳤을 수 있으므로 로컬 캐시를 비움
+            self._local.clear()
+            await asyncio.sleep(1.0)
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = asdict(self.stats)
+        stats["local_entries"] = len(self._local)
+        return stats
@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
+from app.user.user_cache import UserCache
 from app.user.user_model import User
 from app.user.user_schema import UserCreate, UserUpdate
 from typing import List, Optional
@@ -14,8 +15,13 @@ async def get_user(db: AsyncSession, user_id: str) -> Optional[User]:
     return result.scalar_one_or_none()
 
 
-async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
-    result = await db.execute(select(User).offset(skip).limit(limit))
+async def get_users(
+    db: AsyncSession, limit: int = 100, after_id: Optional[str] = None
+) -> List[User]:
+    query = select(User).order_by(User.id).limit(limit)
+    if after_id is not None:
+        query = query.filter(User.id > after_id)
+    result = await db.execute(query)
     return result.scalars().all()
 
 
@@ -30,6 +36,23 @@ async def get_user_by_social_id(
     return result.scalar_one_or_none()
 
 
+async def get_cached_user_by_social_id(
+    db: AsyncSession, social_id: str, provider: str, cache: Optional[UserCache]
+) -> Optional[User]:
+    """
+    Like `get_user_by_social_id`, served from `cache` when possible. The user
+    returned from the cache is detached from `db`.
+    """
+    if cache is not None:
+        user = await cache.get(provider, social_id)
+        if user is not None:
+            return user
+    user = await get_user_by_social_id(db, social_id, provider)
+    if user is not None and cache is not None:
+        await cache.set(user)
+    return user
+
+
 async def create_user(db: AsyncSession, user: UserCreate) -> User:
     db_user = User(**user.dict())
     try:
@@ -45,7 +68,10 @@ async def create_user(db: AsyncSession, user: UserCreate) -> User:
 
 
 async def update_user(
-    db: AsyncSession, user_id: str, user: UserUpdate
+    db: AsyncSession,
+    user_id: str,
+    user: UserUpdate,
+    cache: Optional[UserCache] = None,
 ) -> Optional[User]:
     db_user = await get_user(db, user_id)
     if db_user:
@@ -55,6 +81,8 @@ async def update_user(
         try:
             await db.commit()
             await db.refresh(db_user)
+            if cache is not None:
+                await cache.invalidate(db_user.social_provider, db_user.social_id)
             logger.info(f"Updated user with id: {user_id}")
             return db_user
         except IntegrityError:
@@ -64,12 +92,16 @@ async def update_user(
     return None
 
 
-async def delete_user(db: AsyncSession, user_id: str) -> Optional[User]:
+async def delete_user(
+    db: AsyncSession, user_id: str, cache: Optional[UserCache] = None
+) -> Optional[User]:
     user = await get_user(db, user_id)
     if user:
         try:
             await db.delete(user)
             await db.commit()
+            if cache is not None:
+                await cache.invalidate(user.social_provider, user.social_id)
             logger.info(f"Deleted user with id: {user_id}")
             return user
         except Exception as e:
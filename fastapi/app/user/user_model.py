@@ -1,5 +1,4 @@
 from sqlalchemy import Column, String, Date, DateTime, Enum, Boolean, UniqueConstraint
-from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.model_base import Base
 import enum
@@ -49,5 +48,3 @@ class User(Base):
     __table_args__ = (
         UniqueConstraint("social_provider", "social_id", name="uq_social_account"),
     )
-
-    preference = relationship("UserPreference", back_populates="user", uselist=False)
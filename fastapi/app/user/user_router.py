@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Optional
 from app.user import user_schema
+from app.db.pagination import (
+    InvalidCursor,
+    Page,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+from app.configs.user_cache import get_user_cache
 from app.db.session import get_db
 from app.user.auth import get_current_active_user
+from app.user.user_cache import UserCache
 import logging
 
 from app.user import user_crud
@@ -13,15 +22,24 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.get("/", response_model=List[user_schema.User])
+@router.get("/", response_model=Page[user_schema.User])
 async def read_users(
-    skip: int = 0,
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: user_schema.User = Depends(get_current_active_user),
 ):
-    users = await user_crud.get_users(db, skip=skip, limit=limit)
-    return users
+    try:
+        (after_id,) = decode_cursor(cursor, str) if cursor else (None,)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows = await user_crud.get_users(db, limit=limit + 1, after_id=after_id)
+    users, has_more = paginate(rows, limit)
+    return Page[user_schema.User](
+        items=users,
+        next_cursor=encode_cursor(users[-1].id) if has_more else None,
+        has_more=has_more,
+    )
 
 
 @router.get("/me", response_model=user_schema.User)
@@ -36,9 +54,10 @@ async def update_user_me(
     user: user_schema.UserUpdate,
     db: AsyncSession = Depends(get_db),
     current_user: user_schema.User = Depends(get_current_active_user),
+    cache: UserCache = Depends(get_user_cache),
 ):
     updated_user = await user_crud.update_user(
-        db, user_id=current_user.id, user=user
+        db, user_id=current_user.id, user=user, cache=cache
     )
     return updated_user
 
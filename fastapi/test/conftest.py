@@ -0,0 +1,106 @@
+import os
+
+# 설정 모듈이 요구하는 환경 변수의 테스트용 기본값
+for name, value in {
+    "GOOGLE_CLIENT_ID": "test",
+    "GOOGLE_CLIENT_SECRET": "test",
+    "GOOGLE_REDIRECT_URI": "http://localhost/auth/google",
+    "KAKAO_CLIENT_ID": "test",
+    "KAKAO_CLIENT_SECRET": "test",
+    "KAKAO_REDIRECT_URI": "http://localhost/auth/kakao",
+    "NAVER_CLIENT_ID": "test",
+    "NAVER_CLIENT_SECRET": "test",
+    "NAVER_REDIRECT_URI": "http://localhost/auth/naver",
+    "DATABASE_URL": "sqlite+aiosqlite://",
+    "SYNC_DATABASE_URL": "sqlite://",
+    "SECRET_KEY": "test",
+    "ALGORITHM": "HS256",
+}.items():
+    os.environ.setdefault(name, value)
+
+import fakeredis
+import pytest
+import tiktoken
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.model_base import Base
+import app.chat_message.chat_message_model
+import app.chat_session.chat_session_model
+import app.user.user_model
+from app.modules.prompts.tokens import TokenCounter
+
+
+class FakeRedisClient:
+    """
+    `RedisClient` backed by an in-memory fakeredis server. Clients sharing a
+    server see the same data and pub/sub messages, like two workers.
+    """
+
+    def __init__(self, server: fakeredis.FakeServer):
+        self.client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        self.binary_client = fakeredis.FakeAsyncRedis(server=server)
+
+    async def connect(self):
+        return self.client
+
+    async def connect_binary(self):
+        return self.binary_client
+
+
+class BrokenRedisClient:
+    """
+    `RedisClient` whose Redis is down.
+    """
+
+    async def connect(self):
+        raise ConnectionError("Redis is down")
+
+    async def connect_binary(self):
+        raise ConnectionError("Redis is down")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_client(redis_server):
+    return FakeRedisClient(redis_server)
+
+
+@pytest.fixture
+def broken_redis_client():
+    return BrokenRedisClient()
+
+
+@pytest.fixture
+def token_counter():
+    # 내려받을 필요 없는 바이트 단위 인코딩. 단어와 공백의 바이트 하나가 토큰 하나
+    encoding = tiktoken.Encoding(
+        name="bytes",
+        pat_str=r"\S+|\s+",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+    return TokenCounter(encoding)
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def enable_foreign_keys(connection, record):
+        connection.execute("PRAGMA foreign_keys=ON")
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
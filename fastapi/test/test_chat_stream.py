@@ -0,0 +1,143 @@
+from typing import Any, AsyncIterator, Dict, List
+import httpx
+import json
+import pytest
+from sqlalchemy import insert, select
+from app.chat_message.chat_message_model import ChatMessage, MessageSenderType
+from app.chat_message.history_cache import ChatHistoryCache
+from app.chat_message.write_behind import ChatMessageWriter
+from app.chat_session.chat_session_model import ChatSession
+from app.configs.chat_history import get_history_cache
+from app.configs.chat_message import get_message_writer
+from app.configs.llm import get_context_builder, get_llm
+from app.db.session import get_db
+from app.main import app
+from app.modules.llm_models.base import BaseLLMModel
+from app.modules.prompts.context import ContextBuilder
+from app.user.auth import get_current_user
+from app.user.user_model import SocialProvider, User
+
+pytestmark = pytest.mark.anyio
+
+
+class TokenLLM(BaseLLMModel):
+    model_name = "tokens"
+
+    def __init__(self, tokens: List[str], fail: bool = False):
+        self.tokens = tokens
+        self.fail = fail
+        self.prompts: List[str] = []
+
+    def generate(self, prompt: str, **kwargs: Any) -> str:
+        return "".join(self.tokens)
+
+    async def agenerate(self, prompt: str, **kwargs: Any) -> str:
+        return self.generate(prompt, **kwargs)
+
+    async def astream(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        self.prompts.append(prompt)
+        for token in self.tokens:
+            yield token
+        if self.fail:
+            raise RuntimeError("model went away")
+
+
+def parse_sse(body: str) -> List[Dict[str, Any]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        event = {"event": "message"}
+        for line in block.splitlines():
+            field, _, value = line.partition(": ")
+            event[field] = json.loads(value) if field == "data" else value
+        events.append(event)
+    return events
+
+
+@pytest.fixture
+async def stream(session_factory, redis_client, token_counter):
+    user = User(id="u1", social_id="g1", social_provider=SocialProvider.GOOGLE)
+    async with session_factory() as db:
+        db.add(user)
+        await db.flush()
+        await db.execute(insert(ChatSession), [{"id": "s", "user_id": "u1"}])
+        await db.commit()
+
+    async def get_test_db():
+        async with session_factory() as db:
+            yield db
+
+    writer = ChatMessageWriter(session_factory, max_delay=0.01)
+    llm = TokenLLM(["안녕", "하세요", "!"])
+    app.dependency_overrides.update(
+        {
+            get_db: get_test_db,
+            get_current_user: lambda: user,
+            get_llm: lambda: llm,
+            get_context_builder: lambda: ContextBuilder(counter=token_counter),
+            get_history_cache: lambda: ChatHistoryCache(redis_client),
+            get_message_writer: lambda: writer,
+        }
+    )
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def post(content: str) -> List[Dict[str, Any]]:
+            payload = {"session_id": "s", "sender": "user", "content": content}
+            async with client.stream(
+                "POST", "/api/chat_messages/stream", json=payload
+            ) as response:
+                assert response.status_code == 200
+                assert response.headers["content-type"].startswith("text/event-stream")
+                body = [chunk async for chunk in response.aiter_text()]
+                return parse_sse("".join(body))
+
+        yield llm, writer, post
+    await writer.aclose()
+    app.dependency_overrides.clear()
+
+
+async def load_messages(session_factory) -> List[ChatMessage]:
+    async with session_factory() as db:
+        rows = await db.scalars(
+            select(ChatMessage).order_by(ChatMessage.timestamp, ChatMessage.id)
+        )
+        return list(rows)
+
+
+async def test_stream_sends_tokens_and_saves_the_reply(stream, session_factory):
+    llm, writer, post = stream
+    events = await post("인사해 줘")
+
+    assert [event["data"] for event in events[:-1]] == [
+        {"token": "안녕"},
+        {"token": "하세요"},
+        {"token": "!"},
+    ]
+    done = events[-1]
+    assert done["event"] == "done"
+    messages = await load_messages(session_factory)
+    assert [(m.sender_type, m.content) for m in messages] == [
+        (MessageSenderType.USER, "인사해 줘"),
+        (MessageSenderType.BOT, "안녕하세요!"),
+    ]
+    assert messages[1].id == done["data"]["id"]
+    assert "인사해 줘" in llm.prompts[0]
+
+
+async def test_next_prompt_includes_the_reply(stream):
+    llm, writer, post = stream
+    await post("인사해 줘")
+    await post("다시 한 번")
+    assert "안녕하세요!" in llm.prompts[1]
+
+
+async def test_stream_failure_keeps_the_question(stream, session_factory):
+    llm, writer, post = stream
+    llm.fail = True
+    events = await post("인사해 줘")
+
+    assert events[-1]["event"] == "error"
+    # 질문은 기다리지 않고 저장되므로 대기열을 비운 뒤 확인
+    await writer.aflush()
+    messages = await load_messages(session_factory)
+    assert [m.content for m in messages] == ["인사해 줘"]
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+import pytest
+from app.modules.prompts.context import ContextBuilder
+from app.modules.vectorstores.base import SearchResult
+
+# 테스트용 인코딩은 UTF-8 바이트 하나가 토큰 하나
+
+
+def chunk(id: str, score: float, size: int) -> SearchResult:
+    return SearchResult(id=id, score=score, metadata={"text": id[0] * size})
+
+
+def message(id: str, content: str, sender: str = "user") -> SimpleNamespace:
+    return SimpleNamespace(id=id, sender=sender, content=content)
+
+
+def make_builder(token_counter, **kwargs) -> ContextBuilder:
+    options = dict(max_tokens=600, reserve_tokens=100, max_history_tokens=100)
+    options.update(kwargs)
+    return ContextBuilder(
+        template="{system}|{context}|{history}|{question}",
+        counter=token_counter,
+        **options,
+    )
+
+
+def test_chunks_are_packed_greedily_by_score(token_counter):
+    builder = make_builder(token_counter)
+    chunks = [
+        chunk("a", 0.9, 200),
+        chunk("b", 0.8, 300),  # 남은 예산보다 커서 건너뛴다
+        chunk("c", 0.7, 150),
+        chunk("d", 0.6, 100),
+    ]
+    packed = builder.build("q", chunks, system="s")
+
+    assert [c.id for c in packed.chunks] == ["a", "c", "d"]
+    assert packed.dropped_chunks == 1
+    assert packed.tokens == token_counter.count_uncached(packed.prompt)
+    assert packed.tokens <= builder.budget
+
+
+@pytest.mark.parametrize("size", [1, 50, 123, 499])
+def test_prompt_never_exceeds_budget(token_counter, size):
+    builder = make_builder(token_counter)
+    chunks = [chunk(f"{i}x", 1.0 - i / 100, size) for i in range(20)]
+    history = [message(f"m{i}", "안녕 " * (i + 1)) for i in range(10)]
+    packed = builder.build("질문 " * 10, chunks, history, system="시스템")
+    assert packed.tokens <= builder.budget
+    assert packed.history
+    if size < 100:
+        assert packed.chunks
+
+
+def test_history_keeps_the_newest_messages_within_its_budget(token_counter):
+    builder = make_builder(token_counter, max_history_tokens=51)
+    history = [message(f"m{i}", f"message {i}") for i in range(10)]
+    packed = builder.build("q", history=history, system="s")
+
+    kept = [m.id for m in packed.history]
+    assert kept == ["m7", "m8", "m9"]
+    assert packed.dropped_history == 7
+    assert "user: message 9" in packed.prompt
+
+
+def test_question_over_budget_is_an_error(token_counter):
+    builder = make_builder(token_counter, max_tokens=50, reserve_tokens=10)
+    with pytest.raises(ValueError):
+        builder.build("q" * 100, system="s")
+
+
+def test_chunk_counts_are_memoized(token_counter):
+    builder = make_builder(token_counter)
+    chunks = [chunk("a", 0.9, 100), chunk("b", 0.8, 100)]
+    builder.build("first question", chunks, system="s")
+    misses = token_counter.misses
+    builder.build("second question", chunks, system="s")
+    assert token_counter.misses == misses
@@ -0,0 +1,51 @@
+import asyncio
+import numpy as np
+import pytest
+from app.modules.embeddings.cache import EmbeddingCache
+from app.modules.embeddings.fake import FakeEmbedding
+from app.modules.embeddings.service import EmbeddingService
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_requests_share_batches_and_duplicates():
+    model = FakeEmbedding(dim=8)
+    service = EmbeddingService(model, max_batch_size=4, max_wait=0.01)
+    results = await asyncio.gather(
+        service.aembed_many(["a", "b", "a"]),
+        service.aembed_many(["b", "c"]),
+        service.aembed("d"),
+    )
+
+    assert results[0].shape == (3, 8)
+    np.testing.assert_array_equal(results[0][0], results[0][2])
+    np.testing.assert_array_equal(results[0][1], results[1][0])
+    # a, b, c, d: 4개만 한 번의 호출로
+    assert model.call_count == 1
+    assert model.text_count == 4
+    assert service.stats.deduplicated == 2
+
+
+async def test_batches_are_capped_at_max_batch_size():
+    model = FakeEmbedding(dim=8, max_batch_size=3)
+    service = EmbeddingService(model, max_batch_size=10)
+    vectors = await service.aembed_many([f"text {i}" for i in range(7)])
+    assert vectors.shape == (7, 8)
+    assert model.call_count == 3
+
+
+async def test_cache_is_keyed_by_dimension(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite"))
+    small = FakeEmbedding(model_name="m", dim=8)
+    large = FakeEmbedding(model_name="m", dim=16)
+
+    services = [EmbeddingService(model, cache=cache) for model in (small, large)]
+    for service in services:
+        await service.aembed("hello")
+        # 디스크 기록은 결과를 돌려준 뒤에 끝난다
+        await service.flush()
+    again = await EmbeddingService(large, cache=cache).aembed("hello")
+
+    assert again.shape == (16,)
+    assert small.call_count == large.call_count == 1
+    assert len(cache) == 2
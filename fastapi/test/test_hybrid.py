@@ -0,0 +1,182 @@
+import asyncio
+import math
+import time
+from collections import Counter
+import numpy as np
+import pytest
+from app.modules.retrievals.bm25 import BM25Index
+from app.modules.retrievals.hybrid import (
+    HybridRetriever,
+    reciprocal_rank_fusion,
+    weighted_score_fusion,
+)
+from app.modules.vectorstores.base import SearchResult
+from app.modules.vectorstores.in_memory import InMemoryVectorStore
+
+DOCS = {
+    "a": "apple banana apple",
+    "b": "banana cherry",
+    "c": "cherry cherry cherry date",
+    "d": "apple date elderberry fig grape",
+    "e": "fig",
+}
+
+
+def reference_bm25(docs, query, k1=1.5, b=0.75):
+    # 교과서 공식 그대로 계산한 점수
+    tokens = {id: text.split() for id, text in docs.items()}
+    avg_length = sum(len(t) for t in tokens.values()) / len(tokens)
+    scores = {}
+    for id, doc in tokens.items():
+        tf = Counter(doc)
+        score = 0.0
+        for term, query_tf in Counter(query.split()).items():
+            df = sum(term in t for t in tokens.values())
+            if not tf[term]:
+                continue
+            idf = math.log(1 + (len(tokens) - df + 0.5) / (df + 0.5))
+            norm = k1 * (1 - b + b * len(doc) / avg_length)
+            score += query_tf * idf * (k1 + 1) * tf[term] / (tf[term] + norm)
+        if score > 0:
+            scores[id] = score
+    return scores
+
+
+def make_index(docs=DOCS, **kwargs) -> BM25Index:
+    index = BM25Index(tokenizer=str.split, **kwargs)
+    index.add(list(docs), list(docs.values()), [{"id": id} for id in docs])
+    return index
+
+
+def as_scores(results):
+    return {result.id: result.score for result in results}
+
+
+@pytest.mark.parametrize("query", ["apple", "cherry date", "fig apple apple", "kiwi"])
+def test_bm25_matches_reference_scores(query):
+    results = make_index().search(query, k=10)
+    expected = reference_bm25(DOCS, query)
+    assert as_scores(results) == pytest.approx(expected, rel=1e-5)
+    assert [r.score for r in results] == sorted(as_scores(results).values())[::-1]
+
+
+def test_incremental_updates_match_a_rebuilt_index():
+    index = make_index(compact_ratio=1.0)
+    index.delete(["b", "missing"])
+    index.add(["a", "f"], ["banana fig", "grape grape"])
+    docs = {**DOCS, "a": "banana fig", "f": "grape grape"}
+    del docs["b"]
+    for query in ["apple", "banana fig", "grape cherry"]:
+        expected = reference_bm25(docs, query)
+        assert as_scores(index.search(query, k=10)) == pytest.approx(expected)
+
+    # 압축 후에도 점수와 메타데이터가 같아야 한다
+    before = index.search("grape cherry", k=10)
+    index.compact()
+    after = index.search("grape cherry", k=10)
+    assert as_scores(after) == pytest.approx(as_scores(before))
+    assert [r.metadata for r in after] == [r.metadata for r in before]
+    assert len(index) == 5
+
+
+def test_bm25_filter_and_korean_tokenizer():
+    index = BM25Index()
+    index.add(
+        ["k1", "k2", "k3"],
+        ["검색 속도를 개선했다", "모델의 평가 결과", "검색은 느리다"],
+        [{"lang": "ko"}, {"lang": "ko"}, {"lang": "en"}],
+    )
+    assert {r.id for r in index.search("검색이 빠른가", k=10)} == {"k1", "k3"}
+    results = index.search("검색이 빠른가", k=10, filter={"lang": "ko"})
+    assert [r.id for r in results] == ["k1"]
+
+
+def results(*ids, scores=None):
+    scores = scores or [len(ids) - i for i in range(len(ids))]
+    return [SearchResult(id=id, score=s, metadata={}) for id, s in zip(ids, scores)]
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([results("a", "b", "c"), results("c", "a")], rrf_k=1)
+    # a: 1/2 + 1/3, c: 1/4 + 1/2, b: 1/3
+    assert [r.id for r in fused] == ["a", "c", "b"]
+    assert fused[0].score == pytest.approx(1 / 2 + 1 / 3)
+
+    weighted = reciprocal_rank_fusion(
+        [results("a", "b", "c"), results("c", "a")], weights=[0.0, 1.0], rrf_k=1
+    )
+    assert [r.id for r in weighted][:2] == ["c", "a"]
+
+
+def test_weighted_score_fusion_normalizes_each_list():
+    sparse = results("a", "b", "c", scores=[30.0, 20.0, 10.0])
+    dense = results("c", "b", scores=[0.9, 0.8])
+    fused = weighted_score_fusion([sparse, dense], weights=[1.0, 2.0])
+    # a: 1, b: 0.5 + 0, c: 0 + 2
+    assert as_scores(fused) == pytest.approx({"a": 1.0, "b": 0.5, "c": 2.0})
+    assert [r.id for r in fused] == ["c", "a", "b"]
+
+
+DIM = 8
+
+
+def unit(i: int) -> np.ndarray:
+    vector = np.zeros(DIM, dtype=np.float32)
+    vector[i] = 1.0
+    return vector
+
+
+def make_retriever(embed, **kwargs) -> HybridRetriever:
+    retriever = HybridRetriever(
+        InMemoryVectorStore(DIM), embed, BM25Index(tokenizer=str.split), **kwargs
+    )
+    retriever.add(
+        list(DOCS), list(DOCS.values()), np.stack([unit(i) for i in range(len(DOCS))])
+    )
+    return retriever
+
+
+async def embed_as_e(query: str):
+    # 밀집 순위: e, b, 나머지
+    return unit(4) + 0.1 * unit(1)
+
+
+@pytest.mark.anyio
+async def test_hybrid_fuses_both_legs():
+    retriever = make_retriever(embed_as_e, candidate_factor=1)
+    # 희소 [a, d], 밀집 [e, b] → 각 경로의 1위가 상위 두 자리를 차지
+    fused = await retriever.aretrieve("apple", k=2)
+    assert {r.id for r in fused} == {"a", "e"}
+
+    assert retriever.delete(["a"]) == 1
+    assert "a" not in {r.id for r in await retriever.aretrieve("apple", k=5)}
+
+
+@pytest.mark.anyio
+async def test_slow_dense_leg_is_dropped_within_budget():
+    async def slow_embed(query: str):
+        await asyncio.sleep(1)
+        return unit(4)
+
+    retriever = make_retriever(slow_embed, latency_budget=0.1)
+    start = time.perf_counter()
+    fused = await retriever.aretrieve("apple", k=3)
+    assert time.perf_counter() - start < 0.5
+    assert [r.id for r in fused] == ["a", "d"]
+
+
+@pytest.mark.anyio
+async def test_failed_leg_falls_back_to_the_other():
+    async def broken_embed(query: str):
+        raise RuntimeError("embedding API down")
+
+    retriever = make_retriever(broken_embed)
+    assert [r.id for r in await retriever.aretrieve("apple", k=3)] == ["a", "d"]
+
+    # 두 경로가 모두 실패하면 예외를 그대로 올린다
+    def broken_tokenizer(text: str):
+        raise RuntimeError("tokenizer broken")
+
+    retriever.sparse.tokenizer = broken_tokenizer
+    with pytest.raises(RuntimeError):
+        await retriever.aretrieve("apple", k=3)
@@ -0,0 +1,101 @@
+import re
+from typing import Dict, List
+import numpy as np
+import pytest
+from app.modules.embeddings.fake import FakeEmbedding
+from app.modules.embeddings.service import EmbeddingService
+from app.modules.ingestion.checkpoint import IngestionCheckpoint
+from app.modules.ingestion.pipeline import IngestionPipeline
+from app.modules.parsers.markdown import MarkdownParser
+from app.modules.parsers.text import TextParser
+from app.modules.preprocessing.base import Chunk
+from app.modules.preprocessing.character import CharacterChunker
+
+pytestmark = pytest.mark.anyio
+
+
+def paragraphs(sections) -> List[str]:
+    text = "\n\n".join(section.text for section in sections)
+    return [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    directory = tmp_path / "corpus"
+    directory.mkdir()
+    text = "\n\n".join(
+        f"문단 {i}: " + " ".join(f"word{i}-{j}" for j in range(i % 7 + 1))
+        for i in range(200)
+    )
+    (directory / "notes.txt").write_text(text, encoding="utf-8")
+    markdown = "\n\n".join(f"## 제목 {i}\n\n본문 {i} 내용" for i in range(100))
+    (directory / "guide.md").write_text(markdown, encoding="utf-8")
+    return directory
+
+
+@pytest.mark.parametrize(
+    "parser, name", [(TextParser(), "notes.txt"), (MarkdownParser(), "guide.md")]
+)
+def test_byte_ranges_cover_every_paragraph_once(corpus, parser, name):
+    path = corpus / name
+    size = path.stat().st_size
+    whole = paragraphs(parser.parse(path))
+    for step in (97, 1000, size):
+        ranges = []
+        for start in range(0, size, step):
+            ranges += paragraphs(parser.parse(path, start, start + step))
+        assert ranges == whole
+
+
+def test_ranges_of_later_shards_have_offsets(corpus):
+    sections = list(TextParser().parse(corpus / "notes.txt", 500, 1500))
+    assert sections
+    for section in sections:
+        assert "line" not in section.metadata
+        assert section.metadata["offset"] >= 500
+
+
+class RecordingWriter:
+    def __init__(self, fail_first: int = 0):
+        self.fail_first = fail_first
+        self.chunks: Dict[str, Chunk] = {}
+
+    async def __call__(self, chunks: List[Chunk], vectors: np.ndarray):
+        assert len(chunks) == len(vectors)
+        if self.fail_first:
+            self.fail_first -= 1
+            raise RuntimeError("index is down")
+        for chunk in chunks:
+            self.chunks[chunk.id] = chunk
+
+
+def make_pipeline(writer, checkpoint=None) -> IngestionPipeline:
+    return IngestionPipeline(
+        EmbeddingService(FakeEmbedding(dim=16)),
+        writer,
+        chunker=CharacterChunker(chunk_size=200, chunk_overlap=0),
+        checkpoint=checkpoint,
+        max_workers=2,
+        shard_bytes=1024,
+    )
+
+
+async def test_resume_redoes_only_failed_shards(corpus, tmp_path):
+    expected = RecordingWriter()
+    await make_pipeline(expected).run([str(corpus)])
+
+    checkpoint_path = str(tmp_path / "state" / "checkpoint.jsonl")
+    writer = RecordingWriter(fail_first=1)
+    first = await make_pipeline(writer, IngestionCheckpoint(checkpoint_path)).run(
+        [str(corpus)]
+    )
+    assert first.shards_total > 2
+    assert first.shards_failed == 1
+    assert first.shards_done == first.shards_total - 1
+
+    second = await make_pipeline(writer, IngestionCheckpoint(checkpoint_path)).run(
+        [str(corpus)]
+    )
+    assert second.shards_skipped == first.shards_done
+    assert second.shards_done == 1
+    assert writer.chunks.keys() == expected.chunks.keys()
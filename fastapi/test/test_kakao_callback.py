@@ -0,0 +1,132 @@
+import time
+import httpx
+import pytest
+from app.configs.kakao import get_callback_worker
+from app.configs.settings import settings
+from app.main import app
+from app.services.kakao import chat_router
+from app.services.kakao.callback import CallbackJob, CallbackWorker
+from app.services.kakao.mock_server import MockKakaoServer
+
+pytestmark = pytest.mark.anyio
+
+
+async def answer(utterance: str) -> str:
+    return f"answer to {utterance}"
+
+
+def make_worker(server: MockKakaoServer, **kwargs) -> CallbackWorker:
+    return CallbackWorker(
+        answer,
+        workers=2,
+        backoff=0.01,
+        client=server.client(),
+        callback_hosts={"mock-kakao"},
+        **kwargs,
+    )
+
+
+def make_job(server: MockKakaoServer, utterance: str = "hello") -> CallbackJob:
+    payload = server.skill_request(utterance)["userRequest"]
+    return CallbackJob(
+        callback_url=payload["callbackUrl"],
+        utterance=utterance,
+        user_id=payload["user"]["id"],
+        received_at=time.time(),
+    )
+
+
+async def test_delivery_is_retried_on_server_errors():
+    server = MockKakaoServer(fail_first=2)
+    worker = make_worker(server, max_attempts=3)
+    await worker.start()
+    job = make_job(server)
+    assert worker.submit(job)
+    await server.wait_for(job.callback_url, timeout=5)
+    await worker.stop()
+
+    assert server.texts() == ["answer to hello"]
+    stats = worker.get_stats()
+    assert stats["delivered"] == 1
+    assert stats["retries"] == 2
+
+
+async def test_delivery_gives_up_after_max_attempts():
+    server = MockKakaoServer(fail_first=5)
+    worker = make_worker(server, max_attempts=3)
+    await worker.start()
+    assert worker.submit(make_job(server))
+    await worker.join()
+    await worker.stop()
+
+    assert server.received == {}
+    assert sum(server.attempts.values()) == 3
+    assert worker.get_stats()["delivery_failures"] == 1
+
+
+async def test_client_errors_are_not_retried():
+    server = MockKakaoServer(fail_first=1, fail_status=400)
+    worker = make_worker(server, max_attempts=3)
+    await worker.start()
+    assert worker.submit(make_job(server))
+    await worker.join()
+    await worker.stop()
+
+    assert sum(server.attempts.values()) == 1
+    assert worker.get_stats()["retries"] == 0
+
+
+async def test_callbacks_to_other_hosts_are_refused():
+    server = MockKakaoServer(base_url="http://attacker.example")
+    worker = make_worker(server)
+    await worker.start()
+    assert worker.submit(make_job(server))
+    await worker.join()
+    await worker.stop()
+
+    assert server.attempts == {}
+    assert worker.get_stats()["delivery_failures"] == 1
+
+
+@pytest.fixture
+async def skill_client(monkeypatch):
+    server = MockKakaoServer()
+    worker = make_worker(server)
+    monkeypatch.setattr(settings, "KAKAO_BOT_ID", "mock-bot")
+    monkeypatch.setattr(chat_router, "get_callback_hosts", lambda: {"mock-kakao"})
+    app.dependency_overrides[get_callback_worker] = lambda: worker
+    await worker.start()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield server, worker, client
+    await worker.stop()
+    app.dependency_overrides.clear()
+
+
+async def test_skill_route_answers_through_the_callback(skill_client):
+    server, worker, client = skill_client
+    payload = server.skill_request("hello")
+    response = await client.post("/api/chat/skill", json=payload)
+    assert response.status_code == 200
+    assert response.json()["useCallback"] is True
+
+    await server.wait_for(payload["userRequest"]["callbackUrl"], timeout=5)
+    assert server.texts() == ["answer to hello"]
+
+
+async def test_skill_route_answers_inline_without_a_callback(skill_client):
+    server, worker, client = skill_client
+    payload = server.skill_request("hello", callback=False)
+    response = await client.post("/api/chat/skill", json=payload)
+    assert response.status_code == 200
+    outputs = response.json()["template"]["outputs"]
+    assert outputs == [{"simpleText": {"text": "answer to hello"}}]
+
+
+async def test_skill_route_refuses_other_bots(skill_client):
+    server, worker, client = skill_client
+    payload = server.skill_request("hello")
+    payload["bot"]["id"] = "other-bot"
+    response = await client.post("/api/chat/skill", json=payload)
+    assert response.status_code == 403
+    assert server.attempts == {}
@@ -0,0 +1,114 @@
+import json
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+import pytest
+from app.modules.llm_models import cache as cache_module
+from app.modules.llm_models.base import BaseLLMModel
+from app.modules.llm_models.cache import CachedLLM, ResponseCache
+
+pytestmark = pytest.mark.anyio
+
+
+class EchoLLM(BaseLLMModel):
+    model_name = "echo"
+    max_concurrency = 4
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt: str, **kwargs: Any) -> str:
+        self.calls += 1
+        return f"answer to {prompt}"
+
+    async def agenerate(self, prompt: str, **kwargs: Any) -> str:
+        return self.generate(prompt, **kwargs)
+
+    async def astream(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        self.calls += 1
+        for token in ("answer to ", prompt):
+            yield token
+
+
+async def embed(text: str):
+    # "hello"가 들어간 질문끼리만 비슷하다
+    return [1.0, 0.0] if "hello" in text else [0.0, 1.0]
+
+
+async def test_exact_hit(redis_client):
+    llm = EchoLLM()
+    cached = CachedLLM(llm, ResponseCache(redis_client))
+    assert await cached.agenerate("hi") == "answer to hi"
+    await cached.cache.flush()
+    assert await cached.agenerate("  hi ") == "answer to hi"
+    assert llm.calls == 1
+    assert cached.cache.stats.exact_hits == 1
+
+
+async def test_redis_outage_is_a_miss(broken_redis_client):
+    llm = EchoLLM()
+    cache = ResponseCache(broken_redis_client, embed=embed)
+    cached = CachedLLM(llm, cache, scope="user:1")
+    assert await cached.agenerate("hi") == "answer to hi"
+    assert [token async for token in cached.astream("hi")] == ["answer to ", "hi"]
+    await cache.flush()
+    assert llm.calls == 2
+    # 읽기 2번, 백그라운드 쓰기 2번
+    assert cache.stats.errors == 4
+    assert cache.stats.misses == 0
+
+
+async def test_embedding_outage_is_a_miss(redis_client):
+    down = False
+
+    async def flaky_embed(text: str):
+        if down:
+            raise RuntimeError("embedding service down")
+        return await embed(text)
+
+    cache = ResponseCache(redis_client, embed=flaky_embed)
+    await cache.set("echo", "hello there", "answer", scope="user:1")
+    down = True
+    assert await cache.get("echo", "hello again", scope="user:1") is None
+    assert cache.stats.errors == 1
+    assert cache.stats.misses == 1
+
+
+async def test_semantic_hits_stay_in_scope(redis_client):
+    llm = EchoLLM()
+    cache = ResponseCache(redis_client, embed=embed)
+    base = CachedLLM(llm, cache)
+    await base.scoped("user:1").agenerate("hello there")
+    await cache.flush()
+
+    assert await base.scoped("user:1").agenerate("hello again") == (
+        "answer to hello there"
+    )
+    assert await base.scoped("user:2").agenerate("hello again") == (
+        "answer to hello again"
+    )
+    # 범위가 없으면 의미 캐시를 쓰지 않는다
+    assert await base.agenerate("hello world") == "answer to hello world"
+    assert cache.stats.semantic_hits == 1
+    assert llm.calls == 3
+
+
+async def test_semantic_overflow_evicts_oldest_live_entries(redis_client, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(time=lambda: clock[0]))
+    # 한도가 더 큰 워커가 먼저 채워 둔 범위
+    filler = ResponseCache(redis_client, embed=embed, ttl=60, max_semantic_entries=3)
+    for prompt in ("a", "b", "c"):
+        await filler.set("echo", prompt, prompt, scope="user:1")
+        clock[0] += 20
+
+    # a는 만료되었고, 남은 b, c와 새 d 중 가장 오래된 b가 넘친다
+    cache = ResponseCache(redis_client, embed=embed, ttl=60, max_semantic_entries=2)
+    await cache.set("echo", "d", "d", scope="user:1")
+
+    redis = await redis_client.connect()
+    key = next(k for k in await redis.keys("*:semantic:*") if k.count(":") == 2)
+    live = await redis.zrange(f"{key}:index", 0, -1)
+    assert sorted(live) == sorted(await redis.hkeys(key))
+    responses = [json.loads(v)["response"] for v in await redis.hvals(key)]
+    assert sorted(responses) == ["c", "d"]
+    assert cache.stats.evictions == 2
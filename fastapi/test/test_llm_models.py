@@ -0,0 +1,39 @@
+import asyncio
+from typing import Any
+import pytest
+from app.modules.llm_models.base import BaseLLMModel
+
+pytestmark = pytest.mark.anyio
+
+
+class SlowLLM(BaseLLMModel):
+    model_name = "slow"
+    max_concurrency = 3
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    def generate(self, prompt: str, **kwargs: Any) -> str:
+        return prompt.upper()
+
+    async def agenerate(self, prompt: str, **kwargs: Any) -> str:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return self.generate(prompt)
+
+
+@pytest.mark.parametrize("max_concurrency, peak", [(None, 3), (1, 1), (5, 5)])
+async def test_abatch_limits_concurrency(max_concurrency, peak):
+    llm = SlowLLM()
+    prompts = [f"p{i}" for i in range(10)]
+    results = await llm.abatch(prompts, max_concurrency=max_concurrency)
+    assert results == [prompt.upper() for prompt in prompts]
+    assert llm.peak == peak
+
+
+async def test_abatch_rejects_zero_concurrency():
+    with pytest.raises(ValueError):
+        await SlowLLM().abatch(["p"], max_concurrency=0)
@@ -0,0 +1,133 @@
+import asyncio
+import time
+import pytest
+from app.services.multiagent.checkpoint import RedisCheckpointer
+from app.services.multiagent.graph import Graph
+from app.services.multiagent.node import Node, NodeError, RetryPolicy, node
+from app.services.multiagent.utils import NodeStatus
+
+pytestmark = pytest.mark.anyio
+
+RETRY = RetryPolicy(max_attempts=3, backoff=0.0, jitter=0.0)
+
+
+async def test_independent_nodes_run_concurrently():
+    @node(inputs=["question"], outputs=["documents"])
+    async def retrieve(question):
+        await asyncio.sleep(0.2)
+        return {"documents": [f"doc about {question}"]}
+
+    @node(inputs=["question"], outputs=["results"])
+    async def web_search(question):
+        await asyncio.sleep(0.2)
+        return {"results": [f"page about {question}"]}
+
+    @node(inputs=["documents", "results"], outputs=["answer"])
+    def answer(documents, results):
+        return {"answer": " / ".join(documents + results)}
+
+    run = await Graph([retrieve, web_search, answer]).arun({"question": "q"})
+
+    assert run.state["answer"] == "doc about q / page about q"
+    assert run.seconds < 0.35
+    assert run.critical_path[-1] == "answer"
+
+
+async def test_async_timeouts_are_retried():
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        if len(calls) < 3:
+            await asyncio.sleep(1)
+        return {"value": len(calls)}
+
+    outputs, attempts = await Node(
+        "slow", slow, outputs=["value"], timeout=0.05, retry=RETRY
+    ).arun({})
+    assert outputs == {"value": 3}
+    assert attempts == 3
+
+
+async def test_sync_timeouts_are_not_retried():
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"value": 1}
+
+    with pytest.raises(NodeError) as info:
+        await Node("slow", slow, outputs=["value"], timeout=0.05, retry=RETRY).arun({})
+    assert info.value.attempts == 1
+    assert calls == [1]
+
+
+async def test_bad_outputs_are_not_retried_or_replaced():
+    calls = []
+
+    def bad():
+        calls.append(1)
+        return {"other": 1}
+
+    graph = Graph([Node("bad", bad, outputs=["value"], retry=RETRY, fallback={})])
+    with pytest.raises(KeyError):
+        await graph.arun({})
+    assert calls == [1]
+
+
+async def test_fallback_replaces_failed_outputs():
+    def broken():
+        raise RuntimeError("down")
+
+    @node(inputs=["value"], outputs=["answer"])
+    def answer(value):
+        return {"answer": value}
+
+    graph = Graph(
+        [
+            Node(
+                "broken", broken, outputs=["value"], retry=RETRY, fallback={"value": 0}
+            ),
+            answer,
+        ]
+    )
+    run = await graph.arun({})
+    assert run.state["answer"] == 0
+    assert run.runs["broken"].status is NodeStatus.FALLBACK
+    assert run.runs["broken"].attempts == 3
+
+
+async def test_resume_skips_finished_nodes(redis_client):
+    calls = []
+    down = True
+
+    @node(inputs=["question"], outputs=["documents"])
+    async def retrieve(question):
+        calls.append("retrieve")
+        return {"documents": [question]}
+
+    @node(inputs=["question"], outputs=["results"])
+    def web_search(question):
+        calls.append("web_search")
+        return {"results": [question.upper()]}
+
+    @node(inputs=["documents", "results"], outputs=["answer"])
+    async def answer(documents, results):
+        calls.append("answer")
+        if down:
+            raise RuntimeError("model is down")
+        return {"answer": documents + results}
+
+    checkpointer = RedisCheckpointer(redis_client)
+    graph = Graph([retrieve, web_search, answer], checkpointer=checkpointer)
+    with pytest.raises(NodeError):
+        await graph.arun({"question": "q"}, run_id="run-1")
+
+    down = False
+    # 재개할 때는 초기 상태를 다시 넘기지 않아도 된다
+    run = await graph.arun(run_id="run-1")
+    assert run.state["answer"] == ["q", "Q"]
+    assert sorted(run.resumed) == ["retrieve", "web_search"]
+    assert sorted(calls) == ["answer", "answer", "retrieve", "web_search"]
+    await checkpointer.aclose()
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import insert
+from app.chat_message.chat_message_crud import get_chat_messages_by_session
+from app.chat_message.chat_message_model import ChatMessage, MessageSenderType
+from app.chat_session.chat_session_model import ChatSession
+from app.db.pagination import InvalidCursor, decode_cursor, encode_cursor, paginate
+
+
+def test_cursor_round_trip():
+    timestamp = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    cursor = encode_cursor(timestamp, "message-1")
+    assert "=" not in cursor
+    assert decode_cursor(cursor, datetime, str) == (timestamp, "message-1")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        encode_cursor("message-1"),
+        encode_cursor("yesterday", "message-1"),
+        encode_cursor(datetime(2024, 5, 1), "message-1", "extra"),
+        "",
+    ],
+)
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, datetime, str)
+
+
+@pytest.mark.parametrize(
+    "count, limit, has_more",
+    [(0, 3, False), (2, 3, False), (3, 3, False), (4, 3, True)],
+)
+def test_paginate(count, limit, has_more):
+    items, more = paginate(list(range(count)), limit)
+    assert items == list(range(min(count, limit)))
+    assert more is has_more
+
+
+@pytest.mark.anyio
+async def test_keyset_pages_cover_ties_once(session_factory):
+    base = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    # 같은 시각의 메시지가 페이지 경계에 걸치도록 3개씩 묶는다
+    rows = [
+        {
+            "id": f"m{i:02d}",
+            "session_id": "s",
+            "sender_type": MessageSenderType.USER,
+            "sender": "user",
+            "content": str(i),
+            "timestamp": base + timedelta(seconds=i // 3),
+        }
+        for i in range(10)
+    ]
+    async with session_factory() as db:
+        await db.execute(insert(ChatSession), [{"id": "s", "user_id": None}])
+        await db.execute(insert(ChatMessage), rows)
+        await db.commit()
+
+        newest_first, before = [], None
+        while True:
+            page = await get_chat_messages_by_session(db, "s", limit=4, before=before)
+            if not page:
+                break
+            newest_first += [message.id for message in page]
+            before = (page[-1].timestamp, page[-1].id)
+
+        # 처음부터 따라잡으려면 첫 메시지보다 앞선 키를 넘긴다
+        oldest_first, after = [], (base - timedelta(days=1), "")
+        while True:
+            page = await get_chat_messages_by_session(db, "s", limit=4, after=after)
+            if not page:
+                break
+            oldest_first += [message.id for message in page]
+            after = (page[-1].timestamp, page[-1].id)
+
+    ids = [row["id"] for row in rows]
+    assert newest_first == ids[::-1]
+    assert oldest_first == ids
@@ -0,0 +1,49 @@
+import pytest
+from app.modules.retrievals.tokenizer import strip_josa, tokenize
+
+
+@pytest.mark.parametrize(
+    "word, stem",
+    [
+        # 조사처럼 끝나는 두 음절 명사는 그대로 둔다 (이전: 평, 속, 필, 경, 회)
+        ("평가", "평가"),
+        ("속도", "속도"),
+        ("필요", "필요"),
+        ("경로", "경로"),
+        ("회의", "회의"),
+        # 복합어 끝의 예외 명사
+        ("최단경로", "최단경로"),
+        ("전문가", "전문가"),
+        # 예외 명사 뒤의 조사는 자른다
+        ("평가가", "평가"),
+        ("속도를", "속도"),
+        ("경로로", "경로"),
+        ("회의에서", "회의"),
+        ("결과는", "결과"),
+        # 일반 명사
+        ("검색에서는", "검색"),
+        ("문서의", "문서"),
+        ("모델이", "모델"),
+        ("데이터베이스에서", "데이터베이스"),
+    ],
+)
+def test_strip_josa(word, stem):
+    assert strip_josa(word) == stem
+
+
+def test_tokenize_keeps_noun_stems():
+    tokens = tokenize("RAG는 검색 속도와 평가 결과를 개선한다", bigrams=False)
+    assert tokens == ["rag", "검색", "속도", "평가", "결과", "개선한다"]
+
+
+def test_tokenize_emits_bigrams_of_long_stems():
+    assert tokenize("벡터데이터베이스를") == [
+        "벡터데이터베이스",
+        "벡터",
+        "터데",
+        "데이",
+        "이터",
+        "터베",
+        "베이",
+        "이스",
+    ]
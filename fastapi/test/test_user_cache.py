@@ -0,0 +1,79 @@
+import asyncio
+from datetime import date, datetime, timezone
+import pytest
+from app.user.user_cache import UserCache
+from app.user.user_model import Gender, SocialProvider, User
+from conftest import FakeRedisClient
+
+pytestmark = pytest.mark.anyio
+
+
+def make_user(username: str = "alice") -> User:
+    return User(
+        id="u1",
+        social_id="g1",
+        social_provider=SocialProvider.GOOGLE,
+        username=username,
+        gender=Gender.FEMALE,
+        birth_date=date(1990, 1, 2),
+        last_login=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        is_active=True,
+    )
+
+
+async def wait_until(condition, timeout: float = 1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def caches(redis_server):
+    # 같은 Redis를 쓰는 두 워커
+    caches = [UserCache(FakeRedisClient(redis_server)) for _ in range(2)]
+    for cache in caches:
+        await cache.start()
+    yield caches
+    for cache in caches:
+        await cache.stop()
+
+
+async def test_round_trip_keeps_column_types(caches):
+    first, second = caches
+    await first.set(make_user())
+    user = await second.get(SocialProvider.GOOGLE, "g1")
+    assert user.username == "alice"
+    assert user.social_provider is SocialProvider.GOOGLE
+    assert user.gender is Gender.FEMALE
+    assert user.birth_date == date(1990, 1, 2)
+    assert user.last_login == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert second.stats.redis_hits == 1
+
+    await second.get(SocialProvider.GOOGLE, "g1")
+    assert second.stats.local_hits == 1
+
+
+async def test_invalidate_reaches_other_workers(caches):
+    first, second = caches
+    await first.set(make_user())
+    await second.get(SocialProvider.GOOGLE, "g1")
+    await asyncio.sleep(0.05)  # 구독이 연결될 때까지
+
+    await first.invalidate(SocialProvider.GOOGLE, "g1")
+    await wait_until(lambda: second.stats.remote_invalidations >= 1)
+
+    assert second.get_stats()["local_entries"] == 0
+    assert await second.get(SocialProvider.GOOGLE, "g1") is None
+    assert second.stats.misses == 1
+
+
+async def test_redis_outage_is_a_miss(broken_redis_client):
+    cache = UserCache(broken_redis_client)
+    assert await cache.get(SocialProvider.GOOGLE, "g1") is None
+    # 쓰기가 실패해도 로컬 캐시에는 남는다
+    await cache.set(make_user())
+    assert (await cache.get(SocialProvider.GOOGLE, "g1")).username == "alice"
+    await cache.invalidate(SocialProvider.GOOGLE, "g1")
+    assert await cache.get(SocialProvider.GOOGLE, "g1") is None
+    assert cache.stats.errors == 4
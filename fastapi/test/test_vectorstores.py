@@ -0,0 +1,114 @@
+from typing import List
+import numpy as np
+import pytest
+from app.modules.vectorstores.base import SearchResult
+from app.modules.vectorstores.in_memory import InMemoryVectorStore
+from app.modules.vectorstores.ivf import IVFVectorStore
+from app.modules.vectorstores.quantization import (
+    ProductQuantizer,
+    QuantizedVectorStore,
+    ScalarQuantizer,
+)
+
+DIM = 32
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    # 군집이 있는 데이터라야 근사 색인의 재현율이 의미가 있다
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(50, DIM))
+    data = centers[rng.integers(0, 50, 5000)] + 0.3 * rng.normal(size=(5000, DIM))
+    queries = centers[rng.integers(0, 50, 50)] + 0.3 * rng.normal(size=(50, DIM))
+    ids = [f"v{i}" for i in range(len(data))]
+    exact = InMemoryVectorStore(DIM)
+    exact.add(ids, data)
+    return ids, data.astype(np.float32), queries.astype(np.float32), exact
+
+
+def recall(results: List[List[SearchResult]], expected) -> float:
+    found = sum(
+        len({hit.id for hit in hits} & {hit.id for hit in truth})
+        for hits, truth in zip(results, expected)
+    )
+    return found / sum(len(truth) for truth in expected)
+
+
+def test_ivf_recall_grows_with_probes(dataset):
+    ids, data, queries, exact = dataset
+    store = IVFVectorStore(DIM, n_lists=32, n_probe=1)
+    store.add(ids, data)
+    assert store.is_trained
+    assert sum(store.list_sizes()) == len(data)
+
+    truth = exact.search_batch(queries, k=10)
+    recalls = [
+        recall(store.search_batch(queries, k=10, n_probe=n_probe), truth)
+        for n_probe in (1, 4, 32)
+    ]
+    assert recalls == sorted(recalls)
+    assert recalls[-1] == 1.0
+    assert recalls[1] >= 0.9
+
+
+def test_ivf_filters_and_deletes(dataset):
+    ids, data, queries, exact = dataset
+    store = IVFVectorStore(DIM, n_lists=16, n_probe=16)
+    store.add(ids, data, [{"even": i % 2 == 0} for i in range(len(ids))])
+    hits = store.search(data[1], k=5, filter={"even": True})
+    assert hits and all(int(hit.id[1:]) % 2 == 0 for hit in hits)
+
+    assert store.delete(["v1", "missing"]) == 1
+    assert store.search(data[1], k=1)[0].id != "v1"
+    assert len(store) == len(ids) - 1
+
+
+def test_scalar_quantization_recall(dataset):
+    ids, data, queries, exact = dataset
+    store = QuantizedVectorStore(DIM, ScalarQuantizer())
+    store.train(data)
+    store.add(ids, data)
+    results = store.search_batch(queries, k=10)
+    assert recall(results, exact.search_batch(queries, k=10)) >= 0.9
+    assert store.memory_bytes() < data.nbytes / 3
+
+
+def test_product_quantization_recall_with_rerank(dataset):
+    ids, data, queries, exact = dataset
+    store = QuantizedVectorStore(DIM, ProductQuantizer(8), rerank_store=exact)
+    store.train(data)
+    store.add(ids, data)
+    truth = exact.search_batch(queries, k=10)
+    assert recall(store.search_batch(queries, k=10), truth) >= 0.95
+    # 재순위 없이 코드만으로는 훨씬 부정확하다
+    assert recall(store.search_batch(queries, k=10, rerank=False), truth) < 0.95
+
+
+def test_untrained_store_searches_exactly_until_enough_samples(dataset):
+    ids, data, queries, exact = dataset
+    quantizer = ProductQuantizer(8)
+    store = QuantizedVectorStore(DIM, quantizer)
+    assert store.auto_train_size == 256 * 8
+
+    store.add(ids[:1000], data[:1000])
+    assert not quantizer.is_trained
+    assert len(store) == 1000
+    hits = store.search(data[0], k=1)
+    assert hits[0].id == "v0"
+    assert store.delete(["v0"]) == 1
+
+    store.add(ids[1000:3000], data[1000:3000])
+    assert quantizer.is_trained
+    assert len(store) == 2999
+    assert "v0" not in store and "v1" in store
+    assert store.memory_bytes() < data[:3000].nbytes / 4
+
+
+def test_only_stores_with_vectors_can_rerank(dataset):
+    ids, data, queries, exact = dataset
+    np.testing.assert_allclose(
+        exact.get_vectors(["v1"])[0], data[1] / np.linalg.norm(data[1]), rtol=1e-5
+    )
+    store = QuantizedVectorStore(DIM, ScalarQuantizer())
+    with pytest.raises(NotImplementedError):
+        store.get_vectors(["v1"])
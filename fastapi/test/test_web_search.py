@@ -0,0 +1,59 @@
+import asyncio
+from typing import List
+import pytest
+from app.modules.web_search.base import SearchResult, WebSearchBase
+from app.modules.web_search.service import WebSearchService
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeProvider(WebSearchBase):
+    def __init__(self, name: str, urls: List[str], delay: float = 0.0):
+        super().__init__(name, timeout=1.0)
+        self.urls = urls
+        self.delay = delay
+        self.calls = 0
+
+    async def asearch(self, query: str, max_results: int = 10) -> List[SearchResult]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [
+            SearchResult(title=url, url=url, provider=self.name)
+            for url in self.urls[:max_results]
+        ]
+
+
+def results(provider: str, *urls: str) -> List[SearchResult]:
+    return [SearchResult(title=url, url=url, provider=provider) for url in urls]
+
+
+def test_merge_keeps_the_urls_providers_returned():
+    ranked = [
+        results("a", "https://www.example.com/page/?utm_source=x", "https://a.com/1"),
+        results("b", "http://example.com/page", "https://b.com/?q=%EA%B0%80"),
+    ]
+    merged = WebSearchService.merge(ranked, max_results=10)
+    # 같은 페이지는 먼저 나온 결과만 남고, 주소는 제공자가 준 그대로
+    assert [(r.provider, r.url) for r in merged] == [
+        ("a", "https://www.example.com/page/?utm_source=x"),
+        ("a", "https://a.com/1"),
+        ("b", "https://b.com/?q=%EA%B0%80"),
+    ]
+
+
+def test_merge_stops_at_max_results():
+    ranked = [results("a", "https://a.com/1", "https://a.com/2"), results("b")]
+    assert len(WebSearchService.merge(ranked, max_results=1)) == 1
+
+
+async def test_search_skips_slow_providers_and_caches(redis_client):
+    fast = FakeProvider("fast", ["https://a.com/1"])
+    slow = FakeProvider("slow", ["https://b.com/1"], delay=5.0)
+    service = WebSearchService([fast, slow], redis_client=redis_client, deadline=0.1)
+
+    first = await service.search("Hello  World")
+    second = await service.search("hello world")
+    assert [r.url for r in first] == [r.url for r in second] == ["https://a.com/1"]
+    assert fast.calls == 1
+    assert service.stats.cache_hits == 1
+    assert service.stats.provider_timeouts == 1
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from app.chat_message.chat_message_model import ChatMessage
+from app.chat_message.chat_message_schema import ChatMessageCreate
+from app.chat_message.write_behind import ChatMessageWriter
+from app.chat_session.chat_session_model import ChatSession
+
+pytestmark = pytest.mark.anyio
+
+
+def bot_message(content: str, session_id: str = "s") -> ChatMessageCreate:
+    return ChatMessageCreate(session_id=session_id, sender="bot", content=content)
+
+
+@pytest.fixture
+async def writer(session_factory):
+    async with session_factory() as db:
+        await db.execute(insert(ChatSession), [{"id": "s", "user_id": None}])
+        await db.commit()
+    writer = ChatMessageWriter(session_factory, max_delay=0.01)
+    yield writer
+    await writer.aclose()
+
+
+async def load(session_factory, message_id: str) -> ChatMessage:
+    async with session_factory() as db:
+        return await db.get(ChatMessage, message_id)
+
+
+async def test_partials_in_one_batch_are_coalesced(writer, session_factory):
+    await writer.write(bot_message("he"), "b", wait=False)
+    await writer.write(bot_message("hel"), "b", wait=False)
+    final = await writer.write(bot_message("hello"), "b")
+
+    row = await load(session_factory, "b")
+    assert row.content == "hello"
+    assert row.timestamp == final.timestamp.replace(tzinfo=None)
+    stats = writer.get_stats()
+    assert stats["coalesced"] == 2
+    assert stats["rows"] == 1
+
+
+async def test_rewrite_upserts_content_and_timestamp(writer, session_factory):
+    first = await writer.write(bot_message("partial"), "b")
+    await asyncio.sleep(0.01)
+    final = await writer.write(bot_message("partial and final"), "b")
+
+    row = await load(session_factory, "b")
+    assert final.timestamp > first.timestamp
+    assert row.content == "partial and final"
+    assert row.timestamp == final.timestamp.replace(tzinfo=None)
+    async with session_factory() as db:
+        assert await db.scalar(select(func.count()).select_from(ChatMessage)) == 1
+
+
+async def test_bad_row_does_not_drop_its_batch(writer, session_factory):
+    results = await asyncio.gather(
+        writer.write(bot_message("ok 1")),
+        writer.write(bot_message("no session", session_id="missing")),
+        writer.write(bot_message("ok 2")),
+        return_exceptions=True,
+    )
+    assert isinstance(results[1], IntegrityError)
+    for message in (results[0], results[2]):
+        assert (await load(session_factory, message.id)).content == message.content
+    assert writer.get_stats()["errors"] == 1